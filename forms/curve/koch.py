@@ -5,8 +5,10 @@ Koch -- Generate a Koch curve
 """
 
 
-import pymel.core as pm
-import pymel.core.datatypes as dt
+import numpy
+
+from forms.util import export, instrument
+from forms.util.lazy import pm
 from forms.util.math import *
 
 
@@ -17,8 +19,8 @@ class _Edge():
     Koch edge class.
     
     Parameters:
-        v1    -- the starting vertex ( pymel.core.datatypes.FloatVector )
-        v2    -- the ending vertex ( pymel.core.datatypes.FloatVector )
+        v1    -- the starting vertex ( numpy.ndarray( ( 3, ) ) )
+        v2    -- the ending vertex ( numpy.ndarray( ( 3, ) ) )
         angle -- the edge angle ( float )
   
     """
@@ -31,18 +33,41 @@ class _Edge():
 
 
 
-class Koch():
+class Koch( object ):
+
 
+    """
+    Koch curve class. The curve is stored as a polyline, an array with one row per vertex, and
+    every iteration subdivides all of its edges at once.
+
+    """
 
     def __init__( self ):
 
         self.divisor   = float(1) / float(3)
-        self.edges     = [ ]
+        self.points    = numpy.zeros( ( 0, 3 ) )
         self.verticies = [ ]
+
+
+    """
+    The edges of the curve. They are built on demand from the polyline.
+
+    Return:
+        edges -- ( [,_Edge] )
+
+    """
+
+    @property
+    def edges( self ):
+
+        vectors = self.points[ 1: ] - self.points[ :-1 ]
+        angles  = numpy.arctan2( vectors[ :, 1 ], vectors[ :, 0 ] ) + PI
+
+        return [ _Edge( v1, v2, angle ) for v1, v2, angle in zip( self.points[ :-1 ], self.points[ 1: ], angles ) ]
     
 
     """
-    Generate a Koch edge and append the edges to self.
+    Subdivide every edge of the polyline into four Koch edges.
     
     Parameters:
         iteration -- the iteration level ( int )
@@ -51,43 +76,99 @@ class Koch():
 
     def __curve( self, iteration ):   
 
+        self.points = self.__subdivide( self.points, iteration )
+
+
+    """
+    Subdivide every edge of a polyline into four Koch edges, all edges at once.
+
+    Parameters:
+        points    -- the vertices of the polyline ( numpy.ndarray( ( N, 3 ) ) )
+        iteration -- the iteration level ( int )
+
+    Return:
+        points -- ( numpy.ndarray( ( ( N - 1 ) * 4 ** iteration + 1, 3 ) ) )
+
+    """
+
+    def __subdivide( self, points, iteration ):
+
+        height = self.divisor * sqrt(3) / 2
+
         for i in range( iteration ):
             
-            tmp = [ ]
-            
-            for j in range( len( self.edges ) ):
-                
-                edge = self.edges[ j ]
-                
-                v1 = edge.v1
-                v2 = edge.v2
-
-                vector = v2 - v1
-                angle  = edge.angle
-                
-                nextSideLength = vector.length() * self.divisor
-                height = nextSideLength * sqrt(3) / 2
-
-                # start vertex
-                start = v1 + vector * self.divisor
-
-                # middle vertex
-                middle    = dt.FloatVector()
-                middle    = ( v1 + ( vector * 0.5 ) )
-                middle.x += cos( angle - HALF_PI ) * height
-                middle.y += sin( angle - HALF_PI ) * height
-                
-                #end vertex 
-                end = v1 + vector * ( self.divisor * 2 )
-
-                edge1 = _Edge( v1, start, angle )
-                edge2 = _Edge( start, middle, angle + HALF_PI - ( HALF_PI / 3 ) )
-                edge3 = _Edge( middle, end, angle - HALF_PI + ( HALF_PI / 3 ) )
-                edge4 = _Edge( end, v2, angle )
-                
-                tmp += [ edge1, edge2, edge3, edge4 ]
-            
-            self.edges = tmp
+            v1     = points[ :-1 ]
+            vector = points[ 1: ] - v1
+
+            # start vertex
+            start = v1 + vector * self.divisor
+
+            # middle vertex, raised to the left of the edge
+            middle = v1 + vector * 0.5
+            middle[ :, 0 ] -= vector[ :, 1 ] * height
+            middle[ :, 1 ] += vector[ :, 0 ] * height
+
+            # end vertex
+            end = v1 + vector * ( self.divisor * 2 )
+
+            subdivided = numpy.empty( ( len( v1 ) * 4 + 1, 3 ) )
+            subdivided[ 0:-1:4 ] = v1
+            subdivided[ 1::4 ]   = start
+            subdivided[ 2::4 ]   = middle
+            subdivided[ 3::4 ]   = end
+            subdivided[ -1 ]     = points[ -1 ]
+
+            points = subdivided
+
+        return points
+
+
+    """
+    Lazily subdivide the current curve and yield its vertices in order, in chunks.
+
+    The edges are walked depth first and only the deepest levels of each chunk are subdivided as
+    arrays, so the memory used grows with the iteration level and the chunk size instead of with
+    the amount of vertices. Call curve or snowflake with an iteration level of 0 to set the
+    starting edges.
+
+    Parameters:
+        iteration -- the iteration level ( int )
+        chunkSize -- the most vertices yielded at once ( default 65536 )
+
+    Return:
+        points -- a generator of vertex chunks ( numpy.ndarray( ( n, 3 ) ) )
+
+    """
+
+    def iterPoints( self, iteration = 3, chunkSize = 65536 ):
+
+        depth = 0
+
+        while depth < iteration and pow( 4, depth + 1 ) <= chunkSize:
+
+            depth += 1
+
+        stack = [ ( self.points[ i ], self.points[ i + 1 ], iteration ) for i in range( len( self.points ) - 2, -1, -1 ) ]
+
+        while stack:
+
+            v1, v2, level = stack.pop()
+
+            if level == depth:
+
+                yield self.__subdivide( numpy.array( [ v1, v2 ] ), depth )[ :-1 ]
+
+            else:
+
+                edge = self.__subdivide( numpy.array( [ v1, v2 ] ), 1 )
+
+                for i in range( 3, -1, -1 ):
+
+                    stack.append( ( edge[ i ], edge[ i + 1 ], level - 1 ) )
+
+        if len( self.points ):
+
+            yield self.points[ -1: ]
 
 
     """
@@ -99,9 +180,10 @@ class Koch():
   
     """
 
+    @instrument.measure( "curve", "iteration" )
     def curve( self, iteration = 3, length = 10 ):
         
-        self.edges = [ _Edge( dt.FloatVector( -length / 2, 0, 0 ), dt.FloatVector( length / 2, 0, 0 ), PI ) ]
+        self.points = numpy.array( [ [ -length / 2.0, 0, 0 ], [ length / 2.0, 0, 0 ] ] )
         self.__curve( iteration )
 
     
@@ -114,6 +196,7 @@ class Koch():
   
     """
 
+    @instrument.measure( "snowflake", "iteration" )
     def snowflake( self, iteration = 3, radius = 5 ):
 
         verticies = [ ]
@@ -125,22 +208,19 @@ class Koch():
             x = radius * cos( a )
             y = radius * sin( a )
             z = 0
-            v1 = dt.FloatVector( x, y, z )
-            verticies.append( v1 )
+            verticies.append( [ x, y, z ] )
         
         v1 = verticies[ 0 ]
         v2 = verticies[ 1 ]
         v3 = verticies[ 2 ]
 
-        self.edges.append( _Edge( v2, v1, PI ) )
-        self.edges.append( _Edge( v1, v3, (HALF_PI / 3) * 2 ) )
-        self.edges.append( _Edge( v3, v2, TWO_PI - (HALF_PI / 3) * 2 ) )
+        self.points = numpy.array( [ v2, v1, v3, v2 ], dtype = numpy.float64 )
         
         self.__curve( iteration )
          
 
     """
-    Draw the Koch Curve.
+    Draw the Koch Curve with a single curve command.
     
     Return:
         curve -- ( pymel.core.nodetypes.Transform(u'') )
@@ -149,18 +229,17 @@ class Koch():
 
     def drawCurve( self ):
 
-        verticies = [ ]
+        return pm.curve( degree = 1, p = self.points.tolist() )
 
-        for edge in self.edges:
-            
-            verticies += [ edge.v1, edge.v2 ]
 
-        curve = pm.curve( degree = 1, p = [ verticies[ 0 ], verticies[ 1 ] ] )
+    """
+    Write the Koch Curve to a Wavefront OBJ file, without Maya.
+
+    Parameters:
+        path -- the file to write ( string )
 
-        for i in range( 2, len( verticies ) ):
-            
-            vertex = verticies[ i ]
-            curve  = pm.curve( curve, p=[ vertex ], append = True )
+    """
 
-        return curve
+    def writeCurve( self, path ):
 
+        export.curve( path, self.points )
@@ -1,2 +1,2 @@
 
-__all__ = [ "dodecahedron", "hexahedron", "icosahedron", "octahedron", "tetrahedron" ]
\ No newline at end of file
+__all__ = [ "dodecahedron", "hexahedron", "icosahedron", "octahedron", "platonic", "tetrahedron" ]
\ No newline at end of file
@@ -3,19 +3,37 @@ This module provides a set of classes for generating Hexahedron meshes.
 
 Hexahedron    -- Generate a Hexahedron mesh
 Sierpinski    -- Generate a Sierpinski hexahedron fractal mesh
+Occupancy     -- Query which cells of a Sierpinski hexahedron fractal are filled
+Incremental   -- Update a Sierpinski hexahedron fractal mesh as its parameters change
 """
 
 
-import pymel.core as pm
-import pymel.core.datatypes as dt
-import pymel.util as util
+import numpy
 
-from forms.util.mesh import combineClean
+from forms.util import bvh, fractal, ifs, instrument, lod, parallel, polygon, solids
+from forms.util.lazy import pm
+from forms.util.mesh import create, levelOfDetail, replace
 
 
 class Hexahedron:
 
 
+    """
+    Generate a hexahedron as vertex and face arrays, centred like Maya's cube.
+
+    Parameters:
+        size -- the width, height and depth ( default 1 )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def polygon( self, size = 1 ):
+
+        return solids.solid( "hexahedron", edgeLength = size )
+
+
     """
     Generate a hexahedron and return the mesh.
 
@@ -37,107 +55,1106 @@ class Sierpinski( Hexahedron ):
     
     
     """
-    Generate and return the next iteration of the fractal as mesh.
+    Return the offsets of the sponges of one iteration, relative to the size of a sponge.
 
     Parameters:
-        mesh      -- the mesh to generate the next iteration of the fractal from ( pymel.core.nodetypes.Mesh )
-        size      -- the next sponge size ( float )
-        iteration -- the next fractal iteration ( int )
+        grid  -- the grid subdivision amount ( default 3 )
+        holes -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
 
     Return:
-        mesh -- ( pymel.core.nodetypes.Transform(u'') )
+        offsets -- ( numpy.ndarray( ( grid ** 3 - len( holes ), 3 ) ) )
 
     """
     
-    def __generateMesh( self, mesh, size, iteration ):
+    def offsets( self, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
 
-        instanceGroup   = pm.group( empty = True, name = "meshInstanceGroup" )
-        
-        instances = [ None ] * util.pow( self.grid, 3 )
-        
-        # Instance a sponge, position it, then add it to the group
-        
-        def makeInstance( levels, rows, columns, index ):
+        # Position a sponge in every grid cell that is not a hole
 
-            x = ( size * 1 ) - ( rows * size )
-            y = ( size * 1 ) - ( levels * size )
-            z = ( size * 1 ) - ( columns * size )
+        centre = ( grid - 1 ) / 2.0
+        cells  = numpy.arange( grid ** 3 )
+        cells  = cells[ ~numpy.isin( cells, holes ) ]
 
-            if index == 0:
+        levels  = cells // ( grid * grid )
+        rows    = ( cells // grid ) % grid
+        columns = cells % grid
 
-                meshInstance = mesh
+        return numpy.column_stack( [ centre - rows, centre - levels, centre - columns ] )
+    
 
-            else:
 
-                meshInstance = pm.instance( mesh[ 0 ] )
+    """ 
+    Return the translation and scale of every cube of the final iteration, without generating the iterations in between.
 
-            meshInstance[ 0 ].setTranslation( [ x, y, z ] )
-            instances.append( meshInstance[ 0 ] )
-        
+    Parameters:
+        size       -- the size of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+    
+    Return:
+        translations -- ( numpy.ndarray( ( ( grid ** 3 - len( holes ) ) ** iterations, 3 ) ) )
+        scales       -- ( numpy.ndarray( ( ( grid ** 3 - len( holes ) ) ** iterations, ) ) )
 
-        # Generate the sponge instances
-        
-        i = 0   
-        j = 0   
-        
-        for levels in range( self.grid ):
+    """
 
-            for rows in range( self.grid ):
+    def transforms( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
 
-                for columns in range( self.grid ):
+        self.size       = size
+        self.iterations = iterations
+        self.grid       = grid
+        self.holes      = holes
 
-                    if i not in self.holes:
+        cubeSize = float(self.size) / pow( float(self.grid), float(self.iterations) )
 
-                        makeInstance( levels, rows, columns, j ) 
+        return fractal.transforms( self.offsets( self.grid, self.holes ), self.grid, self.iterations, cubeSize )
 
-                        j += 1
 
-                    i += 1
 
-        
-        pm.parent( instances, instanceGroup, add = True )
-        
-        return combineClean( instanceGroup, "Sierpinski_Iteration_%i" % iteration, True )
+    """ 
+    Lazily yield the translation and scale of every cube of the final iteration in chunks, see forms.util.fractal.iterTransforms.
+
+    Parameters:
+        size       -- the size of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+        chunkSize  -- the most cubes yielded at once ( default 65536 )
     
+    Return:
+        transforms -- a generator of translation and scale chunks ( ( numpy.ndarray( ( n, 3 ) ), numpy.ndarray( ( n, ) ) ) )
+
+    """
+
+    def iterTransforms( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ], chunkSize = 65536 ):
+
+        cubeSize = float(size) / pow( float(grid), float(iterations) )
+
+        return fractal.iterTransforms( self.offsets( grid, holes ), grid, iterations, cubeSize, chunkSize )
+
 
 
     """ 
-    Generate a Sierpinski hexahedron fractal mesh. 
+    Return the integer grid coordinates of every cube of the final iteration.
+    The grid has grid ** iterations cells along each axis.
+
+    Parameters:
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+    
+    Return:
+        cells -- ( numpy.ndarray( ( ( grid ** 3 - len( holes ) ) ** iterations, 3 ) ) )
+
+    """
+
+    @instrument.measure( "cells", "iterations", "grid" )
+    def cells( self, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
+
+        offsets = numpy.rint( self.offsets( grid, holes ) + ( grid - 1 ) / 2.0 ).astype( numpy.int64 )
+
+        return fractal.transforms( offsets, grid, iterations, 1 )[ 0 ]
+
+
+
+    """ 
+    Build the outer surface of a set of grid cells. Only the faces of a cell that border an empty
+    cell are emitted, so faces shared by two cubes are never generated and the size of the mesh
+    grows with the surface area instead of the volume.
+
+    Parameters:
+        cells      -- the integer coordinates of the filled cells ( numpy.ndarray( ( N, 3 ) ) )
+        resolution -- the amount of cells along each axis ( int )
+        size       -- the size of the mesh ( float )
+        filled     -- a function returning whether cells are filled, by default the cells are searched ( default None )
+    
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    @instrument.measure( "surface", "resolution" )
+    def surface( self, cells, resolution, size, filled = None ):
+
+        cells = numpy.asarray( cells, dtype = numpy.int64 ).reshape( -1, 3 )
+
+        if filled is None:
+
+            keys = numpy.sort( ( cells[ :, 0 ] * resolution + cells[ :, 1 ] ) * resolution + cells[ :, 2 ] )
+
+            def filled( neighbours ):
+
+                inside     = ( ( neighbours >= 0 ) & ( neighbours < resolution ) ).all( axis = 1 )
+                neighbours = ( neighbours[ :, 0 ] * resolution + neighbours[ :, 1 ] ) * resolution + neighbours[ :, 2 ]
+                index      = numpy.minimum( numpy.searchsorted( keys, neighbours ), len( keys ) - 1 )
+
+                return inside & ( keys[ index ] == neighbours )
+
+        # The faces of a unit cube give the direction and corners of each side of a cell
+
+        cube       = self.polygon()
+        corners    = numpy.rint( cube.vertices[ cube.faces ] + 0.5 ).astype( numpy.int64 )
+        directions = numpy.rint( 2 * cube.vertices[ cube.faces ].mean( axis = 1 ) ).astype( numpy.int64 )
+
+        quads = [ ]
+
+        for direction, corner in zip( directions, corners ):
+
+            exposed = cells[ ~filled( cells + direction ) ]
+
+            quads.append( exposed[ :, None, : ] + corner[ None, :, : ] )
+
+        quads = numpy.concatenate( quads )
+
+        # Corners on the integer grid are welded exactly
+
+        points   = resolution + 1
+        keys     = ( ( quads[ :, :, 0 ] * points + quads[ :, :, 1 ] ) * points + quads[ :, :, 2 ] ).reshape( -1 )
+        index, inverse = polygon.unique( keys )
+        vertices = quads.reshape( -1, 3 )[ index ] * ( float(size) / resolution ) - float(size) / 2
+
+        return polygon.Mesh( vertices, inverse.reshape( -1, 4 ) )
+
+
+
+    """ 
+    Generate a Sierpinski hexahedron fractal as welded vertex and face arrays, without Maya.
+    Faces shared by two cubes are culled.
 
     Parameters:
         size       -- the size of the final mesh ( default 10cm )
         iterations -- the amount of iterations ( default 1 )
         grid       -- the grid subdivision amount ( default 3 )
         holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+        cache      -- load and save the mesh in a cache ( forms.util.cache.Cache default None )
+        workers    -- build blocks of the mesh in this many processes, see forms.util.parallel ( default 1 )
     
     Return:
-        mesh -- ( pymel.core.nodetypes.Transform(u'') )
+        mesh -- ( forms.util.polygon.Mesh )
 
     """
 
-    def generate( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
+    @instrument.measure( "compute", "size", "iterations", "grid", "workers" )
+    def compute( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ], cache = None, workers = 1 ):
 
         self.size       = size
         self.iterations = iterations
         self.grid       = grid
         self.holes      = holes
 
-        print( "%s radius %f iterations %i" % ( self.__class__.__name__, self.size, self.iterations ) )
+        self.occupancy = Occupancy( self.iterations, self.grid, self.holes, self.size )
+
+        if cache is not None:
+
+            return cache.compute( self, { "workers" : workers }, size = size, iterations = iterations, grid = grid, holes = sorted( holes ) )
+
+        if workers > 1:
+
+            # Every block is a whole sub sponge, its faces are culled against the whole sponge
+
+            translations, depth = fractal.blocks( self.occupancy.offsets(), self.grid, self.iterations, 1, workers * 4 )
+            blocks              = [ ( translation, depth ) for translation in translations ]
+
+            return parallel.compute( self.occupancy.block, blocks, workers, float(self.size) / self.occupancy.resolution * 1e-3 )
+
+        return self.occupancy.surface()
+
+
+
+    """ 
+    Derive the next iteration of a Sierpinski hexahedron fractal from a computed iteration, by placing
+    a copy of its faces in every grid cell that is not a hole. The faces where two copies touch are
+    removed. The faces are rebuilt on the integer grid in the order of surface, so the mesh equals the
+    mesh of compute. forms.util.cache.Cache uses this to build on cached iterations.
+
+    Parameters:
+        mesh       -- the computed mesh ( forms.util.polygon.Mesh )
+        size       -- the size of the computed mesh ( default 10cm )
+        iterations -- the amount of iterations of the computed mesh ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
     
-        cubeSize = float(self.size) /  util.pow( float(self.grid), float(self.iterations) )
-        cube     = self.mesh( width = cubeSize, height = cubeSize, depth = cubeSize )    
-        cubes    = [ cube ]
-        
-        for i in range( iterations ):
+    Return:
+        mesh -- the next iteration, with the same size ( forms.util.polygon.Mesh )
+
+    """
+
+    @instrument.measure( "expand", "iterations", "grid" )
+    def expand( self, mesh, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
+
+        occupancy  = Occupancy( iterations, grid, holes, size )
+        resolution = occupancy.resolution
+        offsets    = occupancy.offsets()
+
+        # The corners of the computed mesh are exactly on the integer grid
+
+        quads = numpy.rint( ( numpy.asarray( mesh.vertices ) + float(size) / 2 ) * ( resolution / float(size) ) ).astype( numpy.int64 )[ numpy.asarray( mesh.faces ) ]
+
+        cube       = self.polygon()
+        corners    = numpy.rint( cube.vertices[ cube.faces ] + 0.5 ).astype( numpy.int64 )
+        directions = numpy.rint( 2 * cube.vertices[ cube.faces ].mean( axis = 1 ) ).astype( numpy.int64 )
+
+        # The side of every face is found from its corners relative to its first corner
+
+        digits   = pow( 3, numpy.arange( 12 ) )
+        patterns = numpy.zeros( pow( 3, 12 ), dtype = numpy.int64 )
+        patterns[ ( ( corners - corners[ :, :1 ] + 1 ).reshape( -1, 12 ) * digits ).sum( axis = 1 ) ] = numpy.arange( len( corners ) )
+
+        sides = patterns[ ( ( quads - quads[ :, :1 ] + 1 ).reshape( -1, 12 ) * digits ).sum( axis = 1 ) ]
+        cells = quads[ :, 0 ] - corners[ sides, 0 ]
+
+        # Order the faces like surface, by side and then by the order of the cells in Sierpinski.cells
+
+        index = numpy.full( grid ** 3, -1, dtype = numpy.int64 )
+        index[ ( offsets[ :, 0 ] * grid + offsets[ :, 1 ] ) * grid + offsets[ :, 2 ] ] = numpy.arange( len( offsets ) )
+        order = numpy.zeros( len( cells ), dtype = numpy.int64 )
+
+        for level in range( iterations - 1, -1, -1 ):
+
+            digits = cells // pow( grid, level ) % grid
+            order  = order * len( offsets ) + index[ ( digits[ :, 0 ] * grid + digits[ :, 1 ] ) * grid + digits[ :, 2 ] ]
+
+        faces = numpy.lexsort( [ order, sides ] )
+        sides = sides[ faces ]
+        cells = cells[ faces ]
+
+        # A face on the border of a copy touches the next copy when there is one and it has the opposite face
+
+        keys     = ( cells[ :, 0 ] * resolution + cells[ :, 1 ] ) * resolution + cells[ :, 2 ]
+        opposite = [ int( numpy.nonzero( ( directions == -direction ).all( axis = 1 ) )[ 0 ][ 0 ] ) for direction in directions ]
+        quads    = [ ]
+
+        for side, ( direction, corner ) in enumerate( zip( directions, corners ) ):
+
+            exposed    = cells[ sides == side ]
+            neighbours = exposed + direction
+            border     = ~( ( neighbours >= 0 ) & ( neighbours < resolution ) ).all( axis = 1 )
+            neighbours = neighbours % resolution
+            neighbours = ( neighbours[ :, 0 ] * resolution + neighbours[ :, 1 ] ) * resolution + neighbours[ :, 2 ]
+            touching   = border & numpy.isin( neighbours, keys[ sides == opposite[ side ] ] )
+
+            for offset in offsets:
 
-            mesh     = self.__generateMesh( cubes[ 0 ], cubeSize, ( i + 1 ) )
-            cubeSize = cubeSize * self.grid
-            cubes    = [ mesh ]
+                if ( offsets == offset + direction ).all( axis = 1 ).any():
 
+                    quads.append( ( exposed[ ~touching ] + offset * resolution )[ :, None, : ] + corner[ None, :, : ] )
 
-        pm.xform( mesh[ 0 ], centerPivots = True )
+                else:
 
-        print( "Construction complete" )
+                    quads.append( ( exposed + offset * resolution )[ :, None, : ] + corner[ None, :, : ] )
+
+        quads = numpy.concatenate( quads )
+
+        # Weld like surface
+
+        resolution *= grid
+        points      = resolution + 1
+        keys        = ( ( quads[ :, :, 0 ] * points + quads[ :, :, 1 ] ) * points + quads[ :, :, 2 ] ).reshape( -1 )
+        index, inverse = polygon.unique( keys )
+        vertices    = quads.reshape( -1, 3 )[ index ] * ( float(size) / resolution ) - float(size) / 2
+
+        return polygon.Mesh( vertices, inverse.reshape( -1, 4 ) )
+
+
+
+    """
+    Return the Sierpinski Hexahedron fractal as an iterated function system, one map per cube of the
+    grid that is not a hole, see forms.util.ifs.System. N iterations of the system applied to a cube
+    of the size give the fractal.
+
+    Parameters:
+        size  -- the size of the final mesh ( default 10cm )
+        grid  -- the grid subdivision amount ( default 3 )
+        holes -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+
+    Return:
+        system -- ( forms.util.ifs.System )
+
+    """
+
+    def system( self, size = 10, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
+
+        scale = 1.0 / grid
+
+        return ifs.similarity( self.offsets( grid, holes ) * ( float(size) * scale ), scale )
+
+
+    """ 
+    Return the Sierpinski hexahedron fractal as a scene graph, where every iteration refers to the one
+    below it, see forms.util.graph.Node. The graph stores grid ** 3 - len( holes ) translations per
+    iteration however many iterations there are, and is flattened only for the depth and region asked
+    for. The faces shared by two cubes are not culled, use compute for a closed surface.
+
+    Parameters:
+        size       -- the size of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+    
+    Return:
+        node -- ( forms.util.graph.Node )
+
+    """
+
+    @instrument.measure( "graph", "size", "iterations", "grid" )
+    def graph( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
+
+        return self.system( size, grid, holes ).graph( self.polygon( size ), iterations )
+
+
+
+    """ 
+    Return every iteration of a Sierpinski hexahedron fractal up to the final one as a level of detail
+    pyramid, see forms.util.lod. Level k fills every cell of iteration k that any part of the final
+    iteration is in, see Occupancy.level, so a viewer switches levels without generating anything.
+    Every iteration is expanded from the one below it and they share one vertex buffer.
+
+    Parameters:
+        size       -- the size of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+    
+    Return:
+        pyramid -- ( forms.util.lod.Pyramid )
+
+    """
+
+    @instrument.measure( "pyramid", "size", "iterations", "grid" )
+    def pyramid( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
+
+        meshes     = _levels( grid, holes, list( range( iterations + 1 ) ) )
+        resolution = pow( grid, iterations )
+
+        # The corners of every iteration lie on the grid of the final one, placed like surface places them
+
+        keys   = [ numpy.rint( ( mesh.vertices + 0.5 ) * resolution ).astype( numpy.int64 ) for mesh in meshes ]
+        levels = [ ( cells, cells * ( float(size) / resolution ) - float(size) / 2, mesh.faces ) for cells, mesh in zip( keys, meshes ) ]
+
+        # A level strays from the fractal by at most the diagonal of the cubes it fills
+
+        errors = [ numpy.sqrt( 3 ) * float(size) / pow( grid, level ) for level in range( iterations ) ] + [ 0.0 ]
+
+        return lod.pyramid( levels, errors )
+
+
+
+    """ 
+    Return the Sierpinski hexahedron fractal as a bounding volume hierarchy for ray intersection,
+    frustum culling, nearest point queries and chunked meshes, see forms.util.bvh.Hierarchy. The
+    hierarchy walks the graph of the fractal, so it costs no more to build than graph. The faces
+    where the cubes of a chunk touch are removed, the faces between chunks are kept.
+
+    Parameters:
+        size       -- the size of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+    
+    Return:
+        hierarchy -- ( forms.util.bvh.Hierarchy )
+
+    """
+
+    @instrument.measure( "hierarchy", "size", "iterations", "grid" )
+    def hierarchy( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
+
+        return bvh.Hierarchy( self.graph( size, iterations, grid, holes ), float(size) / pow( grid, iterations ) * 1e-3, lamina = True )
+
+
+
+    """ 
+    Generate a Sierpinski hexahedron fractal mesh. 
+
+    Parameters:
+        size       -- the size of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+        cache      -- load and save the mesh in a cache ( forms.util.cache.Cache default None )
+        workers    -- build blocks of the mesh in this many processes, see forms.util.parallel ( default 1 )
+        lod        -- output every iteration under a lodGroup switching by camera distance, see pyramid ( default False )
+    
+    Return:
+        mesh -- ( pymel.core.nodetypes.Transform(u'') || [pymel.core.nodetypes.LodGroup(u''), pymel.core.nodetypes.Transform(u''), ...] )
+
+    """
+
+    @instrument.measure( "generate", "size", "iterations", "grid", "lod" )
+    def generate( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ], cache = None, workers = 1, lod = False ):
+
+        if lod:
+
+            mesh = levelOfDetail( self.pyramid( size, iterations, grid, holes ), "Sierpinski_Iteration_%i" % iterations )
+
+            with instrument.span( "pivots" ):
+
+                for level in mesh[ 1 : ]:
+
+                    pm.xform( level, centerPivots = True )
+
+            return mesh
+
+        mesh = create( self.compute( size, iterations, grid, holes, cache, workers ), "Sierpinski_Iteration_%i" % iterations )
+
+        with instrument.span( "pivots" ):
+
+            pm.xform( mesh[ 0 ], centerPivots = True )
 
         return mesh
-    
\ No newline at end of file
+
+
+
+    """ 
+    Generate many Sierpinski hexahedron fractals as vertex and face arrays in one call, see compute.
+
+    Identical variants are generated once and variants that only differ in size share one mesh,
+    scaled last. The variants with the same grid and holes are generated together, every iteration
+    expanded from the one below it, and each grid and holes pair runs in its own worker process.
+
+    Parameters:
+        variants -- the keyword arguments of compute for every variant: size, iterations, grid and holes ( [,dict] )
+        workers  -- generate this many grid and holes pairs at once in separate processes ( default 1 )
+    
+    Return:
+        meshes -- the mesh of every variant, in order ( [,forms.util.polygon.Mesh] )
+
+    """
+
+    @instrument.measure( "computeBatch", "workers" )
+    def computeBatch( self, variants, workers = 1 ):
+
+        defaults = { "size" : 10, "iterations" : 1, "grid" : 3, "holes" : [ 4, 10, 12, 13, 14, 16, 22 ] }
+        requests = [ ]
+        groups   = { }
+
+        for variant in variants:
+
+            unknown = set( variant ) - set( defaults )
+
+            if unknown:
+
+                raise TypeError( "computeBatch got unexpected parameters %s" % ", ".join( sorted( unknown ) ) )
+
+            params = dict( defaults, **variant )
+            group  = ( int( params[ "grid" ] ), tuple( sorted( set( params[ "holes" ] ) ) ) )
+
+            groups.setdefault( group, set() ).add( int( params[ "iterations" ] ) )
+            requests.append( ( group, int( params[ "iterations" ] ), float( params[ "size" ] ) ) )
+
+        groups  = sorted( ( group, sorted( levels ) ) for group, levels in groups.items() )
+        results = parallel.computeMany( _levels, [ ( grid, holes, levels ) for ( grid, holes ), levels in groups ], workers )
+
+        # The unit size meshes, scaled to every requested size once
+
+        units  = dict( ( ( group, level ), mesh ) for ( group, levels ), meshes in zip( groups, results ) for level, mesh in zip( levels, meshes ) )
+        scaled = { }
+
+        for request in requests:
+
+            if request not in scaled:
+
+                unit = units[ request[ :2 ] ]
+                scaled[ request ] = polygon.Mesh( unit.vertices * request[ 2 ], unit.faces )
+
+        return [ scaled[ request ] for request in requests ]
+
+
+
+    """ 
+    Generate many Sierpinski hexahedron fractal meshes in one call, see computeBatch.
+
+    Parameters:
+        variants -- the keyword arguments of compute for every variant: size, iterations, grid and holes ( [,dict] )
+        workers  -- generate this many grid and holes pairs at once in separate processes ( default 1 )
+    
+    Return:
+        meshes -- ( [,pymel.core.nodetypes.Transform(u'')] )
+
+    """
+
+    @instrument.measure( "generateBatch", "workers" )
+    def generateBatch( self, variants, workers = 1 ):
+
+        meshes = [ ]
+
+        for variant, mesh in zip( variants, self.computeBatch( variants, workers ) ):
+
+            mesh = create( mesh, "Sierpinski_Iteration_%i" % variant.get( "iterations", 1 ) )
+
+            with instrument.span( "pivots" ):
+
+                pm.xform( mesh[ 0 ], centerPivots = True )
+
+            meshes.append( mesh )
+
+        return meshes
+
+
+
+"""
+Generate unit size Sierpinski hexahedron fractals with the same grid and holes for several iterations.
+The first iteration is generated directly and every later one expanded from the one below it, which
+is cheaper than generating it directly.
+
+Parameters:
+    grid   -- the grid subdivision amount ( int )
+    holes  -- a list of holes ( [,int] )
+    levels -- the iterations to return, ascending ( [,int] )
+
+Return:
+    meshes -- the mesh of every iteration ( [,forms.util.polygon.Mesh] )
+
+"""
+
+def _levels( grid, holes, levels ):
+
+    sierpinski = Sierpinski()
+    level      = min( levels[ 0 ], 1 )
+    mesh       = Occupancy( level, grid, holes, 1 ).surface()
+    meshes     = [ ]
+
+    for iterations in levels:
+
+        while level < iterations:
+
+            mesh   = sierpinski.expand( mesh, 1, level, grid, holes )
+            level += 1
+
+        meshes.append( mesh )
+
+    return meshes
+
+
+
+class Occupancy():
+
+
+    """
+    Occupancy class. Answers which cells of a Sierpinski hexahedron fractal are filled without
+    storing the cells or touching geometry.
+
+    A cell is filled when none of its base grid digits, one per iteration, land in a hole. Only the
+    bit packed grid ** 3 hole pattern is stored, so the memory used does not grow with the
+    iterations and every query costs one pattern lookup per iteration.
+
+    Parameters:
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+        size       -- the size of the fractal ( default 10cm )
+
+    """
+
+    def __init__( self, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ], size = 10 ):
+
+        pattern = numpy.ones( grid ** 3, dtype = bool )
+        pattern[ list( holes ) ] = False
+
+        self.iterations = iterations
+        self.grid       = grid
+        self.holes      = sorted( holes )
+        self.size       = size
+        self.resolution = pow( grid, iterations )
+        self.pattern    = numpy.packbits( pattern )
+
+
+    def __repr__( self ):
+
+        return "Occupancy(%i iterations, grid %i, %i holes)" % ( self.iterations, self.grid, len( self.holes ) )
+
+
+    """
+    Return the amount of filled cells.
+
+    Return:
+        count -- ( int )
+
+    """
+
+    def count( self ):
+
+        return pow( self.grid ** 3 - len( self.holes ), self.iterations )
+
+
+    """
+    Return whether cells are filled.
+
+    Parameters:
+        cells -- integer cell coordinates in the range [ 0, resolution ) ( numpy.ndarray( ( N, 3 ) ) )
+
+    Return:
+        filled -- ( numpy.ndarray( ( N, ), bool ) )
+
+    """
+
+    def contains( self, cells ):
+
+        grid   = self.grid
+        cells  = numpy.asarray( cells ).reshape( -1, 3 )
+        filled = ( ( cells >= 0 ) & ( cells < self.resolution ) ).all( axis = 1 )
+        cells  = numpy.where( filled[ :, None ], cells, 0 ).astype( polygon.indexType( self.resolution ) )
+
+        pattern = self._pattern().reshape( -1 )
+
+        for i in range( self.iterations ):
+
+            digits  = cells % grid
+            filled &= pattern[ ( digits[ :, 0 ] * grid + digits[ :, 1 ] ) * grid + digits[ :, 2 ] ]
+            cells //= grid
+
+        return filled
+
+
+    """
+    Return which cells of one iteration are filled, indexed by their x, y and z digits.
+
+    Return:
+        pattern -- ( numpy.ndarray( ( grid, grid, grid ), bool ) )
+
+    """
+
+    def _pattern( self ):
+
+        grid = self.grid
+
+        # Holes are numbered by level, row and column, which run against the y, x and z axes
+
+        pattern = numpy.unpackbits( self.pattern )[ : grid ** 3 ].astype( bool ).reshape( grid, grid, grid )
+
+        return pattern[ ::-1, ::-1, ::-1 ].transpose( 1, 0, 2 )
+
+
+    """
+    Return whether every cell is filled as a dense grid. Every iteration repeats the pattern inside
+    the filled cells of the one before, so the grid of the next iteration is one step from this one.
+
+    Parameters:
+        filled -- the dense grid of a coarser iteration to start from ( numpy.ndarray( ( grid ** i, grid ** i, grid ** i ), bool ) default None )
+
+    Return:
+        filled -- ( numpy.ndarray( ( resolution, resolution, resolution ), bool ) )
+
+    """
+
+    def dense( self, filled = None ):
+
+        grid    = self.grid
+        pattern = self._pattern()
+        filled  = numpy.ones( ( 1, 1, 1 ), dtype = bool ) if filled is None else filled
+
+        while len( filled ) < self.resolution:
+
+            filled = ( filled[ :, None, :, None, :, None ] & pattern[ None, :, None, :, None, : ] ).reshape( ( len( filled ) * grid, ) * 3 )
+
+        return filled
+
+
+    """
+    Return whether points are inside the fractal.
+
+    Parameters:
+        points -- the positions to test ( numpy.ndarray( ( N, 3 ) ) )
+
+    Return:
+        inside -- ( numpy.ndarray( ( N, ), bool ) )
+
+    """
+
+    def containsPoint( self, points ):
+
+        points = numpy.asarray( points, dtype = numpy.float64 ).reshape( -1, 3 )
+        cells  = numpy.floor( ( points / self.size + 0.5 ) * self.resolution ).astype( numpy.int64 )
+
+        return self.contains( cells )
+
+
+    """
+    Return the occupancy of a coarser level of detail, where a cell is filled when any part of
+    the fractal inside it is.
+
+    Parameters:
+        iterations -- the amount of iterations of the level of detail ( int )
+
+    Return:
+        occupancy -- ( forms.geometry.hexahedron.Occupancy )
+
+    """
+
+    def level( self, iterations ):
+
+        return Occupancy( min( iterations, self.iterations ), self.grid, self.holes, self.size )
+
+
+    """
+    Return the integer coordinates of every filled cell.
+
+    Return:
+        cells -- ( numpy.ndarray( ( count, 3 ) ) )
+
+    """
+
+    def cells( self ):
+
+        return Sierpinski().cells( self.iterations, self.grid, self.holes )
+
+
+    """
+    Return the integer offsets of the filled cells of one iteration, relative to the size of a cell.
+
+    Return:
+        offsets -- ( numpy.ndarray( ( grid ** 3 - len( holes ), 3 ) ) )
+
+    """
+
+    def offsets( self ):
+
+        return numpy.rint( Sierpinski().offsets( self.grid, self.holes ) + ( self.grid - 1 ) / 2.0 ).astype( numpy.int64 )
+
+
+    """
+    Lazily yield the integer coordinates of every filled cell in chunks.
+
+    Parameters:
+        chunkSize -- the most cells yielded at once ( default 65536 )
+
+    Return:
+        cells -- a generator of cell chunks ( numpy.ndarray( ( n, 3 ) ) )
+
+    """
+
+    def iterCells( self, chunkSize = 65536 ):
+
+        for cells, scales in fractal.iterTransforms( self.offsets(), self.grid, self.iterations, 1, chunkSize ):
+
+            yield cells
+
+
+    """
+    Build the outer surface of the filled cells, see Sierpinski.surface.
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def surface( self ):
+
+        return Sierpinski().surface( self.cells(), self.resolution, self.size, self.contains )
+
+
+
+    """
+    Lazily build the outer surface of the filled cells in chunks. Every face is emitted by exactly
+    one chunk, vertices on the seams between chunks are repeated.
+
+    Parameters:
+        chunkSize -- the most cells per chunk ( default 65536 )
+
+    Return:
+        meshes -- a generator of meshes ( forms.util.polygon.Mesh )
+
+    """
+
+    def iterSurface( self, chunkSize = 65536 ):
+
+        for cells in self.iterCells( chunkSize ):
+
+            yield Sierpinski().surface( cells, self.resolution, self.size, self.contains )
+
+
+
+    """
+    Build the outer surface of one block of filled cells, see forms.util.fractal.blocks. The faces
+    are culled against every filled cell, so blocks built separately only share vertices.
+
+    Parameters:
+        translation -- the integer translation of the block ( numpy.ndarray( ( 3, ) ) )
+        iterations  -- the amount of iterations of the block ( int )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def block( self, translation, iterations ):
+
+        cells = fractal.transforms( self.offsets(), self.grid, iterations, 1 )[ 0 ] + translation
+
+        return Sierpinski().surface( cells, self.resolution, self.size, self.contains )
+
+
+
+class Incremental():
+
+
+    """
+    Incremental class. Keeps a generated Sierpinski hexahedron fractal and the parameters it was
+    generated from, and updates only what a change of parameters touches.
+
+        A change of size moves the vertices and keeps the faces.
+        A change of holes rebuilds the faces of the cells that are filled or emptied and of their neighbours.
+        One more iteration repeats the pattern inside the filled cells of the iteration before.
+        Any other change, or a change of grid, generates the fractal again.
+
+    The filled cells and their faces are dense grids of resolution ** 3 cells, 531441 for iteration 4
+    of the default grid. The mesh has the vertices and faces of Sierpinski.compute, the faces in
+another order.
+
+    Parameters:
+        size       -- the size of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        grid       -- the grid subdivision amount ( default 3 )
+        holes      -- a list of holes ( default [ 4, 10, 12, 13, 14, 16, 22 ] )
+
+    """
+
+    def __init__( self, size = 10, iterations = 1, grid = 3, holes = [ 4, 10, 12, 13, 14, 16, 22 ] ):
+
+        self.parameters = { }
+        self.changes    = [ ]
+        self.node       = None
+        self.output     = 0
+
+        self.update( size, iterations, grid, holes )
+
+
+    def __repr__( self ):
+
+        return "Incremental(%i iterations, grid %i, %i holes, %s)" % ( self.parameters[ "iterations" ], self.parameters[ "grid" ], len( self.parameters[ "holes" ] ), self.changes[ -1 ] )
+
+
+    """
+    Change parameters and update the mesh, see the class description. Parameters left at None keep
+    their value. The kind of every update is recorded in changes: "generate", "iterations", "holes",
+    "size" or "none".
+
+    Parameters:
+        size       -- the size of the final mesh ( default None )
+        iterations -- the amount of iterations ( default None )
+        grid       -- the grid subdivision amount ( default None )
+        holes      -- a list of holes ( default None )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    @instrument.measure( "update" )
+    def update( self, size = None, iterations = None, grid = None, holes = None ):
+
+        previous   = self.parameters
+        parameters = {
+            "size"       : float( previous[ "size" ] if size is None else size ),
+            "iterations" : int( previous[ "iterations" ] if iterations is None else iterations ),
+            "grid"       : int( previous[ "grid" ] if grid is None else grid ),
+            "holes"      : tuple( sorted( set( previous[ "holes" ] if holes is None else holes ) ) )
+        }
+
+        occupancy = Occupancy( parameters[ "iterations" ], parameters[ "grid" ], parameters[ "holes" ], parameters[ "size" ] )
+        topology  = [ key for key in [ "iterations", "grid", "holes" ] if parameters[ key ] != previous.get( key ) ]
+
+        if not topology and parameters[ "size" ] == previous.get( "size" ):
+
+            change = "none"
+
+        elif not topology:
+
+            change = "size"
+
+        elif topology == [ "iterations" ] and parameters[ "iterations" ] == previous[ "iterations" ] + 1:
+
+            change = "iterations"
+
+            with instrument.span( "occupancy" ):
+
+                self.filled = occupancy.dense( self.filled )
+
+            self._faces()
+
+        elif topology == [ "holes" ]:
+
+            change = "holes"
+
+            with instrument.span( "occupancy" ):
+
+                filled  = occupancy.dense()
+                changed = numpy.nonzero( filled != self.filled )
+
+            self.filled = filled
+
+            # The faces of a cell depend on its neighbours, so the neighbours of every changed cell are rebuilt too
+
+            self._faces( changed )
+
+        else:
+
+            change = "generate"
+
+            with instrument.span( "occupancy" ):
+
+                self.filled = occupancy.dense()
+
+            self._faces()
+
+        if change in [ "iterations", "holes", "generate" ]:
+
+            self._weld()
+
+        self.parameters = parameters
+        self.occupancy  = occupancy
+        self.changes.append( change )
+
+        return self.mesh()
+
+
+    """
+    Return the mesh.
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def mesh( self ):
+
+        size       = self.parameters[ "size" ]
+        resolution = self.occupancy.resolution
+
+        return polygon.Mesh( self.corners * ( size / resolution ) - size / 2, self.faces )
+
+
+    """
+    Output the mesh to Maya. The first call creates the mesh, later calls replace it in place after
+    the updates since the call before, only moving its vertices when the size alone changed, see
+    forms.util.mesh.replace.
+
+    Parameters:
+        meshName -- A name for the mesh output ( default "Sierpinski_Incremental" )
+
+    Return:
+        mesh -- ( [pymel.core.nodetypes.Transform(u'')] )
+
+    """
+
+    @instrument.measure( "generate", "meshName" )
+    def generate( self, meshName = "Sierpinski_Incremental" ):
+
+        # The changes since the last output decide what is replaced
+
+        changes     = set( self.changes[ self.output : ] ) - set( [ "none" ] )
+        self.output = len( self.changes )
+
+        if self.node is None or not pm.objExists( self.node ):
+
+            self.node = create( self.mesh(), meshName )[ 0 ]
+
+        elif changes:
+
+            replace( self.node, self.mesh(), topology = changes != set( [ "size" ] ) )
+
+        return [ self.node ]
+
+
+    """
+    Rebuild the faces of cells, a face being exposed where a filled cell borders an empty cell or
+    the outside.
+
+    Parameters:
+        cells -- the x, y and z coordinates of the changed cells, every cell by default ( ( numpy.ndarray( ( n, ) ), numpy.ndarray( ( n, ) ), numpy.ndarray( ( n, ) ) ) default None )
+
+    """
+
+    def _faces( self, cells = None ):
+
+        with instrument.span( "faces" ) as stage:
+
+            resolution = len( self.filled )
+            padded     = numpy.zeros( ( resolution + 2, ) * 3, dtype = bool )
+            padded[ 1:-1, 1:-1, 1:-1 ] = self.filled
+
+            cube = Hexahedron().polygon()
+
+            self.cornerOffsets = numpy.rint( cube.vertices[ cube.faces ] + 0.5 ).astype( numpy.int64 )
+            self.directions    = numpy.rint( 2 * cube.vertices[ cube.faces ].mean( axis = 1 ) ).astype( numpy.int64 )
+
+            if cells is None:
+
+                # The exposed faces are stored on the grid of points, so their index is the key of their first corner
+
+                self.exposed = numpy.zeros( ( len( self.directions ), resolution + 1, resolution + 1, resolution + 1 ), dtype = bool )
+
+                for exposed, direction in zip( self.exposed[ :, :-1, :-1, :-1 ], self.directions ):
+
+                    x, y, z = 1 + direction
+
+                    exposed[ ... ] = self.filled & ~padded[ x : x + resolution, y : y + resolution, z : z + resolution ]
+
+                stage.count( cells = self.filled.size )
+
+                return
+
+            # The changed cells and their neighbours, rebuilt inside the box around them
+
+            changed = numpy.zeros( ( resolution + 2, ) * 3, dtype = bool )
+            changed[ tuple( axis + 1 for axis in cells ) ] = True
+
+            affected = changed[ 1:-1, 1:-1, 1:-1 ].copy()
+
+            for direction in self.directions:
+
+                x, y, z = 1 + direction
+
+                affected |= changed[ x : x + resolution, y : y + resolution, z : z + resolution ]
+
+            if len( cells[ 0 ] ):
+
+                # The box grows by a cell on every side for the neighbours
+
+                lower = [ max( axis.min() - 1, 0 ) for axis in cells ]
+                upper = [ min( axis.max() + 2, resolution ) for axis in cells ]
+                box   = tuple( slice( low, high ) for low, high in zip( lower, upper ) )
+
+                for exposed, direction in zip( self.exposed[ :, :-1, :-1, :-1 ], self.directions ):
+
+                    x, y, z    = 1 + direction
+                    neighbours = padded[ x : x + resolution, y : y + resolution, z : z + resolution ][ box ]
+
+                    numpy.copyto( exposed[ box ], self.filled[ box ] & ~neighbours, where = affected[ box ] )
+
+            stage.count( cells = int( affected.sum() ) )
+
+
+    """
+    Build the faces of the mesh from the exposed faces of the cells, welding their corners on the
+    integer grid like Sierpinski.surface.
+
+    """
+
+    def _weld( self ):
+
+        with instrument.span( "weld" ) as stage:
+
+            points  = len( self.filled ) + 1
+            keyType = polygon.indexType( points ** 3 )
+            keys    = [ ]
+
+            # The corners of every exposed face on the grid of points, offset from its first corner
+
+            for exposed, offsets in zip( self.exposed, self.cornerOffsets ):
+
+                cells = numpy.flatnonzero( exposed ).astype( keyType )
+
+                keys.append( cells[ :, None ] + ( ( offsets[ :, 0 ] * points + offsets[ :, 1 ] ) * points + offsets[ :, 2 ] ).astype( keyType ) )
+
+            keys = numpy.concatenate( keys )
+
+            used = numpy.zeros( points ** 3, dtype = bool )
+            used[ keys.reshape( -1 ) ] = True
+
+            index   = numpy.cumsum( used, dtype = polygon.indexType( points ** 3 ) ) - 1
+            corners = numpy.flatnonzero( used )
+
+            self.faces   = index[ keys ].astype( polygon.indexType( len( corners ) ) )
+            self.corners = numpy.column_stack( [ corners // ( points * points ), corners // points % points, corners % points ] )
+
+            stage.count( vertices = len( corners ), faces = len( self.faces ) )
@@ -0,0 +1,433 @@
+"""
+This module provides the platonic solids and their Sierpinski fractals on the golden lattice, shared
+by the tetrahedron, octahedron, dodecahedron and icosahedron modules. A solid module only declares
+the name and Maya type of its solid and the scale ratio of its fractal.
+
+Solid      -- Generate a platonic solid mesh
+Sierpinski -- Generate a Sierpinski fractal mesh of a platonic solid
+"""
+
+
+import numpy
+
+from forms.util import bvh, fractal, golden, ifs, instrument, lod, parallel, polygon, solids
+from forms.util.lazy import pm
+from forms.util.mesh import create, instancer, levelOfDetail
+
+
+
+class Solid():
+
+
+    """
+    Solid class. A platonic solid of the table in forms.util.solids, oriented like Maya's
+    polyPlatonicSolid. A subclass sets name, the name of the solid in forms.util.solids.names, and
+    solidType, the solidType of polyPlatonicSolid.
+
+    """
+
+    name      = None
+    solidType = None
+
+
+    """
+    Return the vertices and face normals of the solid on the golden lattice, and the matrix that maps
+    them onto the solid of radius 1.
+
+    Return:
+        vertices -- ( numpy.ndarray( ( V, 3, 2 ) ) )
+        normals  -- ( numpy.ndarray( ( F, 3, 2 ) ) )
+        basis    -- ( numpy.ndarray( ( 3, 3 ) ) )
+
+    """
+
+    def lattice( self ):
+
+        return solids.lattice( self.name )
+
+
+    """
+    Generate the solid as vertex and face arrays, oriented like Maya's platonic solid.
+
+    Parameters:
+        radius -- the distance from the centre to the vertices ( default 1 )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def polygon( self, radius = 1 ):
+
+        return solids.solid( self.name, radius )
+
+
+    """
+    Generate the solid and return the mesh.
+
+    Keyword arguments:
+        **kwargs -- a list of keyword arguments, refer to the pymel class documentation for the full list of arguments
+
+    Return:
+        mesh -- ( [pymel.core.nodetypes.Transform(u''), pymel.core.nodetypes.PolyPlatonicSolid(u'')] )
+
+    """
+
+    def mesh( self, **kwargs ):
+
+        return pm.polyPlatonicSolid( solidType = self.solidType, **kwargs )
+
+
+
+class Sierpinski( Solid ):
+
+
+    """
+    Sierpinski class. A Sierpinski fractal of a platonic solid, every iteration made of copies of the
+    one before moved onto the vertices of the solid. The copies are placed on the golden lattice, so
+    coincident vertices are welded exactly.
+
+    A subclass sets latticeScaleRatio, the ratio between the radius of an iteration and the radius of
+    its copies as a golden number, see forms.util.golden.number, and optionally centrePivots, whether
+    generate centres the pivot of the mesh.
+
+    """
+
+    latticeScaleRatio = None
+    centrePivots      = True
+
+    def __init__( self ):
+
+        self.scaleRatio = golden.toFloat( self.latticeScaleRatio )
+
+
+    """
+    Return the offsets of the copies of one iteration, relative to the radius of a copy.
+
+    Return:
+        offsets -- ( numpy.ndarray( ( V, 3 ) ) )
+
+    """
+
+    def offsets( self ):
+
+        return self.polygon().vertices * ( self.scaleRatio - 1 )
+
+
+    """
+    Return the translation and scale of every solid of the final iteration, without generating the iterations in between.
+
+    Parameters:
+        radius     -- the radius of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+
+    Return:
+        translations -- ( numpy.ndarray( ( V ** iterations, 3 ) ) )
+        scales       -- ( numpy.ndarray( ( V ** iterations, ) ) )
+
+    """
+
+    def transforms( self, radius = 10, iterations = 1 ):
+
+        self.radius     = radius
+        self.iterations = iterations
+
+        solidRadius = float(self.radius) / pow( float(self.scaleRatio), float(self.iterations) )
+
+        return fractal.transforms( self.offsets(), self.scaleRatio, self.iterations, solidRadius )
+
+
+    """
+    Lazily yield the translation and scale of every solid of the final iteration in chunks, see forms.util.fractal.iterTransforms.
+
+    Parameters:
+        radius     -- the radius of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        chunkSize  -- the most solids yielded at once ( default 65536 )
+
+    Return:
+        transforms -- a generator of translation and scale chunks ( ( numpy.ndarray( ( n, 3 ) ), numpy.ndarray( ( n, ) ) ) )
+
+    """
+
+    def iterTransforms( self, radius = 10, iterations = 1, chunkSize = 65536 ):
+
+        solidRadius = float(radius) / pow( float(self.scaleRatio), float(iterations) )
+
+        return fractal.iterTransforms( self.offsets(), self.scaleRatio, iterations, solidRadius, chunkSize )
+
+
+    """
+    Generate the Sierpinski fractal as welded vertex and face arrays, without Maya.
+
+    Parameters:
+        radius     -- the radius of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        cache      -- load and save the mesh in a cache ( forms.util.cache.Cache default None )
+        workers    -- build blocks of the mesh in this many processes, see forms.util.parallel ( default 1 )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    @instrument.measure( "compute", "radius", "iterations", "workers" )
+    def compute( self, radius = 10, iterations = 1, cache = None, workers = 1 ):
+
+        if cache is not None:
+
+            return cache.compute( self, { "workers" : workers }, radius = radius, iterations = iterations )
+
+        if workers > 1:
+
+            self.radius     = radius
+            self.iterations = iterations
+
+            solidRadius = float(self.radius) / pow( float(self.scaleRatio), float(self.iterations) )
+            tolerance   = solidRadius * 1e-3
+
+            # Every block is a whole sub fractal, welded by its worker
+
+            translations, depth = fractal.blocks( self.offsets(), self.scaleRatio, self.iterations, solidRadius, workers * 4 )
+            blocks              = [ ( self.polygon(), self.offsets(), self.scaleRatio, depth, solidRadius, translation, tolerance ) for translation in translations ]
+
+            return parallel.compute( fractal.block, blocks, workers, tolerance )
+
+        self.radius     = radius
+        self.iterations = iterations
+
+        vertices, normals, basis = self.lattice()
+
+        # Place every solid on the golden lattice, in units of the smallest solids, so coincident vertices are welded exactly
+
+        offsets         = golden.multiply( vertices, self.latticeScaleRatio - golden.number( 1 ) )
+        translations    = golden.transforms( offsets, self.latticeScaleRatio, self.iterations )
+        vertices, faces = golden.instance( vertices, self.polygon().faces, translations )
+
+        return self._mesh( vertices, faces, self.radius, self.iterations )
+
+
+    """
+    Convert the golden lattice vertices of an iteration, in units of its smallest solids, to a mesh of
+    a radius. The mesh keeps the lattice, see expand.
+
+    Parameters:
+        vertices   -- ( numpy.ndarray( ( V, 3, 2 ) ) )
+        faces      -- ( numpy.ndarray( ( F, sides ) ) )
+        radius     -- the radius of the mesh ( float )
+        iterations -- the amount of iterations ( int )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def _mesh( self, vertices, faces, radius, iterations ):
+
+        basis = self.lattice()[ 2 ]
+        scale = float(radius) / golden.toFloat( golden.power( self.latticeScaleRatio, iterations ) )
+
+        return polygon.Mesh( numpy.dot( golden.toFloat( vertices ), basis.T ) * scale, faces, vertices )
+
+
+    """
+    Derive the next iteration of the Sierpinski fractal from a computed iteration, by placing a copy
+    of its golden lattice vertices at every offset, so the mesh equals the mesh of compute.
+    forms.util.cache.Cache uses this to build on cached iterations. A mesh without golden lattice
+    coordinates, such as one built by workers, is computed again.
+
+    Parameters:
+        mesh       -- the computed mesh ( forms.util.polygon.Mesh )
+        radius     -- the radius of the computed mesh ( default 10cm )
+        iterations -- the amount of iterations of the computed mesh ( default 1 )
+
+    Return:
+        mesh -- the next iteration, with the same radius ( forms.util.polygon.Mesh )
+
+    """
+
+    @instrument.measure( "expand", "iterations" )
+    def expand( self, mesh, radius = 10, iterations = 1 ):
+
+        if mesh.lattice is None:
+
+            return self.compute( radius, iterations + 1 )
+
+        # The copies of the next iteration are the biggest copies, a scale ratio ** iterations smallest solids apart
+
+        offsets         = golden.multiply( self.lattice()[ 0 ], self.latticeScaleRatio - golden.number( 1 ) )
+        translations    = golden.multiply( offsets, golden.power( self.latticeScaleRatio, iterations ) )
+        vertices, faces = golden.instance( numpy.asarray( mesh.lattice ), numpy.asarray( mesh.faces ), translations )
+
+        return self._mesh( vertices, faces, radius, iterations + 1 )
+
+
+    """
+    Return the Sierpinski fractal as one solid and the transform of every copy of it, without merging
+    the copies.
+
+    Parameters:
+        radius     -- the radius of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+
+    Return:
+        instances -- ( forms.util.polygon.Instances )
+
+    """
+
+    @instrument.measure( "instances", "radius", "iterations" )
+    def instances( self, radius = 10, iterations = 1 ):
+
+        translations, scales = self.transforms( radius, iterations )
+
+        return polygon.Instances( self.polygon(), translations, scales )
+
+
+    """
+    Return the Sierpinski fractal as an iterated function system, one map per copy of an iteration,
+    see forms.util.ifs.System. N iterations of the system applied to the solid of the radius give
+    the fractal.
+
+    Parameters:
+        radius -- the radius of the final mesh ( default 10cm )
+
+    Return:
+        system -- ( forms.util.ifs.System )
+
+    """
+
+    def system( self, radius = 10 ):
+
+        scale = 1.0 / self.scaleRatio
+
+        return ifs.similarity( self.offsets() * ( float(radius) * scale ), scale )
+
+
+    """
+    Return the Sierpinski fractal as a scene graph, where every iteration refers to the one below it,
+    see forms.util.graph.Node. The graph stores one translation per copy of an iteration however many
+    iterations there are, and is flattened only for the depth and region asked for.
+
+    Parameters:
+        radius     -- the radius of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+
+    Return:
+        node -- ( forms.util.graph.Node )
+
+    """
+
+    @instrument.measure( "graph", "radius", "iterations" )
+    def graph( self, radius = 10, iterations = 1 ):
+
+        return self.system( radius ).graph( self.polygon( radius ), iterations )
+
+
+    """
+    Return every iteration of the Sierpinski fractal up to the final one as a level of detail
+    pyramid, see forms.util.lod. Level k replaces every sub fractal it does not resolve with its
+    bounding solid, so a viewer switches levels without generating anything. The iterations are
+    built in one pass and share one vertex buffer, the last level being the mesh of compute.
+
+    Parameters:
+        radius     -- the radius of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+
+    Return:
+        pyramid -- ( forms.util.lod.Pyramid )
+
+    """
+
+    @instrument.measure( "pyramid", "radius", "iterations" )
+    def pyramid( self, radius = 10, iterations = 1 ):
+
+        vertices, normals, basis = self.lattice()
+
+        offsets         = golden.multiply( vertices, self.latticeScaleRatio - golden.number( 1 ) )
+        vertices, faces = golden.levels( vertices, self.polygon().faces, offsets, self.latticeScaleRatio, iterations )
+
+        scale = float(radius) / golden.toFloat( golden.power( self.latticeScaleRatio, iterations ) )
+
+        # A level strays from the fractal by at most the diameter of the solid standing in for a sub fractal
+
+        errors = [ 2.0 * float(radius) / pow( float(self.scaleRatio), level ) for level in range( iterations ) ] + [ 0.0 ]
+
+        return lod.Pyramid( numpy.dot( golden.toFloat( vertices ), basis.T ) * scale, faces, errors )
+
+
+    """
+    Return the Sierpinski fractal as a bounding volume hierarchy for ray intersection, frustum
+    culling, nearest point queries and chunked meshes, see forms.util.bvh.Hierarchy. The hierarchy
+    walks the graph of the fractal, so it costs no more to build than graph.
+
+    Parameters:
+        radius     -- the radius of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+
+    Return:
+        hierarchy -- ( forms.util.bvh.Hierarchy )
+
+    """
+
+    @instrument.measure( "hierarchy", "radius", "iterations" )
+    def hierarchy( self, radius = 10, iterations = 1 ):
+
+        # The chunks are welded with the same tolerance as compute
+
+        return bvh.Hierarchy( self.graph( radius, iterations ), float(radius) / pow( float(self.scaleRatio), float(iterations) ) * 1e-3 )
+
+
+    """
+    Generate the Sierpinski fractal mesh.
+
+    Parameters:
+        radius     -- the radius of the final mesh ( default 10cm )
+        iterations -- the amount of iterations ( default 1 )
+        cache      -- load and save the mesh in a cache ( forms.util.cache.Cache default None )
+        workers    -- build blocks of the mesh in this many processes, see forms.util.parallel ( default 1 )
+        instanced  -- copy one solid with a particle instancer instead of merging the copies ( default False )
+        lod        -- output every iteration under a lodGroup switching by camera distance, see pyramid ( default False )
+
+    Return:
+        mesh -- ( pymel.core.nodetypes.Transform(u'') || [pymel.core.nodetypes.Transform(u''), pymel.core.nodetypes.Instancer(u''), pymel.core.nodetypes.Transform(u'')] || [pymel.core.nodetypes.LodGroup(u''), pymel.core.nodetypes.Transform(u''), ...] )
+
+    """
+
+    @instrument.measure( "generate", "radius", "iterations", "instanced", "lod" )
+    def generate( self, radius = 10, iterations = 1, cache = None, workers = 1, instanced = False, lod = False ):
+
+        if lod:
+
+            mesh = levelOfDetail( self.pyramid( radius, iterations ), "Sierpinski_Iteration_%i" % iterations )
+
+            with instrument.span( "soften" ):
+
+                for level in mesh[ 1 : ]:
+
+                    pm.polySoftEdge( level, angle = 0, constructionHistory = False )
+
+            return mesh
+
+        if instanced:
+
+            mesh = instancer( self.instances( radius, iterations ), "Sierpinski_Iteration_%i" % iterations )
+
+            with instrument.span( "soften" ):
+
+                pm.polySoftEdge( mesh[ 2 ], angle = 0, constructionHistory = False )
+
+            return mesh
+
+        mesh = create( self.compute( radius, iterations, cache, workers ), "Sierpinski_Iteration_%i" % iterations )
+
+        with instrument.span( "soften" ):
+
+            pm.polySoftEdge( mesh[ 0 ], angle = 0, constructionHistory = False )
+
+        if self.centrePivots:
+
+            with instrument.span( "pivots" ):
+
+                pm.xform( mesh[ 0 ], centerPivots = True )
+
+        return mesh
@@ -0,0 +1,531 @@
+"""
+This module provides a bounding volume hierarchy over the scene graph of a fractal, for ray
+intersection, frustum culling and nearest point queries, and the fractal cut into chunks along it.
+
+The graph of a fractal is already a perfect hierarchy, the copies of every node being the boxes of
+the level below, see forms.util.graph. The hierarchy is not built, every query walks the graph and
+only descends into the boxes it can not rule out.
+
+Hierarchy -- A bounding volume hierarchy over the graph of a fractal
+"""
+
+
+import numpy
+
+from forms.util import graph, instrument, polygon
+
+
+
+class Hierarchy():
+
+
+    """
+    Hierarchy class. Copies and faces are numbered in the order of graph.Node.flatten, the faces of
+    copy c being c * F to ( c + 1 ) * F - 1 for a mesh of F faces.
+
+    Parameters:
+        node      -- the graph of the fractal ( forms.util.graph.Node || forms.util.polygon.Mesh )
+        tolerance -- the weld tolerance of the chunks ( float default 1e-6 )
+        lamina    -- remove the faces where the copies of a chunk touch, see forms.util.polygon.removeLamina ( bool default False )
+        chunkSize -- the most pairs of queries and triangles tested at once ( int default 1048576 )
+
+    """
+
+    def __init__( self, node, tolerance = 1e-6, lamina = False, chunkSize = 1048576 ):
+
+        self.node      = node
+        self.nodes     = node.nodes() if isinstance( node, graph.Node ) else [ ]
+        self.mesh      = node.mesh() if isinstance( node, graph.Node ) else node
+        self.tolerance = float(tolerance)
+        self.lamina    = lamina
+        self.chunkSize = chunkSize
+
+        # The triangles of the mesh at the bottom of the graph, and the face of each
+
+        self.triangles = self.mesh.vertices[ self.mesh.triangles() ]
+        self.faces     = numpy.arange( len( self.triangles ) ) // max( self.mesh.sides() - 2, 1 )
+
+
+    def __repr__( self ):
+
+        return "Hierarchy(%i levels, %i copies of %r)" % ( self.depth(), self.count(), self.mesh )
+
+
+    def depth( self ):
+
+        return len( self.nodes )
+
+
+    def count( self ):
+
+        return self.node.count() if isinstance( self.node, graph.Node ) else 1
+
+
+    """
+    Walk the graph down to a depth, keeping the pairs of queries and boxes a test keeps.
+
+    Parameters:
+        queries -- the amount of queries ( int )
+        keep    -- returns which pairs to keep from their queries and box corners ( function( numpy.ndarray( ( n, ) ), numpy.ndarray( ( n, 3 ) ), numpy.ndarray( ( n, 3 ) ) ) )
+        depth   -- the amount of levels to descend, every level by default ( int default None )
+
+    Return:
+        queries      -- the query of every pair ( numpy.ndarray( ( n, ) ) )
+        copies       -- the copy of every pair at the depth ( numpy.ndarray( ( n, ) ) )
+        translations -- the translation of every pair ( numpy.ndarray( ( n, 3 ) ) )
+        scale        -- the scale of the copies at the depth ( float )
+
+    """
+
+    def _descend( self, queries, keep, depth = None ):
+
+        nodes  = self.nodes if depth is None else self.nodes[ : max( depth, 0 ) ]
+        bounds = self.node.bounds()
+        scale  = 1.0
+
+        queries      = numpy.arange( queries )
+        copies       = numpy.zeros( len( queries ), dtype = numpy.int64 )
+        translations = numpy.zeros( ( len( queries ), 3 ) )
+
+        for level, node in enumerate( nodes ):
+
+            with instrument.span( "level", level = len( nodes ) - level - 1 ) as stage:
+
+                inside       = keep( queries, translations + scale * bounds[ 0 ], translations + scale * bounds[ 1 ] )
+                queries      = queries[ inside ]
+                copies       = copies[ inside ]
+                translations = translations[ inside ]
+
+                # Every kept box is replaced by the boxes of its copies
+
+                K            = len( node.translations )
+                queries      = numpy.repeat( queries, K )
+                copies       = ( copies[ :, None ] * K + numpy.arange( K ) ).reshape( -1 )
+                translations = ( translations[ :, None, : ] + scale * node.translations[ None, :, : ] ).reshape( -1, 3 )
+                scale       *= node.scale
+                bounds       = node.child.bounds()
+
+                stage.count( pairs = len( queries ) )
+
+        inside = keep( queries, translations + scale * bounds[ 0 ], translations + scale * bounds[ 1 ] )
+
+        return queries[ inside ], copies[ inside ], translations[ inside ], scale
+
+
+    """
+    Return the translation and scale of every node at a depth, the whole fractal being depth 0.
+
+    Parameters:
+        depth -- the depth ( int default None )
+
+    Return:
+        translations -- ( numpy.ndarray( ( n, 3 ) ) )
+        scales       -- ( numpy.ndarray( ( n, ) ) )
+
+    """
+
+    def transforms( self, depth = None ):
+
+        queries, copies, translations, scale = self._descend( 1, lambda queries, lower, upper : numpy.ones( len( queries ), dtype = bool ), depth )
+
+        return translations, numpy.full( len( translations ), scale )
+
+
+    """
+    Return the axis aligned bounding box of every node at a depth.
+
+    Parameters:
+        depth -- the depth ( int default None )
+
+    Return:
+        bounds -- the minimum and maximum corners ( numpy.ndarray( ( n, 2, 3 ) ) )
+
+    """
+
+    def bounds( self, depth = None ):
+
+        translations, scales = self.transforms( depth )
+        lower, upper         = self._node( depth ).bounds()
+
+        return numpy.stack( [ translations + scales[ :, None ] * lower, translations + scales[ :, None ] * upper ], axis = 1 )
+
+
+    """
+    Return the node at a depth, the mesh below the last level.
+
+    Parameters:
+        depth -- the depth, the mesh by default ( int default None )
+
+    Return:
+        node -- ( forms.util.graph.Node || forms.util.polygon.Mesh )
+
+    """
+
+    def _node( self, depth = None ):
+
+        if depth is None or depth >= self.depth():
+
+            return self.mesh
+
+        return self.nodes[ max( depth, 0 ) ]
+
+
+    """
+    Return the nodes at a depth inside a view frustum, or whose box crosses it.
+
+    Parameters:
+        planes -- the planes of the frustum, a point x is inside when dot( plane[ :3 ], x ) + plane[ 3 ] >= 0 for every plane, see frustumPlanes ( numpy.ndarray( ( P, 4 ) ) )
+        depth  -- the depth, every level by default for the copies of the mesh ( int default None )
+
+    Return:
+        copies -- the index of every visible node at the depth ( numpy.ndarray( ( n, ) ) )
+
+    """
+
+    @instrument.measure( "frustum", "depth" )
+    def frustum( self, planes, depth = None ):
+
+        planes  = numpy.asarray( planes, dtype = numpy.float64 ).reshape( -1, 4 )
+        normals = planes[ :, :3 ]
+
+        def keep( queries, lower, upper ):
+
+            # A box is outside when its corner furthest along the normal of a plane is behind it
+
+            corners = numpy.where( normals[ None ] >= 0, upper[ :, None ], lower[ :, None ] )
+
+            return ( ( corners * normals[ None ] ).sum( axis = 2 ) + planes[ None, :, 3 ] >= 0 ).all( axis = 1 )
+
+        return self._descend( 1, keep, depth )[ 1 ]
+
+
+    """
+    Intersect rays with the fractal.
+
+    Parameters:
+        origins    -- the origin of every ray ( numpy.ndarray( ( R, 3 ) ) )
+        directions -- the direction of every ray, the distances are in units of its length ( numpy.ndarray( ( R, 3 ) ) )
+
+    Return:
+        distances -- the distance to the nearest hit, inf for a miss ( numpy.ndarray( ( R, ) ) )
+        faces     -- the face hit, -1 for a miss ( numpy.ndarray( ( R, ) ) )
+
+    """
+
+    @instrument.measure( "intersect" )
+    def intersect( self, origins, directions ):
+
+        origins    = numpy.asarray( origins, dtype = numpy.float64 ).reshape( -1, 3 )
+        directions = numpy.asarray( directions, dtype = numpy.float64 ).reshape( -1, 3 )
+
+        with numpy.errstate( divide = "ignore", invalid = "ignore" ):
+
+            inverse = 1.0 / directions
+
+        def near( queries, lower, upper ):
+
+            # Slab test, fmin and fmax skip the nan of rays running along a slab
+
+            with numpy.errstate( invalid = "ignore" ):
+
+                lows  = ( lower - origins[ queries ] ) * inverse[ queries ]
+                highs = ( upper - origins[ queries ] ) * inverse[ queries ]
+
+            enter = numpy.fmax( numpy.fmin( lows, highs ).max( axis = 1 ), 0 )
+            leave = numpy.fmin( numpy.fmax( lows, highs ).min( axis = 1 ), numpy.inf )
+
+            return numpy.where( enter <= leave, enter, numpy.inf )
+
+        def measure( queries, corners ):
+
+            return _rayTriangle( origins[ queries ], directions[ queries ], corners ), None
+
+        distances, faces, points = self._search( len( origins ), near, measure )
+
+        return distances, faces
+
+
+    """
+    Find the nearest point of the fractal to every point.
+
+    Parameters:
+        points -- the points ( numpy.ndarray( ( P, 3 ) ) )
+
+    Return:
+        nearest   -- the nearest point on the fractal ( numpy.ndarray( ( P, 3 ) ) )
+        distances -- the distance to it ( numpy.ndarray( ( P, ) ) )
+        faces     -- the face it is on ( numpy.ndarray( ( P, ) ) )
+
+    """
+
+    @instrument.measure( "nearest" )
+    def nearest( self, points ):
+
+        points = numpy.asarray( points, dtype = numpy.float64 ).reshape( -1, 3 )
+
+        def near( queries, lower, upper ):
+
+            offsets = points[ queries ]
+
+            return numpy.sqrt( ( ( numpy.clip( offsets, lower, upper ) - offsets ) ** 2 ).sum( axis = 1 ) )
+
+        def measure( queries, corners ):
+
+            closest = _closestTriangle( points[ queries ], corners )
+
+            return numpy.sqrt( ( ( closest - points[ queries ] ) ** 2 ).sum( axis = 1 ) ), closest
+
+        distances, faces, nearest = self._search( len( points ), near, measure )
+
+        return nearest, distances, faces
+
+
+    """
+    Cut the fractal into one welded mesh per node at a depth, in the order of transforms. The subtree
+    below the depth is flattened and welded once, and every chunk is a moved copy of it sharing its
+    faces.
+
+    Parameters:
+        depth -- the depth, 0 for one chunk ( int default 1 )
+
+    Return:
+        chunks -- ( [,forms.util.polygon.Mesh] )
+
+    """
+
+    @instrument.measure( "chunks", "depth" )
+    def chunks( self, depth = 1 ):
+
+        depth = min( max( depth, 0 ), self.depth() )
+        child = self._node( depth )
+
+        with instrument.span( "subtree" ):
+
+            if isinstance( child, graph.Node ):
+
+                # The subtree is the size of the graph, its copies are welded like the copies of the fractal
+
+                scale                = numpy.prod( [ node.scale for node in self.nodes[ : depth ] ] )
+                translations, scales = child.transforms()
+                subtree              = polygon.weld( polygon.instance( self.mesh, translations, scales ), self.tolerance / scale )
+
+                if self.lamina:
+
+                    subtree = polygon.compact( polygon.removeLamina( subtree ) )
+
+            else:
+
+                subtree = self.mesh
+
+        translations, scales = self.transforms( depth )
+
+        return [ polygon.Mesh( subtree.vertices * scale + translation, subtree.faces ) for translation, scale in zip( translations, scales ) ]
+
+
+    """
+    Search the hierarchy for the nearest hit of every query, best first. The search always carries on
+    from the deepest level, descending into the nearest few boxes of every query and putting the
+    others off, so the first hits are found after one descent and every box further away than the
+    nearest hit of its query is skipped.
+
+    Parameters:
+        count   -- the amount of queries ( int )
+        near    -- returns the least distance of a hit inside every box of every query, inf for none ( function( numpy.ndarray( ( n, ) ), numpy.ndarray( ( n, 3 ) ), numpy.ndarray( ( n, 3 ) ) ) )
+        measure -- returns the distance of the hit of every query and triangle, inf for a miss, and the hit points or None ( function( numpy.ndarray( ( m, ) ), numpy.ndarray( ( m, 3, 3 ) ) ) )
+        beam    -- the most boxes of a query descended into at once ( int default 4 )
+
+    Return:
+        distances -- the distance of the nearest hit, inf for a miss ( numpy.ndarray( ( count, ) ) )
+        faces     -- the face of the nearest hit, -1 for a miss ( numpy.ndarray( ( count, ) ) )
+        points    -- the point of the nearest hit ( numpy.ndarray( ( count, 3 ) ) )
+
+    """
+
+    def _search( self, count, near, measure, beam = 4 ):
+
+        # The scale and the bounds of the boxes of every level, the mesh being the last
+
+        scales = numpy.cumprod( [ 1.0 ] + [ node.scale for node in self.nodes ] )
+        bounds = [ self._node( level ).bounds() for level in range( self.depth() + 1 ) ]
+
+        distances = numpy.full( count, numpy.inf )
+        faces     = numpy.full( count, -1, dtype = numpy.int64 )
+        points    = numpy.zeros( ( count, 3 ) )
+
+        queries = numpy.arange( count )
+        pending = { 0 : ( queries, numpy.zeros( count, dtype = numpy.int64 ), numpy.zeros( ( count, 3 ) ), near( queries, bounds[ 0 ][ :1 ].repeat( count, 0 ), bounds[ 0 ][ 1: ].repeat( count, 0 ) ) ) }
+
+        while pending:
+
+            level                                  = max( pending )
+            queries, copies, translations, nearest = pending.pop( level )
+
+            alive                                  = numpy.nonzero( nearest <= distances[ queries ] )[ 0 ]
+            queries, copies, translations, nearest = queries[ alive ], copies[ alive ], translations[ alive ], nearest[ alive ]
+
+            if not len( queries ):
+
+                continue
+
+            # Take the nearest boxes of every query and put the others off
+
+            order = numpy.lexsort( ( nearest, queries ) )
+            ranks = numpy.empty( len( order ), dtype = numpy.int64 )
+            ranks[ order ] = numpy.arange( len( order ) ) - numpy.searchsorted( queries[ order ], queries[ order ] )
+            take  = ranks < beam
+
+            if not take.all():
+
+                pending[ level ] = ( queries[ ~take ], copies[ ~take ], translations[ ~take ], nearest[ ~take ] )
+
+            queries, copies, translations = queries[ take ], copies[ take ], translations[ take ]
+
+            if level < self.depth():
+
+                # Replace the boxes by the boxes of their copies
+
+                node         = self.nodes[ level ]
+                K            = len( node.translations )
+                queries      = numpy.repeat( queries, K )
+                copies       = ( copies[ :, None ] * K + numpy.arange( K ) ).reshape( -1 )
+                translations = ( translations[ :, None, : ] + scales[ level ] * node.translations[ None, :, : ] ).reshape( -1, 3 )
+                nearest      = near( queries, translations + scales[ level + 1 ] * bounds[ level + 1 ][ 0 ], translations + scales[ level + 1 ] * bounds[ level + 1 ][ 1 ] )
+                hit          = numpy.isfinite( nearest )
+
+                pending[ level + 1 ] = ( queries[ hit ], copies[ hit ], translations[ hit ], nearest[ hit ] )
+
+                continue
+
+            # Test the triangles of the leaf boxes
+
+            triangles = len( self.triangles )
+
+            for chunk in range( 0, len( queries ) * triangles, self.chunkSize ):
+
+                pairs    = numpy.arange( chunk, min( chunk + self.chunkSize, len( queries ) * triangles ) )
+                box      = pairs // triangles
+                triangle = pairs % triangles
+                corners  = translations[ box ][ :, None ] + scales[ level ] * self.triangles[ triangle ]
+
+                hits, hitPoints = measure( queries[ box ], corners )
+
+                # Keep the nearest hit of every query
+
+                hit          = numpy.nonzero( hits < distances[ queries[ box ] ] )[ 0 ]
+                hit          = hit[ numpy.lexsort( ( hits[ hit ], queries[ box[ hit ] ] ) ) ]
+                unique       = numpy.ones( len( hit ), dtype = bool )
+                unique[ 1: ] = queries[ box[ hit ] ][ 1: ] != queries[ box[ hit ] ][ :-1 ]
+                hit          = hit[ unique ]
+                query        = queries[ box[ hit ] ]
+
+                distances[ query ] = hits[ hit ]
+                faces[ query ]     = copies[ box[ hit ] ] * self.mesh.numFaces() + self.faces[ triangle[ hit ] ]
+
+                if hitPoints is not None:
+
+                    points[ query ] = hitPoints[ hit ]
+
+        return distances, faces, points
+
+
+
+"""
+Intersect rays with triangles, see Moller and Trumbore.
+
+Parameters:
+    origins    -- the origin of every ray ( numpy.ndarray( ( n, 3 ) ) )
+    directions -- the direction of every ray ( numpy.ndarray( ( n, 3 ) ) )
+    triangles  -- the corners of the triangle of every ray ( numpy.ndarray( ( n, 3, 3 ) ) )
+
+Return:
+    distances -- the distance to the hit, inf for a miss ( numpy.ndarray( ( n, ) ) )
+
+"""
+
+def _rayTriangle( origins, directions, triangles ):
+
+    edge1 = triangles[ :, 1 ] - triangles[ :, 0 ]
+    edge2 = triangles[ :, 2 ] - triangles[ :, 0 ]
+    p     = numpy.cross( directions, edge2 )
+    det   = ( edge1 * p ).sum( axis = 1 )
+
+    with numpy.errstate( divide = "ignore", invalid = "ignore" ):
+
+        inverse = 1.0 / det
+        offset  = origins - triangles[ :, 0 ]
+        u       = ( offset * p ).sum( axis = 1 ) * inverse
+        q       = numpy.cross( offset, edge1 )
+        v       = ( directions * q ).sum( axis = 1 ) * inverse
+        t       = ( edge2 * q ).sum( axis = 1 ) * inverse
+
+        hit = ( numpy.abs( det ) > 1e-12 ) & ( u >= 0 ) & ( v >= 0 ) & ( u + v <= 1 ) & ( t >= 0 )
+
+    return numpy.where( hit, t, numpy.inf )
+
+
+
+"""
+Return the closest point of triangles to points, the closest of the point projected onto the plane
+of the triangle when it falls inside, and the closest points on the three edges.
+
+Parameters:
+    points    -- the points ( numpy.ndarray( ( n, 3 ) ) )
+    triangles -- the corners of the triangle of every point ( numpy.ndarray( ( n, 3, 3 ) ) )
+
+Return:
+    closest -- ( numpy.ndarray( ( n, 3 ) ) )
+
+"""
+
+def _closestTriangle( points, triangles ):
+
+    a, b, c = triangles[ :, 0 ], triangles[ :, 1 ], triangles[ :, 2 ]
+    normals = numpy.cross( b - a, c - a )
+    lengths = ( normals * normals ).sum( axis = 1 )
+
+    with numpy.errstate( divide = "ignore", invalid = "ignore" ):
+
+        projected = points - ( ( ( points - a ) * normals ).sum( axis = 1 ) / lengths )[ :, None ] * normals
+
+    inside = lengths > 0
+
+    for start, end in [ ( a, b ), ( b, c ), ( c, a ) ]:
+
+        inside &= ( numpy.cross( end - start, projected - start ) * normals ).sum( axis = 1 ) >= 0
+
+    candidates = [ ]
+
+    for start, end in [ ( a, b ), ( b, c ), ( c, a ) ]:
+
+        edge = end - start
+
+        with numpy.errstate( divide = "ignore", invalid = "ignore" ):
+
+            t = numpy.clip( numpy.nan_to_num( ( ( points - start ) * edge ).sum( axis = 1 ) / ( edge * edge ).sum( axis = 1 ) ), 0, 1 )
+
+        candidates.append( start + t[ :, None ] * edge )
+
+    candidates = numpy.stack( candidates, axis = 1 )
+    nearest    = candidates[ numpy.arange( len( points ) ), ( ( candidates - points[ :, None ] ) ** 2 ).sum( axis = 2 ).argmin( axis = 1 ) ]
+
+    return numpy.where( inside[ :, None ], projected, nearest )
+
+
+
+"""
+Return the planes of the view frustum of a view projection matrix, see Gribb and Hartmann. The
+matrix maps column vectors, use its transpose for Maya's row vector matrices.
+
+Parameters:
+    matrix -- the projection matrix times the view matrix ( numpy.ndarray( ( 4, 4 ) ) )
+
+Return:
+    planes -- the left, right, bottom, top, near and far planes, facing inwards ( numpy.ndarray( ( 6, 4 ) ) )
+
+"""
+
+def frustumPlanes( matrix ):
+
+    matrix = numpy.asarray( matrix, dtype = numpy.float64 )
+
+    return numpy.array( [ matrix[ 3 ] + matrix[ 0 ], matrix[ 3 ] - matrix[ 0 ], matrix[ 3 ] + matrix[ 1 ], matrix[ 3 ] - matrix[ 1 ], matrix[ 3 ] + matrix[ 2 ], matrix[ 3 ] - matrix[ 2 ] ] )
@@ -0,0 +1,312 @@
+"""
+This module provides an on-disk cache of generated meshes, so the same fractal is only generated once.
+
+Cache -- A size bounded cache of vertex and face arrays keyed by the generator parameters
+"""
+
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy
+
+from forms.util import instrument, polygon
+
+
+
+"""
+Normalize generator parameters so equal values give equal keys, 10 and 10.0 for example.
+
+Parameters:
+    value -- a parameter value ( bool || int || float || string || list )
+
+Return:
+    value -- ( bool || float || string || list )
+
+"""
+
+def _normalize( value ):
+
+    if isinstance( value, ( list, tuple ) ):
+
+        return [ _normalize( item ) for item in value ]
+
+    if isinstance( value, ( bool, str ) ) or value is None:
+
+        return value
+
+    return float( value )
+
+
+
+class Cache():
+
+
+    """
+    Cache class. Every entry is a directory named after a hash of the generator and its parameters,
+    holding the vertex and face arrays as .npy files and the parameters as params.json. The golden
+    lattice coordinates of a mesh are saved too when it has them, see forms.util.polygon.Mesh.
+
+    Entries are loaded with numpy.load( mmap_mode = "r" ), so a cache hit reads no geometry up
+    front and processes loading the same entry share its pages. Loading an entry marks it as recently
+    used, and saving an entry evicts the least recently used entries until the cache fits in maxSize.
+
+    Parameters:
+        directory -- the cache directory, by default $FORMS_CACHE or ~/.forms/cache ( default None )
+        maxSize   -- the most bytes the entries may use ( default 1GB )
+
+    """
+
+    version = 2
+
+    def __init__( self, directory = None, maxSize = 2 ** 30 ):
+
+        if directory is None:
+
+            directory = os.environ.get( "FORMS_CACHE", os.path.join( os.path.expanduser( "~" ), ".forms", "cache" ) )
+
+        self.directory = directory
+        self.maxSize   = maxSize
+
+        if not os.path.isdir( self.directory ):
+
+            os.makedirs( self.directory )
+
+
+    def __repr__( self ):
+
+        return "Cache(%s, %i entries, %i bytes)" % ( self.directory, len( self.entries() ), self.size() )
+
+
+    """
+    Return the key of a generator and its parameters.
+
+    Parameters:
+        generator -- the generator, its module and class name are hashed ( object )
+        params    -- the keyword arguments of the generator's compute method ( dict )
+
+    Return:
+        key -- ( string )
+
+    """
+
+    def key( self, generator, params ):
+
+        name = "%s.%s" % ( generator.__class__.__module__, generator.__class__.__name__ )
+        data = json.dumps( [ self.version, name, _normalize( sorted( params.items() ) ) ] )
+
+        return hashlib.sha1( data.encode( "utf-8" ) ).hexdigest()
+
+
+    def path( self, key ):
+
+        return os.path.join( self.directory, key )
+
+
+    """
+    Return the keys of every entry.
+
+    Return:
+        keys -- ( [,string] )
+
+    """
+
+    def entries( self ):
+
+        return [ name for name in os.listdir( self.directory ) if len( name ) == 40 and os.path.isdir( self.path( name ) ) ]
+
+
+    """
+    Return the bytes used by the entries.
+
+    Return:
+        size -- ( int )
+
+    """
+
+    def size( self ):
+
+        return sum( self._size( key ) for key in self.entries() )
+
+
+    def _size( self, key ):
+
+        path = self.path( key )
+
+        return sum( os.path.getsize( os.path.join( path, name ) ) for name in os.listdir( path ) )
+
+
+    """
+    Load a cached mesh as memory mapped arrays.
+
+    Parameters:
+        generator -- the generator ( object )
+        params    -- the keyword arguments of the generator's compute method ( dict )
+
+    Return:
+        mesh -- the cached mesh or None when there is no entry ( forms.util.polygon.Mesh || None )
+
+    """
+
+    @instrument.measure( "load" )
+    def load( self, generator, params ):
+
+        path = self.path( self.key( generator, params ) )
+
+        try:
+
+            vertices = numpy.load( os.path.join( path, "vertices.npy" ), mmap_mode = "r" )
+            faces    = numpy.load( os.path.join( path, "faces.npy" ), mmap_mode = "r" )
+            lattice  = numpy.load( os.path.join( path, "lattice.npy" ), mmap_mode = "r" ) if os.path.exists( os.path.join( path, "lattice.npy" ) ) else None
+
+        except ( IOError, OSError, ValueError ):
+
+            return None
+
+        # Mark the entry as recently used
+
+        os.utime( path, None )
+
+        return polygon.Mesh( vertices, faces, lattice )
+
+
+    """
+    Save a mesh and return it loaded from the cache. The entry is written to a temporary directory
+    and renamed into place, so other processes never see a partial entry.
+
+    Parameters:
+        generator -- the generator ( object )
+        params    -- the keyword arguments of the generator's compute method ( dict )
+        mesh      -- the mesh to save ( forms.util.polygon.Mesh )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    @instrument.measure( "save" )
+    def save( self, generator, params, mesh ):
+
+        key       = self.key( generator, params )
+        temporary = "%s.%i.tmp" % ( self.path( key ), os.getpid() )
+
+        os.makedirs( temporary )
+
+        numpy.save( os.path.join( temporary, "vertices.npy" ), mesh.vertices )
+        numpy.save( os.path.join( temporary, "faces.npy" ), mesh.faces )
+
+        if mesh.lattice is not None:
+
+            numpy.save( os.path.join( temporary, "lattice.npy" ), mesh.lattice )
+
+        with open( os.path.join( temporary, "params.json" ), "w" ) as f:
+
+            json.dump( { "generator" : "%s.%s" % ( generator.__class__.__module__, generator.__class__.__name__ ), "params" : params }, f, sort_keys = True )
+
+        try:
+
+            os.rename( temporary, self.path( key ) )
+
+        except OSError:
+
+            # Another process saved the entry first
+
+            shutil.rmtree( temporary, ignore_errors = True )
+
+        self.evict( keep = key )
+
+        return self.load( generator, params )
+
+
+    """
+    Remove the least recently used entries until the cache fits in maxSize.
+
+    Parameters:
+        keep -- a key that is never evicted ( default None )
+
+    """
+
+    def evict( self, keep = None ):
+
+        entries = [ ( os.path.getmtime( self.path( key ) ), key ) for key in self.entries() ]
+        sizes   = dict( ( key, self._size( key ) ) for used, key in entries )
+        size    = sum( sizes.values() )
+
+        for used, key in sorted( entries ):
+
+            if size <= self.maxSize:
+
+                break
+
+            if key != keep:
+
+                shutil.rmtree( self.path( key ), ignore_errors = True )
+                size -= sizes[ key ]
+
+
+    """
+    Remove every entry.
+
+    """
+
+    def clear( self ):
+
+        for key in self.entries():
+
+            shutil.rmtree( self.path( key ), ignore_errors = True )
+
+
+    """
+    Return a generated mesh from the cache, generating and saving it when it is missing.
+
+    When the generator has an expand method, which derives iteration N + 1 from iteration N, the
+    highest cached iteration below the one requested is expanded instead, saving every iteration
+    in between. Expanding gives the same arrays as computing, so the mesh returned does not depend
+    on what is cached.
+
+    Parameters:
+        generator -- the generator, with a compute method ( object )
+        options   -- keyword arguments of the generator's compute method that do not change the mesh ( dict default None )
+        **params  -- the keyword arguments of the generator's compute method, including iterations
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    @instrument.measure( "cache" )
+    def compute( self, generator, options = None, **params ):
+
+        mesh = self.load( generator, params )
+
+        if mesh is not None:
+
+            return mesh
+
+        iterations = params[ "iterations" ]
+        level      = iterations
+
+        if hasattr( generator, "expand" ):
+
+            while level > 0 and mesh is None:
+
+                level -= 1
+                mesh   = self.load( generator, dict( params, iterations = level ) )
+
+        if mesh is None:
+
+            level = iterations
+            mesh  = generator.compute( **dict( params, **( options or { } ) ) )
+
+        while level < iterations:
+
+            mesh   = generator.expand( mesh, **dict( params, iterations = level ) )
+            level += 1
+
+            if level < iterations:
+
+                mesh = self.save( generator, dict( params, iterations = level ), mesh )
+
+        return self.save( generator, params, mesh )
@@ -0,0 +1,298 @@
+"""
+This module provides exporters that write vertex and face arrays straight to files, so geometry can be saved without Maya.
+
+The mesh exporters accept a mesh or any iterable of meshes, such as a generator of chunks, and write
+one chunk at a time with bulk array writes, so meshes bigger than memory can be written.
+"""
+
+
+import json
+import shutil
+import struct
+import tempfile
+
+import numpy
+
+from forms.util import instrument, polygon
+
+
+
+"""
+Format the rows of an array with one string formatting operation instead of one per row.
+
+Parameters:
+    line  -- the format of a row, ending with a new line ( string )
+    array -- the rows to format ( numpy.ndarray( ( N, k ) ) )
+
+Return:
+    text -- ( string )
+
+"""
+
+def _format( line, array ):
+
+    return ( line * len( array ) ) % tuple( array.ravel().tolist() )
+
+
+
+"""
+Write a polyline to a Wavefront OBJ file as its vertices and a single line element.
+
+Parameters:
+    path   -- the file to write ( string )
+    points -- the vertices of the polyline in order ( numpy.ndarray( ( N, 3 ) ) )
+
+"""
+
+@instrument.measure( "curve", "path" )
+def curve( path, points ):
+
+    points = numpy.asarray( points, dtype = numpy.float64 ).reshape( -1, 3 )
+
+    with open( path, "w" ) as f:
+
+        f.write( _format( "v %.6f %.6f %.6f\n", points ) )
+        f.write( "l " + " ".join( map( str, range( 1, len( points ) + 1 ) ) ) + "\n" )
+
+
+
+"""
+Return the chunks of a mesh argument.
+
+Parameters:
+    meshes -- a mesh or an iterable of meshes ( forms.util.polygon.Mesh || [,forms.util.polygon.Mesh] )
+
+Return:
+    meshes -- ( [,forms.util.polygon.Mesh] )
+
+"""
+
+def _chunks( meshes ):
+
+    if isinstance( meshes, polygon.Mesh ):
+
+        return [ meshes ]
+
+    return meshes
+
+
+
+"""
+Write meshes to a binary little endian PLY file.
+
+The vertices and faces of each chunk are spooled to temporary files, so the element counts are
+known when the header is written, then copied behind the header.
+
+Parameters:
+    path   -- the file to write ( string )
+    meshes -- a mesh or an iterable of meshes ( forms.util.polygon.Mesh || [,forms.util.polygon.Mesh] )
+
+"""
+
+@instrument.measure( "ply", "path" )
+def ply( path, meshes ):
+
+    vertexCount = 0
+    faceCount   = 0
+
+    with tempfile.TemporaryFile() as vertexFile:
+
+        with tempfile.TemporaryFile() as faceFile:
+
+            for mesh in _chunks( meshes ):
+
+                faces = numpy.empty( mesh.numFaces(), dtype = [ ( "count", "u1" ), ( "indices", "<i4", ( mesh.sides(), ) ) ] )
+                faces[ "count" ]   = mesh.sides()
+                faces[ "indices" ] = mesh.faces + vertexCount
+
+                mesh.vertices.astype( "<f4" ).tofile( vertexFile )
+                faces.tofile( faceFile )
+
+                vertexCount += mesh.numVertices()
+                faceCount   += mesh.numFaces()
+
+            header = [
+                "ply",
+                "format binary_little_endian 1.0",
+                "element vertex %i" % vertexCount,
+                "property float x",
+                "property float y",
+                "property float z",
+                "element face %i" % faceCount,
+                "property list uchar int vertex_indices",
+                "end_header"
+            ]
+
+            with open( path, "wb" ) as f:
+
+                f.write( ( "\n".join( header ) + "\n" ).encode( "ascii" ) )
+
+                for spool in [ vertexFile, faceFile ]:
+
+                    spool.seek( 0 )
+                    shutil.copyfileobj( spool, f )
+
+
+
+"""
+Write meshes to a binary STL file. Faces with more than three sides are triangulated as fans.
+
+Parameters:
+    path   -- the file to write ( string )
+    meshes -- a mesh or an iterable of meshes ( forms.util.polygon.Mesh || [,forms.util.polygon.Mesh] )
+
+"""
+
+@instrument.measure( "stl", "path" )
+def stl( path, meshes ):
+
+    triangleType = numpy.dtype( [ ( "normal", "<f4", ( 3, ) ), ( "vertices", "<f4", ( 3, 3 ) ), ( "attribute", "<u2" ) ] )
+    count        = 0
+
+    with open( path, "wb" ) as f:
+
+        f.write( b"forms".ljust( 80, b" " ) )
+        f.write( struct.pack( "<I", 0 ) )
+
+        for mesh in _chunks( meshes ):
+
+            vertices = mesh.vertices[ mesh.triangles() ]
+            normals  = numpy.cross( vertices[ :, 1 ] - vertices[ :, 0 ], vertices[ :, 2 ] - vertices[ :, 0 ] )
+            lengths  = numpy.sqrt( ( normals ** 2 ).sum( axis = 1 ) )
+
+            triangles = numpy.zeros( len( vertices ), dtype = triangleType )
+            triangles[ "normal" ]   = normals / numpy.where( lengths > 0, lengths, 1 )[ :, None ]
+            triangles[ "vertices" ] = vertices
+            triangles.tofile( f )
+
+            count += len( triangles )
+
+        # The triangle count is only known once every chunk is written
+
+        f.seek( 80 )
+        f.write( struct.pack( "<I", count ) )
+
+
+
+"""
+Write meshes to a Wavefront OBJ file. The vertices and faces of each chunk are formatted in bulk.
+
+Parameters:
+    path   -- the file to write ( string )
+    meshes -- a mesh or an iterable of meshes ( forms.util.polygon.Mesh || [,forms.util.polygon.Mesh] )
+
+"""
+
+@instrument.measure( "obj", "path" )
+def obj( path, meshes ):
+
+    count = 0
+
+    with open( path, "w" ) as f:
+
+        for mesh in _chunks( meshes ):
+
+            f.write( _format( "v %.6f %.6f %.6f\n", mesh.vertices ) )
+            f.write( _format( "f" + " %i" * mesh.sides() + "\n", mesh.faces.astype( numpy.int64 ) + ( count + 1 ) ) )
+
+            count += mesh.numVertices()
+
+
+
+"""
+Write a mesh or instances to a binary glTF file. Instances are written as one mesh and the
+translation and scale of every copy, using the EXT_mesh_gpu_instancing extension, so viewers
+draw the copies without the file holding their geometry.
+
+Parameters:
+    path     -- the file to write ( string )
+    geometry -- the mesh or the instances to write ( forms.util.polygon.Mesh || forms.util.polygon.Instances )
+
+"""
+
+@instrument.measure( "gltf", "path" )
+def gltf( path, geometry ):
+
+    if isinstance( geometry, polygon.Instances ):
+
+        mesh = geometry.mesh
+
+    else:
+
+        mesh = geometry
+
+    arrays    = [ ]
+    accessors = [ ]
+    views     = [ ]
+    offset    = 0
+
+    def accessor( array, componentType, accessorType, target = None ):
+
+        views.append( { "buffer" : 0, "byteOffset" : offset, "byteLength" : array.nbytes } )
+
+        if target is not None:
+
+            views[ -1 ][ "target" ] = target
+
+        accessors.append( { "bufferView" : len( views ) - 1, "componentType" : componentType, "count" : len( array ), "type" : accessorType } )
+        arrays.append( array )
+
+        return len( accessors ) - 1
+
+    # Every array is four byte aligned, as glTF requires
+
+    vertices = mesh.vertices.astype( "<f4" )
+    position = accessor( vertices, 5126, "VEC3", 34962 )
+    accessors[ position ][ "min" ] = vertices.min( axis = 0 ).tolist()
+    accessors[ position ][ "max" ] = vertices.max( axis = 0 ).tolist()
+    offset  += vertices.nbytes
+
+    triangles = mesh.triangles().astype( "<u4" ).reshape( -1 )
+    indices   = accessor( triangles, 5125, "SCALAR", 34963 )
+    offset   += triangles.nbytes
+
+    node = { "mesh" : 0 }
+    document = {
+        "asset" : { "version" : "2.0", "generator" : "forms" },
+        "scene" : 0,
+        "scenes" : [ { "nodes" : [ 0 ] } ],
+        "nodes" : [ node ],
+        "meshes" : [ { "primitives" : [ { "attributes" : { "POSITION" : position }, "indices" : indices } ] } ]
+    }
+
+    if isinstance( geometry, polygon.Instances ):
+
+        translations = geometry.translations.astype( "<f4" )
+        translation  = accessor( translations, 5126, "VEC3" )
+        offset      += translations.nbytes
+
+        scales = numpy.repeat( geometry.scales[ :, None ], 3, axis = 1 ).astype( "<f4" )
+        scale  = accessor( scales, 5126, "VEC3" )
+        offset += scales.nbytes
+
+        node[ "extensions" ] = { "EXT_mesh_gpu_instancing" : { "attributes" : { "TRANSLATION" : translation, "SCALE" : scale } } }
+        document[ "extensionsUsed" ]     = [ "EXT_mesh_gpu_instancing" ]
+        document[ "extensionsRequired" ] = [ "EXT_mesh_gpu_instancing" ]
+
+    document[ "accessors" ]   = accessors
+    document[ "bufferViews" ] = views
+    document[ "buffers" ]     = [ { "byteLength" : offset } ]
+
+    # A glb file is a header, a JSON chunk padded with spaces and a binary chunk padded with zeros
+
+    content = json.dumps( document, separators = ( ",", ":" ) ).encode( "utf-8" )
+    content = content + b" " * ( -len( content ) % 4 )
+    padding = -offset % 4
+
+    with open( path, "wb" ) as f:
+
+        f.write( struct.pack( "<III", 0x46546C67, 2, 12 + 8 + len( content ) + 8 + offset + padding ) )
+        f.write( struct.pack( "<II", len( content ), 0x4E4F534A ) )
+        f.write( content )
+        f.write( struct.pack( "<II", offset + padding, 0x004E4942 ) )
+
+        for array in arrays:
+
+            array.tofile( f )
+
+        f.write( b"\0" * padding )
@@ -0,0 +1,190 @@
+"""
+This module provides utilities for enumerating the copies of self similar fractals.
+"""
+
+
+import numpy
+
+from forms.util import instrument, polygon
+
+
+
+"""
+Return the translation and scale of every copy of the final iteration of a fractal in one step.
+
+Every iteration places a copy of the previous iteration at each offset, so the translation of a
+copy is the sum of one offset per iteration. The translations are built as a Kronecker style sum
+of the offsets of every iteration, which never generates the geometry of the iterations in between.
+
+Parameters:
+    offsets    -- the offsets of the copies of one iteration, relative to the size of a copy ( numpy.ndarray( ( K, 3 ) ) )
+    scaleRatio -- the ratio between the size of an iteration and the size of its copies ( float )
+    iterations -- the amount of iterations ( int )
+    size       -- the size of the smallest copies ( float )
+
+Return:
+    translations -- ( numpy.ndarray( ( K ** iterations, 3 ) ) )
+    scales       -- ( numpy.ndarray( ( K ** iterations, ) ) )
+
+"""
+
+@instrument.measure( "transforms", "iterations" )
+def transforms( offsets, scaleRatio, iterations, size ):
+
+    offsets = numpy.asarray( offsets ).reshape( -1, 3 )
+
+    # Integer offsets, ratio and size give exact integer translations
+
+    if offsets.dtype.kind not in "iu" or int( scaleRatio ) != scaleRatio or int( size ) != size:
+
+        offsets = offsets.astype( numpy.float64 )
+
+    else:
+
+        offsets    = offsets.astype( numpy.int64 )
+        scaleRatio = int( scaleRatio )
+        size       = int( size )
+
+    translations = numpy.zeros( ( 1, 3 ), dtype = offsets.dtype )
+
+    # Start with the biggest copies so the copies of each sub fractal are contiguous
+
+    for level in range( iterations - 1, -1, -1 ):
+
+        with instrument.span( "level", level = level ) as stage:
+
+            step         = offsets * ( size * pow( scaleRatio, level ) )
+            translations = ( translations[ :, None, : ] + step[ None, :, : ] ).reshape( -1, 3 )
+
+            stage.count( copies = len( translations ) )
+
+    scales = numpy.full( len( translations ), size, dtype = offsets.dtype )
+
+    return translations, scales
+
+
+
+"""
+Lazily enumerate the translation and scale of every copy of the final iteration, in chunks.
+
+The iterations are walked depth first and only the smallest iterations of each chunk are
+enumerated as arrays, so the memory used grows with the amount of iterations and the chunk size
+instead of with the amount of copies. The chunks are yielded in the same order as transforms.
+
+Parameters:
+    offsets    -- the offsets of the copies of one iteration, relative to the size of a copy ( numpy.ndarray( ( K, 3 ) ) )
+    scaleRatio -- the ratio between the size of an iteration and the size of its copies ( float )
+    iterations -- the amount of iterations ( int )
+    size       -- the size of the smallest copies ( float )
+    chunkSize  -- the most copies yielded at once ( default 65536 )
+
+Return:
+    transforms -- a generator of translation and scale chunks ( ( numpy.ndarray( ( n, 3 ) ), numpy.ndarray( ( n, ) ) ) )
+
+"""
+
+def iterTransforms( offsets, scaleRatio, iterations, size, chunkSize = 65536 ):
+
+    offsets = numpy.asarray( offsets ).reshape( -1, 3 )
+    depth   = 0
+
+    while depth < iterations and pow( len( offsets ), depth + 1 ) <= chunkSize:
+
+        depth += 1
+
+    translations, scales = transforms( offsets, scaleRatio, depth, size )
+
+    stack = [ ( numpy.zeros( 3, dtype = translations.dtype ), iterations ) ]
+
+    while stack:
+
+        translation, level = stack.pop()
+
+        if level == depth:
+
+            yield translation + translations, scales
+
+        else:
+
+            step = offsets * ( size * pow( scaleRatio, level - 1 ) )
+
+            for offset in step[ ::-1 ]:
+
+                stack.append( ( translation + offset, level - 1 ) )
+
+
+
+"""
+Lazily stamp out a mesh for every chunk of transforms, see iterTransforms. The meshes are not welded.
+
+Parameters:
+    mesh       -- the mesh to copy ( forms.util.polygon.Mesh )
+    transforms -- translation and scale chunks ( ( numpy.ndarray( ( n, 3 ) ), numpy.ndarray( ( n, ) ) ) )
+
+Return:
+    meshes -- a generator of meshes ( forms.util.polygon.Mesh )
+
+"""
+
+def iterMeshes( mesh, transforms ):
+
+    for translations, scales in transforms:
+
+        yield polygon.instance( mesh, translations, scales )
+
+
+
+"""
+Split the copies of the final iteration into blocks, each a whole sub fractal, so the blocks can
+be built independently. The copies of a block are transforms( offsets, scaleRatio, iterations, size )
+translated by the block's translation.
+
+Parameters:
+    offsets    -- the offsets of the copies of one iteration, relative to the size of a copy ( numpy.ndarray( ( K, 3 ) ) )
+    scaleRatio -- the ratio between the size of an iteration and the size of its copies ( float )
+    iterations -- the amount of iterations ( int )
+    size       -- the size of the smallest copies ( float )
+    count      -- the least amount of blocks, when there are enough copies ( int )
+
+Return:
+    translations -- the translation of every block ( numpy.ndarray( ( n, 3 ) ) )
+    iterations   -- the amount of iterations of every block ( int )
+
+"""
+
+def blocks( offsets, scaleRatio, iterations, size, count ):
+
+    offsets = numpy.asarray( offsets ).reshape( -1, 3 )
+    depth   = iterations
+
+    while depth > 0 and pow( len( offsets ), iterations - depth ) < count:
+
+        depth -= 1
+
+    return transforms( offsets, scaleRatio, iterations - depth, size * pow( scaleRatio, depth ) )[ 0 ], depth
+
+
+
+"""
+Build one block of a fractal, see blocks, by stamping out a mesh for every copy and welding them.
+
+Parameters:
+    mesh        -- the mesh to copy ( forms.util.polygon.Mesh )
+    offsets     -- the offsets of the copies of one iteration, relative to the size of a copy ( numpy.ndarray( ( K, 3 ) ) )
+    scaleRatio  -- the ratio between the size of an iteration and the size of its copies ( float )
+    iterations  -- the amount of iterations of the block ( int )
+    size        -- the size of the smallest copies ( float )
+    translation -- the translation of the block ( numpy.ndarray( ( 3, ) ) )
+    tolerance   -- the weld tolerance ( float )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+@instrument.measure( "block", "iterations" )
+def block( mesh, offsets, scaleRatio, iterations, size, translation, tolerance ):
+
+    translations, scales = transforms( offsets, scaleRatio, iterations, size )
+
+    return polygon.weld( polygon.instance( mesh, translations + translation, scales ), tolerance )
@@ -0,0 +1,253 @@
+"""
+This module provides exact arithmetic on golden integers, the numbers a + b * PHI with integer a and b.
+
+The vertices of the platonic solids and the scale ratios of their Sierpinski fractals are golden
+integers, so every vertex of a fractal can be placed exactly on the golden lattice and converted to
+floating point once. Coincident vertices have equal lattice coordinates, so they are welded exactly
+and convert to bit identical positions.
+
+A golden integer is stored as an int64 pair ( a, b ) along the last axis of an array.
+"""
+
+
+import numpy
+
+from forms.util import instrument, polygon
+from forms.util.math import PHI
+
+
+
+"""
+Return a golden integer.
+
+Parameters:
+    a -- the integer part ( int )
+    b -- the PHI part ( int default 0 )
+
+Return:
+    number -- ( numpy.ndarray( ( 2, ) ) )
+
+"""
+
+def number( a, b = 0 ):
+
+    return numpy.array( [ a, b ], dtype = numpy.int64 )
+
+
+
+"""
+Return integers as golden integers.
+
+Parameters:
+    values -- ( numpy.ndarray( ( ... ) ) )
+
+Return:
+    numbers -- ( numpy.ndarray( ( ..., 2 ) ) )
+
+"""
+
+def integers( values ):
+
+    values = numpy.asarray( values, dtype = numpy.int64 )
+
+    return numpy.stack( [ values, numpy.zeros_like( values ) ], axis = -1 )
+
+
+
+"""
+Multiply golden integers, using PHI * PHI = PHI + 1.
+
+Parameters:
+    x -- ( numpy.ndarray( ( ..., 2 ) ) )
+    y -- ( numpy.ndarray( ( ..., 2 ) ) )
+
+Return:
+    product -- ( numpy.ndarray( ( ..., 2 ) ) )
+
+"""
+
+def multiply( x, y ):
+
+    x = numpy.asarray( x, dtype = numpy.int64 )
+    y = numpy.asarray( y, dtype = numpy.int64 )
+
+    a, b = x[ ..., 0 ], x[ ..., 1 ]
+    c, d = y[ ..., 0 ], y[ ..., 1 ]
+
+    return numpy.stack( [ a * c + b * d, a * d + b * c + b * d ], axis = -1 )
+
+
+
+"""
+Raise a golden integer to a power.
+
+Parameters:
+    x        -- ( numpy.ndarray( ( 2, ) ) )
+    exponent -- a positive exponent ( int )
+
+Return:
+    power -- ( numpy.ndarray( ( 2, ) ) )
+
+"""
+
+def power( x, exponent ):
+
+    result = number( 1 )
+
+    for i in range( exponent ):
+
+        result = multiply( result, x )
+
+    return result
+
+
+
+"""
+Convert golden integers to floating point.
+
+Parameters:
+    x -- ( numpy.ndarray( ( ..., 2 ) ) )
+
+Return:
+    value -- ( numpy.ndarray( ( ... ) ) )
+
+"""
+
+def toFloat( x ):
+
+    x = numpy.asarray( x )
+
+    return x[ ..., 0 ] + x[ ..., 1 ] * PHI
+
+
+
+"""
+Return the translation of every copy of the final iteration of a fractal on the golden lattice,
+see forms.util.fractal.transforms. The translations are in units of the smallest copies.
+
+Parameters:
+    offsets    -- the offsets of the copies of one iteration ( numpy.ndarray( ( K, 3, 2 ) ) )
+    scaleRatio -- the ratio between the size of an iteration and the size of its copies ( numpy.ndarray( ( 2, ) ) )
+    iterations -- the amount of iterations ( int )
+
+Return:
+    translations -- ( numpy.ndarray( ( K ** iterations, 3, 2 ) ) )
+
+"""
+
+@instrument.measure( "transforms", "iterations" )
+def transforms( offsets, scaleRatio, iterations ):
+
+    offsets      = numpy.asarray( offsets, dtype = numpy.int64 ).reshape( -1, 3, 2 )
+    translations = numpy.zeros( ( 1, 3, 2 ), dtype = numpy.int64 )
+
+    for level in range( iterations - 1, -1, -1 ):
+
+        with instrument.span( "level", level = level ) as stage:
+
+            step         = multiply( offsets, power( scaleRatio, level ) )
+            translations = ( translations[ :, None ] + step[ None ] ).reshape( -1, 3, 2 )
+
+            stage.count( copies = len( translations ) )
+
+    return translations
+
+
+
+"""
+Stamp out copies of a mesh on the golden lattice and weld the vertices with equal coordinates.
+
+Parameters:
+    vertices     -- the vertices of the mesh ( numpy.ndarray( ( V, 3, 2 ) ) )
+    faces        -- the faces of the mesh ( numpy.ndarray( ( F, sides ) ) )
+    translations -- the translation of every copy ( numpy.ndarray( ( N, 3, 2 ) ) )
+
+Return:
+    vertices -- the welded vertices ( numpy.ndarray( ( U, 3, 2 ) ) )
+    faces    -- ( numpy.ndarray( ( N * F, sides ) ) )
+
+"""
+
+def instance( vertices, faces, translations ):
+
+    with instrument.span( "instance" ) as stage:
+
+        offsets  = numpy.arange( len( translations ), dtype = polygon.indexType( len( translations ) * len( vertices ) ) ) * len( vertices )
+        faces    = ( faces[ None ] + offsets[ :, None, None ] ).reshape( -1, faces.shape[ -1 ] )
+        vertices = ( translations[ :, None ] + vertices[ None ] ).reshape( -1, 3, 2 )
+
+        stage.count( vertices = len( vertices ), faces = len( faces ) )
+
+    with instrument.span( "weld" ) as stage:
+
+        index, inverse = polygon.unique( polygon.pack( vertices.reshape( -1, 6 ) ) )
+
+        stage.count( vertices = len( index ) )
+
+    return vertices[ index ], inverse[ faces ]
+
+
+
+"""
+Stamp out every iteration of a fractal on the golden lattice in one pass and weld them together, see
+instance. Every iteration is built from the translations of the one before it and placed in units
+of the smallest copies of the final iteration, so the iterations share one set of welded vertices.
+The final iteration equals instance( vertices, faces, transforms( ... ) ).
+
+Parameters:
+    vertices   -- the vertices of the mesh ( numpy.ndarray( ( V, 3, 2 ) ) )
+    faces      -- the faces of the mesh ( numpy.ndarray( ( F, sides ) ) )
+    offsets    -- the offsets of the copies of one iteration ( numpy.ndarray( ( K, 3, 2 ) ) )
+    scaleRatio -- the ratio between the size of an iteration and the size of its copies ( numpy.ndarray( ( 2, ) ) )
+    iterations -- the amount of iterations ( int )
+
+Return:
+    vertices -- the welded vertices of every iteration ( numpy.ndarray( ( U, 3, 2 ) ) )
+    faces    -- the faces of iterations 0 to iterations ( [,numpy.ndarray( ( K ** i * F, sides ) )] )
+
+"""
+
+@instrument.measure( "levels", "iterations" )
+def levels( vertices, faces, offsets, scaleRatio, iterations ):
+
+    offsets      = numpy.asarray( offsets, dtype = numpy.int64 ).reshape( -1, 3, 2 )
+    translations = numpy.zeros( ( 1, 3, 2 ), dtype = numpy.int64 )
+    copies       = [ ]
+
+    with instrument.span( "instance" ) as stage:
+
+        for level in range( iterations + 1 ):
+
+            if level:
+
+                # The copies of an iteration are the copies of the one before, a scale ratio further apart
+
+                translations = ( multiply( translations, scaleRatio )[ :, None ] + offsets[ None ] ).reshape( -1, 3, 2 )
+
+            scale = power( scaleRatio, iterations - level )
+
+            copies.append( ( multiply( translations, scale )[ :, None ] + multiply( vertices, scale )[ None ] ).reshape( -1, 3, 2 ) )
+
+        counts = numpy.array( [ len( levelVertices ) for levelVertices in copies ] )
+        starts = numpy.concatenate( [ [ 0 ], numpy.cumsum( counts ) ] )
+
+        stage.count( vertices = int( starts[ -1 ] ) )
+
+    with instrument.span( "weld" ) as stage:
+
+        copies         = numpy.concatenate( copies )
+        index, inverse = polygon.unique( polygon.pack( copies.reshape( -1, 6 ) ) )
+
+        stage.count( vertices = len( index ) )
+
+    # The copies of every iteration are numbered after those of the iterations before it
+
+    levelFaces = [ ]
+
+    for level in range( iterations + 1 ):
+
+        copyStarts = numpy.arange( counts[ level ] // len( vertices ), dtype = numpy.int64 ) * len( vertices ) + starts[ level ]
+
+        levelFaces.append( inverse[ ( faces[ None ] + copyStarts[ :, None, None ] ).reshape( -1, faces.shape[ -1 ] ) ] )
+
+    return copies[ index ], levelFaces
@@ -0,0 +1,270 @@
+"""
+This module provides a scene graph of the iterations of a fractal, where every iteration refers to
+the one below it instead of copying its geometry.
+
+Node -- An iteration, made of transformed references to the iteration below it
+"""
+
+
+import numpy
+
+from forms.util import instrument, polygon
+
+
+
+class Node():
+
+
+    """
+    Node class. An iteration of a fractal, made of copies of the child node scaled by scale and moved
+    by each translation. The child is shared by every copy, so a fractal of N iterations of K copies
+    stores N nodes of K translations instead of K ** N copies of the mesh.
+
+    The nodes of the Sierpinski fractals are the same size as the mesh at the bottom of the graph, so
+    the mesh can stand in for a node when the graph is flattened to fewer iterations.
+
+    Parameters:
+        child        -- the iteration below, or the mesh of the first iteration ( forms.util.graph.Node || forms.util.polygon.Mesh )
+        translations -- the translation of every copy of the child ( numpy.ndarray( ( K, 3 ) ) )
+        scale        -- the uniform scale of the copies of the child ( float )
+
+    """
+
+    def __init__( self, child, translations, scale ):
+
+        self.child        = child
+        self.translations = numpy.ascontiguousarray( translations, dtype = numpy.float64 ).reshape( -1, 3 )
+        self.scale        = float(scale)
+
+        # The bounds of every node are known from the bounds of its child
+
+        lower, upper = child.bounds()
+
+        self._bounds = numpy.array( [
+            ( self.translations + self.scale * lower ).min( axis = 0 ),
+            ( self.translations + self.scale * upper ).max( axis = 0 )
+        ] )
+
+
+    def __repr__( self ):
+
+        return "Node(%i iterations, %i copies of %r)" % ( self.depth(), self.count(), self.mesh() )
+
+
+    """
+    Return the amount of iterations below and including this node.
+
+    Return:
+        depth -- ( int )
+
+    """
+
+    def depth( self ):
+
+        if isinstance( self.child, Node ):
+
+            return self.child.depth() + 1
+
+        return 1
+
+
+    """
+    Return the nodes from this node down to the first iteration.
+
+    Return:
+        nodes -- ( [,forms.util.graph.Node] )
+
+    """
+
+    def nodes( self ):
+
+        if isinstance( self.child, Node ):
+
+            return [ self ] + self.child.nodes()
+
+        return [ self ]
+
+
+    """
+    Return the mesh at the bottom of the graph.
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def mesh( self ):
+
+        return self.nodes()[ -1 ].child
+
+
+    """
+    Return the amount of copies of the mesh in the flattened graph.
+
+    Return:
+        count -- ( int )
+
+    """
+
+    def count( self ):
+
+        if isinstance( self.child, Node ):
+
+            return len( self.translations ) * self.child.count()
+
+        return len( self.translations )
+
+
+    def numVertices( self ):
+
+        return self.count() * self.mesh().numVertices()
+
+
+    def numFaces( self ):
+
+        return self.count() * self.mesh().numFaces()
+
+
+    """
+    Return the axis aligned bounding box of the node.
+
+    Return:
+        bounds -- the minimum and maximum corners ( numpy.ndarray( ( 2, 3 ) ) )
+
+    """
+
+    def bounds( self ):
+
+        return self._bounds
+
+
+    """
+    Return the bytes used by the translations of the nodes and the mesh.
+
+    Return:
+        size -- ( int )
+
+    """
+
+    def nbytes( self ):
+
+        mesh = self.mesh()
+
+        return sum( node.translations.nbytes for node in self.nodes() ) + mesh.vertices.nbytes + mesh.faces.nbytes
+
+
+    """
+    Return the translation and scale of every copy of the mesh, flattening the graph down to a depth
+    and optionally only inside a region. Copies whose node lies outside the region are skipped as soon
+    as their node does, so the cost follows the amount of copies inside the region.
+
+    Parameters:
+        depth -- the amount of iterations to flatten, every iteration by default ( int default None )
+        lower -- the minimum corner of the region ( numpy.ndarray( ( 3, ) ) default None )
+        upper -- the maximum corner of the region ( numpy.ndarray( ( 3, ) ) default None )
+
+    Return:
+        translations -- ( numpy.ndarray( ( n, 3 ) ) )
+        scales       -- ( numpy.ndarray( ( n, ) ) )
+
+    """
+
+    @instrument.measure( "transforms", "depth" )
+    def transforms( self, depth = None, lower = None, upper = None ):
+
+        nodes = self.nodes()
+
+        if depth is not None:
+
+            nodes = nodes[ : max( depth, 0 ) ]
+
+        lower = numpy.full( 3, -numpy.inf ) if lower is None else numpy.asarray( lower, dtype = numpy.float64 )
+        upper = numpy.full( 3, numpy.inf ) if upper is None else numpy.asarray( upper, dtype = numpy.float64 )
+
+        translations = numpy.zeros( ( 1, 3 ) )
+        scale        = 1.0
+        bounds       = self.bounds()
+
+        for level, node in enumerate( nodes ):
+
+            with instrument.span( "level", level = len( nodes ) - level - 1 ) as stage:
+
+                # Skip the copies of this node that miss the region
+
+                inside       = ( ( translations + scale * bounds[ 0 ] <= upper ) & ( translations + scale * bounds[ 1 ] >= lower ) ).all( axis = 1 )
+                translations = translations[ inside ]
+
+                translations = ( translations[ :, None, : ] + scale * node.translations[ None, :, : ] ).reshape( -1, 3 )
+                scale       *= node.scale
+                bounds       = node.child.bounds()
+
+                stage.count( copies = len( translations ) )
+
+        inside = ( ( translations + scale * bounds[ 0 ] <= upper ) & ( translations + scale * bounds[ 1 ] >= lower ) ).all( axis = 1 )
+
+        return translations[ inside ], numpy.full( inside.sum(), scale )
+
+
+    """
+    Return the mesh and the transform of every copy of it, see transforms.
+
+    Parameters:
+        depth -- the amount of iterations to flatten, every iteration by default ( int default None )
+        lower -- the minimum corner of the region ( numpy.ndarray( ( 3, ) ) default None )
+        upper -- the maximum corner of the region ( numpy.ndarray( ( 3, ) ) default None )
+
+    Return:
+        instances -- ( forms.util.polygon.Instances )
+
+    """
+
+    def instances( self, depth = None, lower = None, upper = None ):
+
+        translations, scales = self.transforms( depth, lower, upper )
+
+        return polygon.Instances( self.mesh(), translations, scales )
+
+
+    """
+    Flatten the graph into one mesh, see transforms. The copies are not welded.
+
+    Parameters:
+        depth -- the amount of iterations to flatten, every iteration by default ( int default None )
+        lower -- the minimum corner of the region ( numpy.ndarray( ( 3, ) ) default None )
+        upper -- the maximum corner of the region ( numpy.ndarray( ( 3, ) ) default None )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def flatten( self, depth = None, lower = None, upper = None ):
+
+        return self.instances( depth, lower, upper ).flatten()
+
+
+
+"""
+Build the graph of a self similar fractal, where every iteration is made of copies of the one below
+it at the same offsets and scale.
+
+Parameters:
+    mesh         -- the mesh of the first iteration ( forms.util.polygon.Mesh )
+    translations -- the translation of every copy of an iteration ( numpy.ndarray( ( K, 3 ) ) )
+    scale        -- the uniform scale of the copies ( float )
+    iterations   -- the amount of iterations ( int )
+
+Return:
+    node -- the node of the final iteration, or the mesh when there are no iterations ( forms.util.graph.Node || forms.util.polygon.Mesh )
+
+"""
+
+def selfSimilar( mesh, translations, scale, iterations ):
+
+    node = mesh
+
+    for i in range( iterations ):
+
+        node = Node( node, translations, scale )
+
+    return node
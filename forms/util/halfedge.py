@@ -0,0 +1,602 @@
+"""
+This module provides an array based half edge mesh, so the mesh utilities can extrude, inset and
+delete faces of large meshes in bulk without Maya.
+
+HalfEdgeMesh -- A polygon mesh with any amount of sides per face stored as half edge arrays
+"""
+
+
+import numpy
+
+from forms.util import instrument, polygon
+
+
+
+"""
+Return a mask of the selected faces.
+
+Parameters:
+    faces    -- face indices, a face mask or None for every face ( [,int] || numpy.ndarray || None )
+    numFaces -- the amount of faces ( int )
+
+Return:
+    selected -- ( numpy.ndarray( ( F, ), bool ) )
+
+"""
+
+def _select( faces, numFaces ):
+
+    if faces is None:
+
+        return numpy.ones( numFaces, dtype = bool )
+
+    faces = numpy.asarray( faces )
+
+    if faces.dtype == bool:
+
+        return faces.reshape( numFaces )
+
+    selected = numpy.zeros( numFaces, dtype = bool )
+    selected[ faces.reshape( -1 ).astype( numpy.int64 ) ] = True
+
+    return selected
+
+
+
+"""
+Build a half edge mesh from its faces, removing the vertices no face uses.
+
+Parameters:
+    positions -- the vertex positions ( numpy.ndarray( ( V, 3 ) ) )
+    counts    -- the amount of vertices of every face ( numpy.ndarray( ( F, ) ) )
+    connects  -- the vertex indices of every face ( numpy.ndarray( ( sum( counts ), ) ) )
+
+Return:
+    mesh -- ( forms.util.halfedge.HalfEdgeMesh )
+
+"""
+
+def _compact( positions, counts, connects ):
+
+    used = numpy.zeros( len( positions ), dtype = bool )
+    used[ connects ] = True
+
+    if used.all():
+
+        return HalfEdgeMesh( positions, counts, connects )
+
+    remap = numpy.cumsum( used, dtype = numpy.int64 ) - 1
+
+    return HalfEdgeMesh( positions[ used ], counts, remap[ connects ] )
+
+
+
+class HalfEdgeMesh():
+
+
+    """
+    HalfEdgeMesh class. Every face is a loop of half edges, one per side, and the half edges of a face
+    are stored together in winding order, so the half edges of face f start at start[ f ].
+
+        vertex -- the vertex each half edge starts at
+        face   -- the face each half edge belongs to
+        next   -- the next half edge around its face
+        twin   -- the opposite half edge of the neighbouring face, -1 on a boundary
+
+    The indices are int32 and the positions float32. The operations return a new mesh instead of
+    changing this one. Edges shared by more than two faces get the twin of only one of them.
+
+    Parameters:
+        positions -- the vertex positions ( numpy.ndarray( ( V, 3 ) ) )
+        counts    -- the amount of vertices of every face ( numpy.ndarray( ( F, ) ) )
+        connects  -- the vertex indices of every face, one face after another ( numpy.ndarray( ( sum( counts ), ) ) )
+
+    """
+
+    def __init__( self, positions, counts, connects ):
+
+        self.positions = numpy.ascontiguousarray( numpy.asarray( positions, dtype = numpy.float32 ).reshape( -1, 3 ) )
+        self.counts    = numpy.ascontiguousarray( counts, dtype = numpy.int32 ).reshape( -1 )
+        self.vertex    = numpy.ascontiguousarray( connects, dtype = numpy.int32 ).reshape( -1 )
+
+        self.start = numpy.zeros( len( self.counts ), dtype = numpy.int32 )
+        numpy.cumsum( self.counts[ :-1 ], out = self.start[ 1: ] )
+
+        self.face = numpy.repeat( numpy.arange( len( self.counts ), dtype = numpy.int32 ), self.counts )
+
+        # The last half edge of every face wraps around to the first
+
+        self.next = numpy.arange( 1, len( self.vertex ) + 1, dtype = numpy.int32 )
+        self.next[ self.start + self.counts - 1 ] = self.start
+
+        self.twin = self._twins()
+
+
+    def __repr__( self ):
+
+        return "HalfEdgeMesh(%i vertices, %i faces, %i half edges)" % ( self.numVertices(), self.numFaces(), self.numHalfEdges() )
+
+
+    def numVertices( self ):
+
+        return len( self.positions )
+
+
+    def numFaces( self ):
+
+        return len( self.counts )
+
+
+    def numHalfEdges( self ):
+
+        return len( self.vertex )
+
+
+    """
+    Match every half edge with the half edge running the other way along the same edge.
+
+    Return:
+        twin -- ( numpy.ndarray( ( H, ), int32 ) )
+
+    """
+
+    def _twins( self ):
+
+        count  = numpy.int64( max( self.numVertices(), 1 ) )
+        origin = self.vertex.astype( numpy.int64 )
+        target = self.destination().astype( numpy.int64 )
+
+        keys  = origin * count + target
+        order = numpy.argsort( keys, kind = "stable" )
+        keys  = keys[ order ]
+
+        opposite = target * count + origin
+        found    = numpy.minimum( numpy.searchsorted( keys, opposite ), max( len( keys ) - 1, 0 ) )
+        twin     = numpy.full( self.numHalfEdges(), -1, dtype = numpy.int32 )
+
+        if len( keys ):
+
+            matched         = keys[ found ] == opposite
+            twin[ matched ] = order[ found[ matched ] ]
+
+        return twin
+
+
+    """
+    Return the vertex every half edge ends at.
+
+    Return:
+        destination -- ( numpy.ndarray( ( H, ), int32 ) )
+
+    """
+
+    def destination( self ):
+
+        return self.vertex[ self.next ]
+
+
+    """
+    Return the amount of vertices of every face, as expected by MFnMesh.create.
+
+    Return:
+        counts -- ( numpy.ndarray( ( F, ), int32 ) )
+
+    """
+
+    def polygonCounts( self ):
+
+        return self.counts
+
+
+    """
+    Return the flattened face vertex indices, as expected by MFnMesh.create.
+
+    Return:
+        connects -- ( numpy.ndarray( ( H, ), int32 ) )
+
+    """
+
+    def polygonConnects( self ):
+
+        return self.vertex
+
+
+    """
+    Return the half edges without a twin, which lie on the border of the mesh.
+
+    Return:
+        halfEdges -- ( numpy.ndarray( ( B, ) ) )
+
+    """
+
+    def boundary( self ):
+
+        return numpy.nonzero( self.twin < 0 )[ 0 ]
+
+
+    """
+    Return every edge once, as the vertices it joins.
+
+    Return:
+        edges -- ( numpy.ndarray( ( E, 2 ), int32 ) )
+
+    """
+
+    def edges( self ):
+
+        # Every edge is kept from its half edge with the lower index, boundary half edges always
+
+        keep = ( self.twin < 0 ) | ( self.twin > numpy.arange( self.numHalfEdges() ) )
+
+        return numpy.stack( [ self.vertex[ keep ], self.destination()[ keep ] ], axis = 1 )
+
+
+    """
+    Return the face across every half edge.
+
+    Return:
+        faces -- the neighbouring face, -1 on a boundary ( numpy.ndarray( ( H, ), int32 ) )
+
+    """
+
+    def adjacentFaces( self ):
+
+        return numpy.where( self.twin < 0, -1, self.face[ self.twin ] ).astype( numpy.int32 )
+
+
+    """
+    Return the faces around every vertex, grouped by vertex.
+
+    Return:
+        offsets -- the faces of vertex v are faces[ offsets[ v ] : offsets[ v + 1 ] ] ( numpy.ndarray( ( V + 1, ) ) )
+        faces   -- ( numpy.ndarray( ( H, ), int32 ) )
+
+    """
+
+    def vertexFaces( self ):
+
+        order   = numpy.argsort( self.vertex, kind = "stable" )
+        offsets = numpy.zeros( self.numVertices() + 1, dtype = numpy.int64 )
+
+        numpy.cumsum( numpy.bincount( self.vertex, minlength = self.numVertices() ), out = offsets[ 1: ] )
+
+        return offsets, self.face[ order ]
+
+
+    """
+    Return the vertices joined to every vertex by an edge, grouped by vertex.
+
+    Return:
+        offsets    -- the neighbours of vertex v are neighbours[ offsets[ v ] : offsets[ v + 1 ] ] ( numpy.ndarray( ( V + 1, ) ) )
+        neighbours -- ( numpy.ndarray( ( 2 * E, ), int32 ) )
+
+    """
+
+    def vertexNeighbours( self ):
+
+        edges   = self.edges()
+        origin  = numpy.concatenate( [ edges[ :, 0 ], edges[ :, 1 ] ] )
+        target  = numpy.concatenate( [ edges[ :, 1 ], edges[ :, 0 ] ] )
+        order   = numpy.argsort( origin, kind = "stable" )
+        offsets = numpy.zeros( self.numVertices() + 1, dtype = numpy.int64 )
+
+        numpy.cumsum( numpy.bincount( origin, minlength = self.numVertices() ), out = offsets[ 1: ] )
+
+        return offsets, target[ order ]
+
+
+    """
+    Grow a selection of faces by the faces sharing an edge with it.
+
+    Parameters:
+        faces -- face indices, a face mask or None for every face ( [,int] || numpy.ndarray || None )
+
+    Return:
+        selected -- ( numpy.ndarray( ( F, ), bool ) )
+
+    """
+
+    def grow( self, faces ):
+
+        selected  = _select( faces, self.numFaces() )
+        neighbour = self.adjacentFaces()[ selected[ self.face ] ]
+
+        grown = selected.copy()
+        grown[ neighbour[ neighbour >= 0 ] ] = True
+
+        return grown
+
+
+    """
+    Return the centroid of every face, the mean of its vertices.
+
+    Return:
+        centroids -- ( numpy.ndarray( ( F, 3 ) ) )
+
+    """
+
+    def centroids( self ):
+
+        if not self.numFaces():
+
+            return numpy.zeros( ( 0, 3 ) )
+
+        sums = numpy.add.reduceat( self.positions[ self.vertex ].astype( numpy.float64 ), self.start, axis = 0 )
+
+        return sums / self.counts[ :, None ]
+
+
+    """
+    Return the unit normal of every face, using Newell's method so non planar faces get an average normal.
+
+    Return:
+        normals -- ( numpy.ndarray( ( F, 3 ) ) )
+
+    """
+
+    def normals( self ):
+
+        if not self.numFaces():
+
+            return numpy.zeros( ( 0, 3 ) )
+
+        positions = self.positions.astype( numpy.float64 )
+        normals   = numpy.add.reduceat( numpy.cross( positions[ self.vertex ], positions[ self.destination() ] ), self.start, axis = 0 )
+        lengths   = numpy.sqrt( ( normals ** 2 ).sum( axis = 1 ) )
+
+        return normals / numpy.where( lengths > 0, lengths, 1 )[ :, None ]
+
+
+    """
+    Extrude faces as polyExtrudeFacet does. The faces are moved to new vertices and joined to the
+    edges they leave behind by a quad per edge.
+
+    When the faces are kept together, the vertices shared by the faces are moved once, only the border
+    of the selection gets side quads, the faces are scaled about the centre of their bounding box and
+    moved along the average normal of the faces around each vertex. Otherwise every face is extruded
+    on its own, scaled about its centroid and moved along its normal.
+
+    Parameters:
+        faces    -- face indices, a face mask or None for every face ( [,int] || numpy.ndarray || None )
+        offset   -- the distance to move the faces along their normals ( float default 0 )
+        scale    -- the scale of the faces ( float default 1 )
+        together -- keep the faces together, as keepFacesTogether ( bool default True )
+
+    Return:
+        mesh -- the extruded faces keep their indices, the side quads follow ( forms.util.halfedge.HalfEdgeMesh )
+
+    """
+
+    @instrument.measure( "extrude", "offset", "scale", "together" )
+    def extrude( self, faces = None, offset = 0, scale = 1, together = True ):
+
+        selected  = _select( faces, self.numFaces() )
+        halfEdges = numpy.nonzero( selected[ self.face ] )[ 0 ]
+        positions = self.positions.astype( numpy.float64 )
+        connects  = self.vertex.copy()
+
+        if not len( halfEdges ):
+
+            return self
+
+        if together:
+
+            # One new vertex per vertex of the selection, moved along the normals of its selected faces
+
+            moved, inverse = numpy.unique( self.vertex[ halfEdges ], return_inverse = True )
+
+            normals = numpy.zeros( ( len( moved ), 3 ) )
+            numpy.add.at( normals, inverse, self.normals()[ self.face[ halfEdges ] ] )
+            normals /= numpy.maximum( numpy.sqrt( ( normals ** 2 ).sum( axis = 1 ) ), 1e-12 )[ :, None ]
+
+            corners = positions[ moved ]
+            pivot   = ( corners.min( axis = 0 ) + corners.max( axis = 0 ) ) / 2
+            added   = pivot + ( corners - pivot ) * scale + normals * offset
+
+            remap = numpy.full( self.numVertices(), -1, dtype = numpy.int64 )
+            remap[ moved ] = self.numVertices() + numpy.arange( len( moved ) )
+
+            connects[ halfEdges ] = remap[ self.vertex[ halfEdges ] ]
+
+            # Side quads along the half edges whose twin is not selected
+
+            twin  = self.twin[ halfEdges ]
+            sides = halfEdges[ ( twin < 0 ) | ~selected[ self.face[ numpy.maximum( twin, 0 ) ] ] ]
+            lower = self.vertex[ sides ], self.destination()[ sides ]
+            upper = remap[ lower[ 0 ] ], remap[ lower[ 1 ] ]
+
+        else:
+
+            # One new vertex per corner of every selected face
+
+            face    = self.face[ halfEdges ]
+            centres = self.centroids()[ face ]
+            added   = centres + ( positions[ self.vertex[ halfEdges ] ] - centres ) * scale + self.normals()[ face ] * offset
+
+            remap = numpy.full( self.numHalfEdges(), -1, dtype = numpy.int64 )
+            remap[ halfEdges ] = self.numVertices() + numpy.arange( len( halfEdges ) )
+
+            connects[ halfEdges ] = remap[ halfEdges ]
+
+            sides = halfEdges
+            lower = self.vertex[ sides ], self.destination()[ sides ]
+            upper = remap[ sides ], remap[ self.next[ sides ] ]
+
+        quads = numpy.stack( [ lower[ 0 ], lower[ 1 ], upper[ 1 ], upper[ 0 ] ], axis = 1 )
+
+        # Vertices left inside a closed selection are no longer used
+
+        return _compact(
+            numpy.concatenate( [ positions, added ] ),
+            numpy.concatenate( [ self.counts, numpy.full( len( quads ), 4, dtype = numpy.int32 ) ] ),
+            numpy.concatenate( [ connects, quads.reshape( -1 ) ] )
+        )
+
+
+    """
+    Inset faces, extruding every face on its own without moving it, so it is surrounded by a frame of quads.
+
+    Parameters:
+        faces -- face indices, a face mask or None for every face ( [,int] || numpy.ndarray || None )
+        scale -- the scale of the inset faces about their centroids ( float default 0.9 )
+
+    Return:
+        mesh -- ( forms.util.halfedge.HalfEdgeMesh )
+
+    """
+
+    def inset( self, faces = None, scale = 0.9 ):
+
+        return self.extrude( faces, scale = scale, together = False )
+
+
+    """
+    Delete faces and the vertices no other face uses.
+
+    Parameters:
+        faces -- face indices or a face mask ( [,int] || numpy.ndarray )
+
+    Return:
+        mesh -- ( forms.util.halfedge.HalfEdgeMesh )
+
+    """
+
+    @instrument.measure( "deleteFaces" )
+    def deleteFaces( self, faces ):
+
+        keep = ~_select( faces, self.numFaces() )
+
+        return _compact( self.positions, self.counts[ keep ], self.vertex[ keep[ self.face ] ] )
+
+
+    """
+    Split the mesh into array meshes, one per amount of sides, see forms.util.polygon.Mesh.
+    Every mesh holds all the vertices.
+
+    Return:
+        meshes -- ( [,forms.util.polygon.Mesh] )
+
+    """
+
+    def meshes( self ):
+
+        meshes = [ ]
+
+        for sides in numpy.unique( self.counts ):
+
+            selected = self.counts[ self.face ] == sides
+            meshes.append( polygon.Mesh( self.positions, self.vertex[ selected ].reshape( -1, sides ) ) )
+
+        return meshes
+
+
+    """
+    Return the mesh as an array mesh, see forms.util.polygon.Mesh. Raises a ValueError when the faces
+    do not all have the same amount of sides.
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def toMesh( self ):
+
+        meshes = self.meshes()
+
+        if len( meshes ) != 1:
+
+            raise ValueError( "A Mesh needs faces with the same amount of sides, use meshes() instead" )
+
+        return meshes[ 0 ]
+
+
+
+"""
+Build a half edge mesh from an array mesh.
+
+Parameters:
+    mesh -- ( forms.util.polygon.Mesh )
+
+Return:
+    mesh -- ( forms.util.halfedge.HalfEdgeMesh )
+
+"""
+
+@instrument.measure( "fromMesh" )
+def fromMesh( mesh ):
+
+    return HalfEdgeMesh( mesh.vertices, mesh.polygonCounts(), mesh.polygonConnects() )
+
+
+
+"""
+Turn a mesh into a wireframe, as forms.util.mesh.polyWire does in Maya, without building the
+intermediate meshes. Every face is inset by gridSize about its centroid and the inset face deleted,
+leaving a frame of quads per face, then the frames are extruded together, joining every hole to
+the extruded frames by a quad per edge.
+
+Parameters:
+    mesh        -- the mesh to convert ( forms.util.polygon.Mesh || forms.util.halfedge.HalfEdgeMesh )
+    gridSize    -- the scale of the holes relative to their faces, so the frames get thinner as it grows ( default 0.9 )
+    depth       -- the depth of the extrusion ( default 0.5 )
+    extrudeMode -- 0 to scale the frames by depth about the centre of the mesh, 1 to move the frames depth along their normals ( default 0 )
+
+Return:
+    mesh -- the extruded frames, followed by the quads joining them to the holes and open borders ( forms.util.polygon.Mesh )
+
+"""
+
+@instrument.measure( "polyWire", "gridSize", "depth", "extrudeMode" )
+def polyWire( mesh, gridSize = 0.9, depth = 0.5, extrudeMode = 0 ):
+
+    if not isinstance( mesh, HalfEdgeMesh ):
+
+        mesh = fromMesh( mesh )
+
+    count     = mesh.numVertices()
+    halfEdges = numpy.arange( mesh.numHalfEdges(), dtype = numpy.int64 )
+    positions = mesh.positions.astype( numpy.float64 )
+
+    with instrument.span( "inset" ):
+
+        # A hole vertex per half edge, count + h for half edge h, and a frame quad per half edge
+
+        centres   = mesh.centroids()[ mesh.face ]
+        holes     = centres + ( positions[ mesh.vertex ] - centres ) * gridSize
+        positions = numpy.concatenate( [ positions, holes ] )
+
+        frames = numpy.stack( [ mesh.vertex, mesh.destination(), count + mesh.next, count + halfEdges ], axis = 1 )
+
+    with instrument.span( "extrude" ):
+
+        if extrudeMode == 0:
+
+            pivot = ( positions.min( axis = 0 ) + positions.max( axis = 0 ) ) / 2
+            moved = pivot + ( positions - pivot ) * depth
+
+        elif extrudeMode == 1:
+
+            # Move every vertex along the average normal of the frames around it
+
+            corners = positions[ frames ]
+            normals = numpy.cross( corners[ :, 2 ] - corners[ :, 0 ], corners[ :, 3 ] - corners[ :, 1 ] )
+            normals = numpy.stack( [ numpy.bincount( frames.reshape( -1 ), numpy.repeat( normals[ :, i ], 4 ), len( positions ) ) for i in range( 3 ) ], axis = 1 )
+            moved   = positions + normals / numpy.maximum( numpy.sqrt( ( normals ** 2 ).sum( axis = 1 ) ), 1e-12 )[ :, None ] * depth
+
+        else:
+
+            raise ValueError( "Unknown extrudeMode %r, use 0 to scale or 1 to move along normals" % extrudeMode )
+
+        # The hole edges of the frames are always open, their outer edges only on the border of the mesh
+
+        sides      = numpy.zeros( ( len( frames ), 4 ), dtype = bool )
+        sides[ :, 0 ] = mesh.twin < 0
+        sides[ :, 2 ] = True
+
+        lower = frames[ sides ], numpy.roll( frames, -1, axis = 1 )[ sides ]
+        walls = numpy.stack( [ lower[ 0 ], lower[ 1 ], lower[ 1 ] + len( positions ), lower[ 0 ] + len( positions ) ], axis = 1 )
+        faces = numpy.concatenate( [ frames + len( positions ), walls ] )
+
+    mesh = polygon.Mesh( numpy.concatenate( [ positions, moved ] ), faces )
+
+    return polygon.compact( mesh )
@@ -0,0 +1,327 @@
+"""
+This module provides iterated function systems, fractals made of copies of a mesh placed by a set of
+affine maps applied again at every iteration. The Sierpinski fractals are systems of uniformly
+scaled maps, see the system method of every Sierpinski class.
+
+System -- A set of affine maps, expanded into copies of a mesh or sampled with the chaos game
+"""
+
+
+import numpy
+
+from forms.util import graph, instrument, polygon
+
+
+
+class System():
+
+
+    """
+    System class. A fractal made of copies of itself, the copy k being the fractal mapped by
+    x -> matrices[ k ] x + translations[ k ]. Iteration N of a mesh is the mesh mapped by every
+    composition of N maps.
+
+    Parameters:
+        matrices     -- the linear part of every map ( numpy.ndarray( ( K, 3, 3 ) ) )
+        translations -- the translation of every map ( numpy.ndarray( ( K, 3 ) ) )
+
+    """
+
+    def __init__( self, matrices, translations ):
+
+        self.translations = numpy.ascontiguousarray( translations, dtype = numpy.float64 ).reshape( -1, 3 )
+        self.matrices     = numpy.ascontiguousarray( numpy.broadcast_to( matrices, ( len( self.translations ), 3, 3 ) ), dtype = numpy.float64 )
+
+
+    def __repr__( self ):
+
+        return "System(%i maps, %s)" % ( self.count(), "uniform scale %g" % self.scale() if self.scale() is not None else "affine" )
+
+
+    def count( self ):
+
+        return len( self.translations )
+
+
+    """
+    Return the scale of the maps when every map scales uniformly by the same amount without rotating,
+    as in the Sierpinski fractals, so the copies are described by a translation and a scale.
+
+    Return:
+        scale -- the scale, or None ( float || None )
+
+    """
+
+    def scale( self ):
+
+        scale = self.matrices[ 0, 0, 0 ]
+
+        if numpy.allclose( self.matrices, scale * numpy.identity( 3 ), rtol = 0, atol = 1e-12 ):
+
+            return float(scale)
+
+        return None
+
+
+    """
+    Return every composition of a number of maps, the biggest copies first so the copies of each sub
+    fractal are contiguous, as in forms.util.fractal.transforms. Every iteration composes all the
+    maps so far with every map in one broadcast matrix product.
+
+    Parameters:
+        iterations -- the amount of iterations ( int )
+
+    Return:
+        matrices     -- ( numpy.ndarray( ( K ** iterations, 3, 3 ) ) )
+        translations -- ( numpy.ndarray( ( K ** iterations, 3 ) ) )
+
+    """
+
+    @instrument.measure( "compose", "iterations" )
+    def compose( self, iterations ):
+
+        matrices     = numpy.identity( 3 )[ None ]
+        translations = numpy.zeros( ( 1, 3 ) )
+
+        for level in range( iterations ):
+
+            with instrument.span( "level", level = level ) as stage:
+
+                # A ( M x + t ) + b is A M x + ( A t + b )
+
+                translations = ( translations[ :, None, : ] + numpy.einsum( "nij,kj->nki", matrices, self.translations ) ).reshape( -1, 3 )
+                matrices     = numpy.matmul( matrices[ :, None ], self.matrices[ None ] ).reshape( -1, 3, 3 )
+
+                stage.count( copies = len( translations ) )
+
+        return matrices, translations
+
+
+    """
+    Return the translation and scale of every copy of iteration N of a uniformly scaled system, see
+    scale, without composing matrices.
+
+    Parameters:
+        iterations -- the amount of iterations ( int )
+
+    Return:
+        translations -- ( numpy.ndarray( ( K ** iterations, 3 ) ) )
+        scales       -- ( numpy.ndarray( ( K ** iterations, ) ) )
+
+    """
+
+    @instrument.measure( "transforms", "iterations" )
+    def transforms( self, iterations ):
+
+        scale = self.scale()
+
+        if scale is None:
+
+            raise ValueError( "The maps do not share a uniform scale, use compose" )
+
+        translations = numpy.zeros( ( 1, 3 ) )
+
+        for level in range( iterations ):
+
+            translations = ( translations[ :, None, : ] + pow( scale, level ) * self.translations[ None, :, : ] ).reshape( -1, 3 )
+
+        return translations, numpy.full( len( translations ), pow( scale, iterations ) )
+
+
+    """
+    Return iteration N of a mesh as the mesh and the transform of every copy of it, see transforms.
+
+    Parameters:
+        mesh       -- the mesh of the first iteration ( forms.util.polygon.Mesh )
+        iterations -- the amount of iterations ( int )
+
+    Return:
+        instances -- ( forms.util.polygon.Instances )
+
+    """
+
+    def instances( self, mesh, iterations ):
+
+        translations, scales = self.transforms( iterations )
+
+        return polygon.Instances( mesh, translations, scales )
+
+
+    """
+    Return iteration N of a mesh as a scene graph of a uniformly scaled system, see
+    forms.util.graph.selfSimilar.
+
+    Parameters:
+        mesh       -- the mesh of the first iteration ( forms.util.polygon.Mesh )
+        iterations -- the amount of iterations ( int )
+
+    Return:
+        node -- ( forms.util.graph.Node )
+
+    """
+
+    def graph( self, mesh, iterations ):
+
+        scale = self.scale()
+
+        if scale is None:
+
+            raise ValueError( "The maps do not share a uniform scale, use compute" )
+
+        return graph.selfSimilar( mesh, self.translations, scale, iterations )
+
+
+    """
+    Expand a mesh into iteration N as vertex and face arrays. The faces of copies mapped by a
+    reflection are reversed so they keep facing outwards.
+
+    Parameters:
+        mesh       -- the mesh of the first iteration ( forms.util.polygon.Mesh )
+        iterations -- the amount of iterations ( int )
+        tolerance  -- weld the copies with this tolerance, see forms.util.polygon.weld ( float default None )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    @instrument.measure( "compute", "iterations" )
+    def compute( self, mesh, iterations, tolerance = None ):
+
+        if self.scale() is not None:
+
+            copies = self.instances( mesh, iterations ).flatten()
+
+        else:
+
+            matrices, translations = self.compose( iterations )
+
+            with instrument.span( "instance", copies = len( matrices ) ):
+
+                vertices = numpy.einsum( "nij,vj->nvi", matrices, mesh.vertices ) + translations[ :, None, : ]
+                offsets  = numpy.arange( len( matrices ), dtype = polygon.indexType( len( matrices ) * mesh.numVertices() ) ) * mesh.numVertices()
+                faces    = mesh.faces[ None, :, : ] + offsets[ :, None, None ]
+
+                reflected          = numpy.linalg.det( matrices ) < 0
+                faces[ reflected ] = faces[ reflected ][ :, :, ::-1 ]
+
+            copies = polygon.Mesh( vertices, faces )
+
+        if tolerance is None:
+
+            return copies
+
+        return polygon.weld( copies, tolerance )
+
+
+    """
+    Return the fixed point of every map, the point it leaves in place. Every fixed point lies on the
+    attractor of the system, the fractal of infinite iterations.
+
+    Return:
+        points -- ( numpy.ndarray( ( K, 3 ) ) )
+
+    """
+
+    def fixedPoints( self ):
+
+        return numpy.linalg.solve( numpy.identity( 3 )[ None ] - self.matrices, self.translations[ :, :, None ] )[ :, :, 0 ]
+
+
+    """
+    Sample points on the attractor of the system with the chaos game. Every point starts at the fixed
+    point of the first map and is moved by a randomly chosen map per step. The same seed gives the
+    same points.
+
+    The steps are taken in blocks, every block choosing one of the compositions of up to 4096 maps
+    composed once beforehand, see compose, so all the points move by a whole block at once.
+
+    The maps are chosen in proportion to the volume they map to by default, so the points are spread
+    evenly, maps flattening onto a plane or a line being chosen as often as the smallest other map.
+
+    Parameters:
+        count         -- the amount of points ( int )
+        steps         -- the amount of maps applied to every point ( default 20 )
+        probabilities -- the probability of choosing every map ( numpy.ndarray( ( K, ) ) default None )
+        seed          -- the random seed ( default 0 )
+        blockSize     -- the most compositions of a block ( default 4096 )
+
+    Return:
+        points -- ( numpy.ndarray( ( count, 3 ) ) )
+
+    """
+
+    @instrument.measure( "sample", "count", "steps" )
+    def sample( self, count, steps = 20, probabilities = None, seed = 0, blockSize = 4096 ):
+
+        if probabilities is None:
+
+            probabilities = numpy.abs( numpy.linalg.det( self.matrices ) )
+            flat          = probabilities <= 1e-12 * probabilities.max()
+
+            probabilities[ flat ] = probabilities[ ~flat ].min() if not flat.all() else 1
+
+        probabilities = numpy.asarray( probabilities, dtype = numpy.float64 )
+        probabilities = probabilities / probabilities.sum()
+
+        depth = 1
+
+        while depth < steps and pow( self.count(), depth + 1 ) <= blockSize:
+
+            depth += 1
+
+        # The steps left over after the whole blocks are taken first, as the maps are chosen independently
+
+        blocks    = ( [ steps % depth ] if steps % depth else [ ] ) + [ depth ] * ( steps // depth )
+        generator = numpy.random.default_rng( seed )
+        points    = numpy.repeat( self.fixedPoints()[ : 1 ], count, axis = 0 )
+        scale     = self.scale()
+        tables    = { }
+
+        for block in blocks:
+
+            if block not in tables:
+
+                # The probability of a composition is the product of the probabilities of its maps, in the order of compose
+
+                weights = numpy.ones( 1 )
+
+                for level in range( block ):
+
+                    weights = ( weights[ :, None ] * probabilities[ None, : ] ).reshape( -1 )
+
+                tables[ block ] = self.compose( block ) + ( numpy.cumsum( weights ), )
+
+            matrices, translations, cumulative = tables[ block ]
+
+            with instrument.span( "block", steps = block ):
+
+                maps = numpy.minimum( numpy.searchsorted( cumulative, generator.random( count ) * cumulative[ -1 ], side = "right" ), len( cumulative ) - 1 )
+
+                if scale is not None:
+
+                    points = pow( scale, block ) * points + translations[ maps ]
+
+                else:
+
+                    points = numpy.einsum( "nij,nj->ni", matrices[ maps ], points ) + translations[ maps ]
+
+        return points
+
+
+
+"""
+Build a system of maps that scale uniformly by the same amount, the maps of the Sierpinski fractals.
+
+Parameters:
+    translations -- the translation of every map ( numpy.ndarray( ( K, 3 ) ) )
+    scale        -- the scale of the maps ( float )
+
+Return:
+    system -- ( forms.util.ifs.System )
+
+"""
+
+def similarity( translations, scale ):
+
+    return System( float(scale) * numpy.identity( 3 ), translations )
@@ -0,0 +1,400 @@
+"""
+This module provides instrumentation of the stages of mesh generation.
+
+The generators wrap every stage in a span, which measures its duration, the memory it allocated
+when tracemalloc is tracing and the amount of elements it produced. Finished spans are logged to
+the "forms" logger, top level spans at INFO and nested spans at DEBUG, and passed to every
+listener, so stages can be timed without changing the generators.
+
+Span     -- The duration, memory and element counts of one stage
+Recorder -- Collect the spans finished while it is active
+"""
+
+
+import contextlib
+import functools
+import inspect
+import logging
+import threading
+import time
+import tracemalloc
+
+
+""" The logger spans are reported to """
+logger = logging.getLogger( "forms" )
+
+_listeners = [ ]
+_local     = threading.local()
+
+
+
+class Span():
+
+
+    """
+    Span class. The measurements of one stage, nested in the stage that was running when it started.
+
+    Parameters:
+        name       -- the name of the stage ( string )
+        parent     -- the span of the enclosing stage ( forms.util.instrument.Span default None )
+        **kwargs   -- attributes of the stage, such as the amount of iterations
+
+    """
+
+    def __init__( self, name, parent = None, **kwargs ):
+
+        self.name       = name
+        self.parent     = parent
+        self.attributes = kwargs
+        self.counts     = { }
+        self.duration   = None
+        self.allocated  = None
+        self.peak       = None
+
+
+    def __repr__( self ):
+
+        return "Span(%s, %s)" % ( self.path(), self.describe() )
+
+
+    """
+    Record the amount of elements the stage produced, such as vertices and faces.
+
+    Keyword arguments:
+        **kwargs -- the counts
+
+    """
+
+    def count( self, **kwargs ):
+
+        self.counts.update( kwargs )
+
+
+    """
+    Return the names of the enclosing stages and this stage, separated by slashes.
+
+    Return:
+        path -- ( string )
+
+    """
+
+    def path( self ):
+
+        if self.parent is None:
+
+            return self.name
+
+        return self.parent.path() + "/" + self.name
+
+
+    def depth( self ):
+
+        if self.parent is None:
+
+            return 0
+
+        return self.parent.depth() + 1
+
+
+    """
+    Return the measurements as readable text.
+
+    Return:
+        description -- ( string )
+
+    """
+
+    def describe( self ):
+
+        text = [ "%.3fs" % ( self.duration or 0 ) ]
+
+        if self.allocated is not None:
+
+            text.append( "%+.1f MB" % ( self.allocated / 1e6 ) )
+
+        for name in sorted( self.attributes ):
+
+            text.append( "%s=%s" % ( name, self.attributes[ name ] ) )
+
+        for name in sorted( self.counts ):
+
+            text.append( "%s %i" % ( name, self.counts[ name ] ) )
+
+        return " ".join( text )
+
+
+
+"""
+Add a function that is called with every finished span.
+
+Parameters:
+    listener -- ( function( forms.util.instrument.Span ) )
+
+"""
+
+def addListener( listener ):
+
+    _listeners.append( listener )
+
+
+
+"""
+Remove a listener, see addListener.
+
+Parameters:
+    listener -- ( function( forms.util.instrument.Span ) )
+
+"""
+
+def removeListener( listener ):
+
+    if listener in _listeners:
+
+        _listeners.remove( listener )
+
+
+
+"""
+Return the spans running in this thread, the innermost last.
+
+Return:
+    spans -- ( [,forms.util.instrument.Span] )
+
+"""
+
+def _stack():
+
+    if not hasattr( _local, "stack" ):
+
+        _local.stack = [ ]
+
+    return _local.stack
+
+
+
+"""
+Measure a stage. The span is reported when the stage finishes, even when it raises.
+
+    with instrument.span( "weld", iterations = 3 ) as stage:
+
+        mesh = polygon.weld( mesh, tolerance )
+        stage.count( vertices = mesh.numVertices() )
+
+Parameters:
+    name     -- the name of the stage ( string )
+    **kwargs -- attributes of the stage, such as the amount of iterations
+
+Return:
+    span -- ( forms.util.instrument.Span )
+
+"""
+
+@contextlib.contextmanager
+def span( name, **kwargs ):
+
+    stack   = _stack()
+    current = Span( name, stack[ -1 ] if stack else None, **kwargs )
+    tracing = tracemalloc.is_tracing()
+
+    if tracing:
+
+        allocated = tracemalloc.get_traced_memory()[ 0 ]
+
+    stack.append( current )
+    start = time.perf_counter()
+
+    try:
+
+        yield current
+
+    finally:
+
+        current.duration = time.perf_counter() - start
+        stack.pop()
+
+        if tracing and tracemalloc.is_tracing():
+
+            memory            = tracemalloc.get_traced_memory()
+            current.allocated = memory[ 0 ] - allocated
+            current.peak      = memory[ 1 ]
+
+        _report( current )
+
+
+
+"""
+Decorate a function so every call is measured as a span. The named arguments are recorded as
+attributes of the span, methods of the generators in forms.geometry and forms.curve record the
+module of their class as the generator, and returned meshes record their amount of vertices and
+faces.
+
+    @instrument.measure( "compute", "iterations" )
+    def compute( self, radius = 10, iterations = 1 ):
+
+Parameters:
+    name       -- the name of the stage ( string )
+    *arguments -- the names of the arguments recorded as attributes ( string )
+
+Return:
+    decorator -- ( function )
+
+"""
+
+def measure( name, *arguments ):
+
+    def decorator( function ):
+
+        signature = inspect.signature( function )
+
+        @functools.wraps( function )
+        def wrapper( *args, **kwargs ):
+
+            values = signature.bind( *args, **kwargs )
+            values.apply_defaults()
+
+            values     = values.arguments
+            attributes = dict( ( argument, values[ argument ] ) for argument in arguments if argument in values )
+
+            if "self" in values:
+
+                module = values[ "self" ].__class__.__module__
+
+                if module.startswith( ( "forms.geometry.", "forms.curve." ) ):
+
+                    attributes[ "generator" ] = module.split( "." )[ -1 ]
+
+            with span( name, **attributes ) as current:
+
+                result = function( *args, **kwargs )
+
+                if hasattr( result, "numVertices" ) and hasattr( result, "numFaces" ):
+
+                    current.count( vertices = result.numVertices(), faces = result.numFaces() )
+
+                elif hasattr( result, "translations" ):
+
+                    current.count( copies = len( result.translations ) )
+
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+
+def _report( current ):
+
+    if current.parent is None:
+
+        logger.info( "%s %s", current.path(), current.describe() )
+
+    else:
+
+        logger.debug( "%s %s", current.path(), current.describe() )
+
+    for listener in list( _listeners ):
+
+        listener( current )
+
+
+
+class Recorder():
+
+
+    """
+    Recorder class. Collects the spans finished while it is active, optionally tracing memory
+    allocations with tracemalloc so every span reports the memory it allocated.
+
+        with instrument.Recorder( memory = True ) as recorder:
+
+            hexahedron.Sierpinski().compute( 10, 4 )
+
+        print( recorder.table() )
+
+    Parameters:
+        memory -- trace memory allocations while active ( default False )
+
+    """
+
+    def __init__( self, memory = False ):
+
+        self.memory = memory
+        self.spans  = [ ]
+
+
+    def __call__( self, current ):
+
+        self.spans.append( current )
+
+
+    def __enter__( self ):
+
+        self.started = self.memory and not tracemalloc.is_tracing()
+
+        if self.started:
+
+            tracemalloc.start()
+
+        addListener( self )
+
+        return self
+
+
+    def __exit__( self, *args ):
+
+        removeListener( self )
+
+        if self.started:
+
+            tracemalloc.stop()
+
+
+    """
+    Return the total duration of the spans with each path.
+
+    Return:
+        totals -- ( dict )
+
+    """
+
+    def totals( self ):
+
+        totals = { }
+
+        for current in self.spans:
+
+            totals[ current.path() ] = totals.get( current.path(), 0 ) + current.duration
+
+        return totals
+
+
+    """
+    Return the spans as an indented table, in the order they started.
+
+    Return:
+        table -- ( string )
+
+    """
+
+    def table( self ):
+
+        # Spans finish innermost first, so order them by their position in the tree
+
+        order = { }
+
+        def key( current ):
+
+            if current.parent is None:
+
+                return ( order.setdefault( id( current ), len( order ) ), )
+
+            return key( current.parent ) + ( order.setdefault( id( current ), len( order ) ), )
+
+        for current in self.spans:
+
+            key( current )
+
+        lines = [ "%s%-*s %s" % ( "  " * current.depth(), 24 - 2 * current.depth(), current.name, current.describe() ) for current in sorted( self.spans, key = key ) ]
+
+        return "\n".join( lines )
@@ -0,0 +1,108 @@
+"""
+This module provides lazily imported modules, so importing forms does not load the Maya bindings.
+Importing pymel.core takes seconds and initializes Maya, which headless workers never need.
+
+Module -- A module that is imported the first time it is used
+"""
+
+
+import importlib
+import importlib.util
+
+
+
+class Module():
+
+
+    """
+    Module class. Stands in for a module and imports it the first time one of its attributes is used.
+
+        pm = lazy.Module( "pymel.core" )
+
+        pm.polyCube()
+
+    Parameters:
+        name    -- the name of the module ( string )
+        message -- why the module is needed, added to the ImportError raised when it is missing ( string default None )
+
+    """
+
+    def __init__( self, name, message = None ):
+
+        self.__dict__[ "_name" ]    = name
+        self.__dict__[ "_message" ] = message
+        self.__dict__[ "_module" ]  = None
+
+
+    def __repr__( self ):
+
+        return "Module(%s, %s)" % ( self._name, "loaded" if self._module is not None else "not loaded" )
+
+
+    def __getattr__( self, attribute ):
+
+        return getattr( self.load(), attribute )
+
+
+    def __setattr__( self, attribute, value ):
+
+        setattr( self.load(), attribute, value )
+
+
+    """
+    Import the module, once.
+
+    Return:
+        module -- ( module )
+
+    """
+
+    def load( self ):
+
+        if self._module is None:
+
+            try:
+
+                self.__dict__[ "_module" ] = importlib.import_module( self._name )
+
+            except ImportError as error:
+
+                if self._message is None:
+
+                    raise
+
+                raise ImportError( "%s ( %s )" % ( self._message, error ) )
+
+        return self._module
+
+
+    """
+    Return whether the module can be imported, without importing it.
+
+    Return:
+        available -- ( bool )
+
+    """
+
+    def available( self ):
+
+        if self._module is not None:
+
+            return True
+
+        try:
+
+            return importlib.util.find_spec( self._name ) is not None
+
+        except ( ImportError, ValueError ):
+
+            return False
+
+
+
+_maya = "Output to Maya needs Maya, use the vertex and face arrays outside of Maya"
+
+""" The Maya bindings, imported when a function outputting to Maya is called """
+pm  = Module( "pymel.core", _maya )
+mel = Module( "maya.mel", _maya )
+om  = Module( "maya.api.OpenMaya", _maya )
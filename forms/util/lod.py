@@ -0,0 +1,147 @@
+"""
+This module provides level of detail pyramids of fractal meshes.
+
+The level k approximation of a fractal of N iterations replaces every block it does not resolve
+with the solid bounding it, which makes it the fractal of k iterations. Every level indexes one
+shared vertex buffer and has a geometric error, the most its surface strays from the final level,
+from which viewers work out the screen space error at any distance.
+
+Pyramid -- The levels of detail of a fractal sharing one vertex buffer
+"""
+
+
+import numpy
+
+from forms.util import instrument, polygon
+
+
+
+class Pyramid():
+
+
+    """
+    Pyramid class. Level 0 is the coarsest level, the last level the fractal itself.
+
+    Parameters:
+        vertices -- the vertices of every level ( numpy.ndarray( ( V, 3 ) ) )
+        faces    -- the faces of every level, indexing vertices ( [,numpy.ndarray( ( F, sides ) )] )
+        errors   -- the geometric error of every level ( numpy.ndarray( ( levels, ) ) )
+
+    """
+
+    def __init__( self, vertices, faces, errors ):
+
+        self.vertices = numpy.ascontiguousarray( vertices, dtype = numpy.float64 ).reshape( -1, 3 )
+        self.faces    = list( faces )
+        self.errors   = numpy.asarray( errors, dtype = numpy.float64 )
+
+
+    def __repr__( self ):
+
+        return "Pyramid(%i levels, %i vertices, %s faces)" % ( self.numLevels(), len( self.vertices ), "/".join( str( len( faces ) ) for faces in self.faces ) )
+
+
+    def numLevels( self ):
+
+        return len( self.faces )
+
+
+    """
+    Return a level as a mesh sharing the vertex buffer, so it holds the vertices of every level.
+    Use forms.util.polygon.compact for a mesh of its own vertices.
+
+    Parameters:
+        level -- the level, negative levels count from the last ( int )
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def mesh( self, level ):
+
+        return polygon.Mesh( self.vertices, self.faces[ level ] )
+
+
+    """
+    Return the screen space error of every level in pixels, for a perspective camera looking at the
+    fractal from a distance.
+
+    Parameters:
+        distance    -- the distance from the camera ( float )
+        fieldOfView -- the vertical field of view in radians, by default that of Maya's persp camera ( float default 0.6545 )
+        height      -- the height of the viewport in pixels ( int default 1080 )
+
+    Return:
+        errors -- ( numpy.ndarray( ( levels, ) ) )
+
+    """
+
+    def screenSpaceErrors( self, distance, fieldOfView = 0.6545, height = 1080 ):
+
+        return self.errors * height / ( 2 * max( float(distance), 1e-12 ) * numpy.tan( fieldOfView / 2 ) )
+
+
+    """
+    Return the distance from which every level is within a screen space error.
+
+    Parameters:
+        threshold   -- the most screen space error in pixels ( float default 1 )
+        fieldOfView -- the vertical field of view in radians ( float default 0.6545 )
+        height      -- the height of the viewport in pixels ( int default 1080 )
+
+    Return:
+        distances -- ( numpy.ndarray( ( levels, ) ) )
+
+    """
+
+    def distances( self, threshold = 1, fieldOfView = 0.6545, height = 1080 ):
+
+        return self.errors * height / ( 2 * float(threshold) * numpy.tan( fieldOfView / 2 ) )
+
+
+    """
+    Return the coarsest level within a screen space error at a distance.
+
+    Parameters:
+        distance    -- the distance from the camera ( float )
+        threshold   -- the most screen space error in pixels ( float default 1 )
+        fieldOfView -- the vertical field of view in radians ( float default 0.6545 )
+        height      -- the height of the viewport in pixels ( int default 1080 )
+
+    Return:
+        level -- ( int )
+
+    """
+
+    def select( self, distance, threshold = 1, fieldOfView = 0.6545, height = 1080 ):
+
+        within = numpy.nonzero( self.screenSpaceErrors( distance, fieldOfView, height ) <= threshold )[ 0 ]
+
+        return int( within[ 0 ] ) if len( within ) else self.numLevels() - 1
+
+
+
+"""
+Build a pyramid from the levels of a fractal, welding the vertices the levels share into one buffer.
+
+Parameters:
+    levels -- the integer keys, positions and faces of every level, equal keys being equal positions ( [,( numpy.ndarray( ( V, n ) ), numpy.ndarray( ( V, 3 ) ), numpy.ndarray( ( F, sides ) ) )] )
+    errors -- the geometric error of every level ( [,float] )
+
+Return:
+    pyramid -- ( forms.util.lod.Pyramid )
+
+"""
+
+@instrument.measure( "pyramid" )
+def pyramid( levels, errors ):
+
+    keys      = numpy.concatenate( [ numpy.asarray( levelKeys, dtype = numpy.int64 ).reshape( len( levelKeys ), -1 ) for levelKeys, positions, faces in levels ] )
+    positions = numpy.concatenate( [ positions for levelKeys, positions, faces in levels ] )
+    offsets   = numpy.cumsum( [ 0 ] + [ len( levelKeys ) for levelKeys, positions, faces in levels ] )
+
+    index, inverse = polygon.unique( polygon.pack( keys ) )
+    inverse        = inverse.astype( polygon.indexType( len( index ) ) )
+
+    return Pyramid( positions[ index ], [ inverse[ faces + offset ] for ( levelKeys, positions, faces ), offset in zip( levels, offsets ) ], errors )
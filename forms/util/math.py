@@ -3,22 +3,19 @@ Various math utilities module.
 """
 
 
-import pymel.util as util
+# NumPy works on numbers and arrays alike, as pymel.util.arrays does, without loading pymel
+
+from numpy import pi, cos, sin, degrees, radians, sqrt
 
 
 """ Constant PHI """
-PHI = 1.61803399
+PHI = ( 1 + sqrt( 5 ) ) / 2
 
 
 """ Math shorthand constants and methods """
-PI      = util.arrays.pi
+PI      = pi
 HALF_PI = PI / 2
 TWO_PI  = PI * 2
-cos     = util.arrays.cos
-sin     = util.arrays.sin
-degrees = util.arrays.degrees
-radians = util.arrays.radians
-sqrt    = util.arrays.sqrt
 
 
 """
@@ -1,12 +1,204 @@
 """
-This module provides various mesh utilities for cleaning and extruding.
+This module provides various mesh utilities for creating, cleaning and extruding.
 """
 
 
-import pymel.core as pm
-import maya.mel as mel
+import numpy
+
+from forms.util import instrument, polygon
+from forms.util.lazy import mel, om, pm
+
+
+
+"""
+Create a Maya mesh from an array mesh with a single MFnMesh.create call.
+
+Parameters:
+    polygonMesh -- the vertex and face arrays ( forms.util.polygon.Mesh )
+    meshName    -- A name for the mesh output ( default "mesh" )
+
+Return:
+    mesh -- ( [pymel.core.nodetypes.Transform(u'')] )
+
+"""
+
+@instrument.measure( "create", "meshName" )
+def create( polygonMesh, meshName = "mesh" ):
+
+    vertices = om.MFloatPointArray( polygonMesh.vertices.tolist() )
+    counts   = om.MIntArray( polygonMesh.polygonCounts().tolist() )
+    connects = om.MIntArray( polygonMesh.polygonConnects().tolist() )
+
+    transform = om.MFnMesh().create( vertices, counts, connects )
+    mesh      = pm.PyNode( om.MFnDagNode( transform ).fullPathName() )
+    mesh      = pm.rename( mesh, meshName )
+
+    pm.sets( "initialShadingGroup", edit = True, forceElement = mesh )
+    pm.select( clear = True )
+
+    return [ mesh ]
+
+
+
+"""
+Create a Maya mesh for the copied mesh of an array of instances and copy it with a single particle
+instancer, one particle per copy, so the copies share the mesh instead of being merged.
+
+Parameters:
+    instances -- the mesh and the transform of every copy ( forms.util.polygon.Instances )
+    meshName  -- A name for the mesh output ( default "mesh" )
+
+Return:
+    mesh -- the particles, the instancer and the hidden copied mesh ( [pymel.core.nodetypes.Transform(u''), pymel.core.nodetypes.Instancer(u''), pymel.core.nodetypes.Transform(u'')] )
+
+"""
+
+@instrument.measure( "instancer", "meshName" )
+def instancer( instances, meshName = "mesh" ):
+
+    source    = create( instances.mesh, meshName + "_Source" )[ 0 ]
+    particles = pm.particle( position = instances.translations.tolist(), name = meshName )
+
+    # The scale of every copy is read from a per particle attribute
+
+    pm.addAttr( particles[ 1 ], longName = "instanceScale", dataType = "vectorArray" )
+    pm.setAttr( particles[ 1 ] + ".instanceScale", numpy.repeat( instances.scales[ :, None ], 3, axis = 1 ).tolist(), type = "vectorArray" )
+    pm.saveInitialState( particles[ 1 ] )
+
+    instancerNode = pm.particleInstancer( particles[ 1 ], addObject = True, object = source, scale = "instanceScale" )
+
+    pm.hide( source )
+    pm.select( clear = True )
+
+    return [ particles[ 0 ], pm.PyNode( instancerNode ), source ]
+
+
+
+"""
+Create a Maya mesh for every level of a level of detail pyramid, finest first, under a lodGroup that
+switches between them by their distance to the persp camera. A level is shown from the distance its
+screen space error falls within the threshold, see forms.util.lod.Pyramid.distances.
+
+Parameters:
+    pyramid   -- the levels of detail ( forms.util.lod.Pyramid )
+    meshName  -- A name for the mesh output ( default "mesh" )
+    threshold -- the most screen space error in pixels ( float default 1 )
+
+Return:
+    mesh -- the lodGroup and the mesh of every level, finest first ( [pymel.core.nodetypes.LodGroup(u''), pymel.core.nodetypes.Transform(u''), ...] )
+
+"""
+
+@instrument.measure( "levelOfDetail", "meshName" )
+def levelOfDetail( pyramid, meshName = "mesh", threshold = 1 ):
+
+    group     = pm.createNode( "lodGroup", name = meshName )
+    distances = pyramid.distances( threshold )
+    meshes    = [ ]
+
+    for level in reversed( range( pyramid.numLevels() ) ):
+
+        mesh = create( polygon.compact( pyramid.mesh( level ) ), "%s_LOD_%i" % ( meshName, level ) )[ 0 ]
+
+        pm.parent( mesh, group )
+        meshes.append( mesh )
+
+    # The group switches from a child to the next one at the distance of the coarser level
+
+    for i, level in enumerate( reversed( range( pyramid.numLevels() - 1 ) ) ):
+
+        pm.setAttr( "%s.threshold[%i]" % ( group, i ), float(distances[ level ]) )
+
+    if pm.objExists( "perspShape" ):
+
+        pm.connectAttr( "perspShape.worldMatrix[0]", group + ".cameraMatrix" )
+
+    pm.select( clear = True )
+
+    return [ group ] + meshes
+
+
+
+"""
+Replace the vertices of a Maya mesh created by create, and optionally its faces, in place, so the
+node, its name, its shading and its connections are kept.
+
+Parameters:
+    mesh        -- The mesh to replace ( pymel.core.nodetypes.Transform(u'') )
+    polygonMesh -- the vertex and face arrays ( forms.util.polygon.Mesh )
+    topology    -- Replace the faces too, otherwise only the vertices are moved ( default True )
+
+"""
+
+@instrument.measure( "replace", "topology" )
+def replace( mesh, polygonMesh, topology = True ):
+
+    selection = om.MSelectionList()
+    selection.add( str( mesh ) )
+
+    dagPath = selection.getDagPath( 0 )
+    dagPath.extendToShape()
+
+    vertices = om.MFloatPointArray( polygonMesh.vertices.tolist() )
+
+    if topology:
+
+        counts   = om.MIntArray( polygonMesh.polygonCounts().tolist() )
+        connects = om.MIntArray( polygonMesh.polygonConnects().tolist() )
+
+        om.MFnMesh( dagPath ).createInPlace( vertices, counts, connects )
+
+    else:
+
+        om.MFnMesh( dagPath ).setPoints( om.MPointArray( vertices ) )
+
+
+
+"""
+Merge the vertices of a mesh with the option of removing duplicate internal faces.
+Meshes created from welded arrays can skip the merge, see forms.util.polygon.weld.
+
+Parameters:
+    mesh           -- The mesh to clean ( [pymel.core.nodetypes.Transform(u'')] )
+    duplicateFaces -- Optionally remove lamina and the faces they share ( default False )
+    distance       -- The vertex merge distance, None to skip merging ( default 0.1 )
+
+"""
+
+@instrument.measure( "clean", "duplicateFaces", "distance" )
+def clean( mesh, duplicateFaces = False, distance = 0.1 ):
+
+    if distance is not None:
+
+        with instrument.span( "merge", distance = distance ) as stage:
+
+            pm.polyMergeVertex( mesh[ 0 ].vtx, distance = distance )
+            stage.count( vertices = mesh[ 0 ].numVertices() )
+
+    if duplicateFaces:
+
+        with instrument.span( "cleanup" ) as stage:
+
+            pm.select( mesh[ 0 ] )
+            pm.selectType( polymeshFace = True )
+            pm.polySelectConstraint( mode = 3, type = 0x0008, topology = 2 )
+            
+            # Don't ask me how I did this
+
+            mel.eval('polyCleanupArgList 3 { "0","2","0","0","0","0","0","0","0","1e-005","0","1e-005","1","0.3","0","-1","1" };') 
+            
+            pm.delete()
+            pm.polySelectConstraint( mode = 0, topology = 0 ) 
+            pm.selectType( polymeshFace = False )   
+            pm.selectMode( object = True )
+
+            stage.count( faces = mesh[ 0 ].numFaces() )
+
+
+    pm.delete( mesh[ 0 ], constructionHistory = True )
+    pm.select( clear = True )
+
 
-    
 
 """
 Combine multiple polygon meshes with the option of removing duplicate internal faces.
@@ -21,46 +213,19 @@ Return:
         
 """
 
+@instrument.measure( "combineClean", "meshName", "duplicateFaces" )
 def combineClean( instanceGroup, meshName, duplicateFaces = False ):
             
-    print( "Combining mesh" )
-    
-    mesh = pm.polyUnite( instanceGroup, name = meshName, constructionHistory = False )
-
-    #print( "Merging %i" % len( mesh[ 0 ].vtx ) + " verticies" )
-    pm.polyMergeVertex( mesh[ 0 ].vtx, distance = 0.1 )
-    #print( "Reduced to %i" % mesh[ 0 ].numVertices() + " verticies" )
-
-    if duplicateFaces:
-
-        print( "Cleaning up faces" )
-
-        pm.select( mesh[ 0 ] )
-        pm.selectType( polymeshFace = True )
-        pm.polySelectConstraint( mode = 3, type = 0x0008, topology = 2 )
-        
-        # Don't ask me how I did this
-
-        mel.eval('polyCleanupArgList 3 { "0","2","0","0","0","0","0","0","0","1e-005","0","1e-005","1","0.3","0","-1","1" };') 
-        
-        pm.delete()
-        pm.polySelectConstraint( mode = 0, topology = 0 ) 
-        pm.selectType( polymeshFace = False )   
-        pm.selectMode( object = True )
+    with instrument.span( "unite" ):
 
-        print( "Faces reduced" )      
+        mesh = pm.polyUnite( instanceGroup, name = meshName, constructionHistory = False )
 
+    clean( mesh, duplicateFaces )
 
     if pm.PyNode( instanceGroup ).exists():
         
         pm.delete( instanceGroup )
 
-
-    pm.delete( constructionHistory = True )
-    pm.select( clear = True )
-    
-    print( "Cleaning up complete" )
-
     return mesh
 
 
@@ -68,6 +233,7 @@ def combineClean( instanceGroup, meshName, duplicateFaces = False ):
 """
 Create a wireframe style mesh
 Ported from jh_polyWire.mel http://www.creativecrash.com/maya/downloads/scripts-plugins/modeling/poly-tools/c/convert-to-polywire
+For vertex and face arrays use forms.util.halfedge.polyWire, which runs without Maya
 
 Parameters:
     mesh        -- The mesh to convert ( pm.core.nodetypes.Mesh )
@@ -76,6 +242,7 @@ Parameters:
     extrudeMode -- The extrusion mode. 0 to scale the faces in world space, 1 to translate the faces in local space ( default 1 )
 
 """
+@instrument.measure( "polyWire", "gridSize", "depth", "extrudeMode" )
 def polyWire( mesh, gridSize = 0.9, depth = 0.5, extrudeMode = 0 ):
 
     # Select the faces
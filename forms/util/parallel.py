@@ -0,0 +1,283 @@
+"""
+This module provides parallel mesh generation. The blocks of a mesh are built in a process pool,
+handed back through shared memory and stitched together by welding only the vertices on their seams.
+"""
+
+
+import os
+import sys
+
+import numpy
+
+from forms.util import instrument, lazy, polygon
+
+# The process pool and shared memory are imported when blocks are first built
+
+futures          = lazy.Module( "concurrent.futures" )
+resource_tracker = lazy.Module( "multiprocessing.resource_tracker" )
+shared_memory    = lazy.Module( "multiprocessing.shared_memory" )
+
+
+
+"""
+Copy an array into a new shared memory block owned by the receiving process.
+
+Parameters:
+    array -- the array to share ( numpy.ndarray )
+
+Return:
+    shared -- the block name, shape and type ( ( string, tuple, string ) )
+
+"""
+
+def _share( array ):
+
+    # The receiving process unlinks the block, so this one does not track it
+
+    if sys.version_info >= ( 3, 13 ):
+
+        block = shared_memory.SharedMemory( create = True, size = max( array.nbytes, 1 ), track = False )
+
+    else:
+
+        block = shared_memory.SharedMemory( create = True, size = max( array.nbytes, 1 ) )
+
+        # Only POSIX blocks are tracked, under their name with the leading slash
+
+        if os.name == "posix":
+
+            resource_tracker.unregister( "/" + block.name, "shared_memory" )
+
+    numpy.ndarray( array.shape, dtype = array.dtype, buffer = block.buf )[ ... ] = array
+
+    block.close()
+
+    return block.name, array.shape, array.dtype.str
+
+
+
+"""
+Copy a shared array into an array and release its shared memory block.
+
+Parameters:
+    shared -- the block name, shape and type, see _share ( ( string, tuple, string ) )
+    out    -- the array to copy into ( numpy.ndarray )
+
+"""
+
+def _receive( shared, out ):
+
+    name, shape, dtype = shared
+
+    block = shared_memory.SharedMemory( name = name )
+    out[ ... ] = numpy.ndarray( shape, dtype = dtype, buffer = block.buf )
+
+    block.close()
+    block.unlink()
+
+
+
+"""
+Build a block in a worker process and share its arrays.
+
+Parameters:
+    function -- a picklable function returning a mesh ( function )
+    args     -- the arguments of the function ( tuple )
+
+Return:
+    vertices -- ( ( string, tuple, string ) )
+    faces    -- ( ( string, tuple, string ) )
+
+"""
+
+def _work( function, args ):
+
+    mesh = function( *args )
+
+    return _share( mesh.vertices ), _share( mesh.faces )
+
+
+
+"""
+Build lists of meshes in a worker process and share their arrays.
+
+Parameters:
+    function -- a picklable function returning a list of meshes ( function )
+    args     -- the arguments of the function ( tuple )
+
+Return:
+    meshes -- the shared vertices and faces of every mesh ( [,( ( string, tuple, string ), ( string, tuple, string ) )] )
+
+"""
+
+def _workMany( function, args ):
+
+    return [ ( _share( mesh.vertices ), _share( mesh.faces ) ) for mesh in function( *args ) ]
+
+
+
+"""
+Copy a shared array into a new array and release its shared memory block.
+
+Parameters:
+    shared -- the block name, shape and type, see _share ( ( string, tuple, string ) )
+
+Return:
+    array -- ( numpy.ndarray )
+
+"""
+
+def _take( shared ):
+
+    array = numpy.empty( shared[ 1 ], dtype = shared[ 2 ] )
+
+    _receive( shared, array )
+
+    return array
+
+
+
+"""
+Call a function returning a list of meshes once for every set of arguments, in a process pool.
+The meshes are handed back through shared memory, see compute.
+
+Parameters:
+    function -- a picklable function returning a list of meshes ( function )
+    calls    -- the arguments of every call of the function ( [,tuple] )
+    workers  -- the amount of worker processes, 1 calls the function in this process ( int )
+
+Return:
+    meshes -- the meshes returned by every call ( [,[,forms.util.polygon.Mesh]] )
+
+"""
+
+@instrument.measure( "computeMany", "workers" )
+def computeMany( function, calls, workers ):
+
+    if workers <= 1 or len( calls ) <= 1:
+
+        return [ function( *args ) for args in calls ]
+
+    with futures.ProcessPoolExecutor( max_workers = min( workers, len( calls ) ) ) as executor:
+
+        shared = list( executor.map( _workMany, [ function ] * len( calls ), calls ) )
+
+    return [ [ polygon.Mesh( _take( vertices ), _take( faces ) ) for vertices, faces in meshes ] for meshes in shared ]
+
+
+
+"""
+Build the blocks of a mesh in parallel and stitch them into one mesh.
+
+The blocks are built in a process pool, every block is welded by its worker and only the vertices
+where the bounding boxes of two blocks overlap are welded afterwards. On Windows and in Maya the
+workers are spawned, so the function must be importable, and in Maya multiprocessing.set_executable
+must point at mayapy.
+
+Parameters:
+    function  -- a picklable function returning a welded mesh, such as a module function or a bound method ( function )
+    blocks    -- the arguments of every call of the function ( [,tuple] )
+    workers   -- the amount of worker processes, 1 builds the blocks in this process ( int )
+    tolerance -- the seam weld tolerance ( float )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+@instrument.measure( "parallel", "workers" )
+def compute( function, blocks, workers, tolerance ):
+
+    with instrument.span( "blocks", blocks = len( blocks ) ):
+
+        if workers > 1:
+
+            with futures.ProcessPoolExecutor( max_workers = workers ) as executor:
+
+                shared = list( executor.map( _work, [ function ] * len( blocks ), blocks ) )
+
+        else:
+
+            shared = [ _work( function, args ) for args in blocks ]
+
+    # Copy the blocks into one mesh, offsetting the face indices of each block
+
+    counts   = numpy.array( [ vertices[ 1 ][ 0 ] for vertices, faces in shared ], dtype = numpy.int64 )
+    offsets  = numpy.concatenate( [ [ 0 ], numpy.cumsum( counts ) ] )
+    sides    = shared[ 0 ][ 1 ][ 1 ][ 1 ]
+    vertices = numpy.empty( ( offsets[ -1 ], 3 ) )
+    faces    = numpy.empty( ( sum( faces[ 1 ][ 0 ] for vertices, faces in shared ), sides ), dtype = polygon.indexType( offsets[ -1 ] ) )
+    bounds   = numpy.empty( ( len( shared ), 2, 3 ) )
+    start    = 0
+
+    for i, ( sharedVertices, sharedFaces ) in enumerate( shared ):
+
+        end = start + sharedFaces[ 1 ][ 0 ]
+
+        _receive( sharedVertices, vertices[ offsets[ i ] : offsets[ i + 1 ] ] )
+        _receive( sharedFaces, faces[ start : end ] )
+
+        faces[ start : end ] += offsets[ i ]
+        bounds[ i ] = vertices[ offsets[ i ] : offsets[ i + 1 ] ].min( axis = 0 ), vertices[ offsets[ i ] : offsets[ i + 1 ] ].max( axis = 0 )
+        start = end
+
+    return stitch( polygon.Mesh( vertices, faces ), offsets, bounds, tolerance )
+
+
+
+"""
+Weld the seams between blocks of a mesh that were welded separately. Only the vertices of a block
+inside the bounding box of another block are considered.
+
+Parameters:
+    mesh      -- the combined blocks ( forms.util.polygon.Mesh )
+    offsets   -- the first vertex of every block, followed by the amount of vertices ( numpy.ndarray( ( n + 1, ) ) )
+    bounds    -- the bounding box of every block ( numpy.ndarray( ( n, 2, 3 ) ) )
+    tolerance -- the weld tolerance ( float )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+@instrument.measure( "stitch" )
+def stitch( mesh, offsets, bounds, tolerance ):
+
+    lower = bounds[ :, 0 ] - tolerance
+    upper = bounds[ :, 1 ] + tolerance
+    seams = [ ]
+
+    for i in range( len( bounds ) ):
+
+        # Only the overlap with a touching block can hold seam vertices
+
+        touching = numpy.nonzero( ( lower[ i ] <= upper ).all( axis = 1 ) & ( lower <= upper[ i ] ).all( axis = 1 ) )[ 0 ]
+        vertices = mesh.vertices[ offsets[ i ] : offsets[ i + 1 ] ]
+        seam     = numpy.zeros( len( vertices ), dtype = bool )
+
+        for j in touching[ touching != i ]:
+
+            seam |= ( ( vertices >= numpy.maximum( lower[ i ], lower[ j ] ) ) & ( vertices <= numpy.minimum( upper[ i ], upper[ j ] ) ) ).all( axis = 1 )
+
+        seams.append( numpy.nonzero( seam )[ 0 ] + offsets[ i ] )
+
+    seams = numpy.concatenate( seams )
+
+    if not len( seams ):
+
+        return mesh
+
+    # Weld the seam vertices on the same grid as forms.util.polygon.weld
+
+    index, inverse = polygon.unique( numpy.floor( mesh.vertices[ seams ] / float(tolerance) + 0.5 ).astype( numpy.int64 ) )
+
+    remap = numpy.arange( mesh.numVertices(), dtype = mesh.faces.dtype )
+    remap[ seams ] = seams[ index ][ inverse ]
+
+    keep = numpy.ones( mesh.numVertices(), dtype = bool )
+    keep[ seams ] = False
+    keep[ seams[ index ] ] = True
+
+    compacted = numpy.cumsum( keep, dtype = mesh.faces.dtype ) - 1
+
+    return polygon.Mesh( mesh.vertices[ keep ], compacted[ remap[ mesh.faces ] ] )
@@ -0,0 +1,483 @@
+"""
+This module provides an array based polygon mesh and vectorized mesh operations that run without Maya.
+
+Mesh      -- A polygon mesh stored as vertex and face arrays
+Instances -- A polygon mesh copied by arrays of translations and scales
+"""
+
+
+import numpy
+
+from forms.util import instrument
+
+
+
+"""
+Return the smallest integer type able to index the given amount of vertices.
+
+Parameters:
+    count -- the amount of vertices ( int )
+
+Return:
+    dtype -- ( numpy.int32 || numpy.int64 )
+
+"""
+
+def indexType( count ):
+
+    if count < numpy.iinfo( numpy.int32 ).max:
+
+        return numpy.int32
+
+    return numpy.int64
+
+
+
+class Mesh():
+
+
+    """
+    Polygon mesh class. Every face of a mesh has the same amount of sides.
+
+    A mesh computed on the golden lattice keeps the exact lattice coordinates of its vertices, so it
+    can be extended without rounding, see forms.util.golden. Every other mesh has no lattice.
+
+    Parameters:
+        vertices -- the vertex positions ( numpy.ndarray( ( V, 3 ) ) )
+        faces    -- the vertex indices of each face ( numpy.ndarray( ( F, sides ) ) )
+        lattice  -- the golden lattice coordinates of the vertices ( numpy.ndarray( ( V, 3, 2 ) ) default None )
+
+    """
+
+    def __init__( self, vertices, faces, lattice = None ):
+
+        vertices = numpy.asarray( vertices, dtype = numpy.float64 ).reshape( -1, 3 )
+        faces    = numpy.asarray( faces )
+
+        self.vertices = numpy.ascontiguousarray( vertices )
+        self.faces    = numpy.ascontiguousarray( faces.reshape( -1, faces.shape[ -1 ] ), dtype = indexType( len( vertices ) ) )
+        self.lattice  = lattice
+
+
+    def __repr__( self ):
+
+        return "Mesh(%i vertices, %i faces)" % ( self.numVertices(), self.numFaces() )
+
+
+    def numVertices( self ):
+
+        return len( self.vertices )
+
+
+    def numFaces( self ):
+
+        return len( self.faces )
+
+
+    def sides( self ):
+
+        return self.faces.shape[ 1 ]
+
+
+    """
+    Return the amount of vertices of every face, as expected by MFnMesh.create.
+
+    Return:
+        counts -- ( numpy.ndarray( ( F, ) ) )
+
+    """
+
+    def polygonCounts( self ):
+
+        return numpy.full( self.numFaces(), self.sides(), dtype = self.faces.dtype )
+
+
+    """
+    Return the flattened face vertex indices, as expected by MFnMesh.create.
+
+    Return:
+        connects -- ( numpy.ndarray( ( F * sides, ) ) )
+
+    """
+
+    def polygonConnects( self ):
+
+        return self.faces.reshape( -1 )
+
+
+    """
+    Triangulate the faces as fans around their first vertex.
+
+    Return:
+        triangles -- ( numpy.ndarray( ( F * ( sides - 2 ), 3 ) ) )
+
+    """
+
+    def triangles( self ):
+
+        sides = self.sides()
+
+        if sides == 3:
+
+            return self.faces
+
+        fan = numpy.empty( ( self.numFaces(), sides - 2, 3 ), dtype = self.faces.dtype )
+        fan[ :, :, 0 ] = self.faces[ :, :1 ]
+        fan[ :, :, 1 ] = self.faces[ :, 1:-1 ]
+        fan[ :, :, 2 ] = self.faces[ :, 2: ]
+
+        return fan.reshape( -1, 3 )
+
+
+    """
+    Return the axis aligned bounding box of the mesh.
+
+    Return:
+        bounds -- the minimum and maximum corners ( numpy.ndarray( ( 2, 3 ) ) )
+
+    """
+
+    def bounds( self ):
+
+        return numpy.array( [ self.vertices.min( axis = 0 ), self.vertices.max( axis = 0 ) ] )
+
+
+
+class Instances():
+
+
+    """
+    Instances class. Stores one mesh and the transform of every copy of it instead of the merged
+    copies, so the memory used by the geometry does not grow with the amount of copies.
+
+    Parameters:
+        mesh         -- the mesh to copy ( forms.util.polygon.Mesh )
+        translations -- the translation of every copy ( numpy.ndarray( ( N, 3 ) ) )
+        scales       -- the uniform scale of every copy ( float || numpy.ndarray( ( N, ) ) default 1 )
+
+    """
+
+    def __init__( self, mesh, translations, scales = 1 ):
+
+        self.mesh         = mesh
+        self.translations = numpy.ascontiguousarray( translations, dtype = numpy.float64 ).reshape( -1, 3 )
+        self.scales       = numpy.ones( len( self.translations ) ) * numpy.asarray( scales, dtype = numpy.float64 )
+
+
+    def __repr__( self ):
+
+        return "Instances(%i copies of %r)" % ( self.count(), self.mesh )
+
+
+    def count( self ):
+
+        return len( self.translations )
+
+
+    """
+    Return the transform matrix of every copy, with the translation in the last row as in Maya.
+
+    Return:
+        matrices -- ( numpy.ndarray( ( N, 4, 4 ) ) )
+
+    """
+
+    def matrices( self ):
+
+        matrices = numpy.zeros( ( self.count(), 4, 4 ) )
+        matrices[ :, [ 0, 1, 2 ], [ 0, 1, 2 ] ] = self.scales[ :, None ]
+        matrices[ :, 3, :3 ] = self.translations
+        matrices[ :, 3, 3 ]  = 1
+
+        return matrices
+
+
+    """
+    Return the axis aligned bounding box of every copy.
+
+    Return:
+        bounds -- the minimum and maximum corners ( numpy.ndarray( ( 2, 3 ) ) )
+
+    """
+
+    def bounds( self ):
+
+        lower, upper = self.mesh.bounds()
+
+        return numpy.array( [
+            ( self.translations + self.scales[ :, None ] * lower ).min( axis = 0 ),
+            ( self.translations + self.scales[ :, None ] * upper ).max( axis = 0 )
+        ] )
+
+
+    """
+    Merge the copies into one mesh, see instance. The copies are not welded.
+
+    Return:
+        mesh -- ( forms.util.polygon.Mesh )
+
+    """
+
+    def flatten( self ):
+
+        return instance( self.mesh, self.translations, self.scales )
+
+
+
+"""
+Build a convex polyhedron centred at the origin from its vertices and face normals.
+The faces are wound counter clockwise when seen from the outside.
+
+Parameters:
+    vertices -- the vertex positions ( numpy.ndarray( ( V, 3 ) ) )
+    normals  -- a direction per face ( numpy.ndarray( ( F, 3 ) ) )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+def polyhedron( vertices, normals ):
+
+    vertices = numpy.asarray( vertices, dtype = numpy.float64 )
+    normals  = numpy.asarray( normals, dtype = numpy.float64 )
+    normals  = normals / numpy.sqrt( ( normals ** 2 ).sum( axis = 1 ) )[ :, None ]
+
+    # The vertices of a face are those furthest along its normal
+
+    distances = normals.dot( vertices.T )
+    onFace    = distances > distances.max( axis = 1 )[ :, None ] - 1e-6 * numpy.abs( distances ).max()
+    sides     = onFace.sum( axis = 1 )
+
+    if ( sides != sides[ 0 ] ).any():
+
+        raise ValueError( "The faces of a polyhedron must have the same amount of sides" )
+
+    faces = numpy.nonzero( onFace )[ 1 ].reshape( len( normals ), sides[ 0 ] )
+
+    # Sort each face's vertices by their angle around the face normal
+
+    centres = vertices[ faces ].mean( axis = 1 )
+    u       = vertices[ faces[ :, 0 ] ] - centres
+    u      /= numpy.sqrt( ( u ** 2 ).sum( axis = 1 ) )[ :, None ]
+    v       = numpy.cross( normals, u )
+    offsets = vertices[ faces ] - centres[ :, None, : ]
+    angles  = numpy.arctan2( ( offsets * v[ :, None, : ] ).sum( axis = 2 ), ( offsets * u[ :, None, : ] ).sum( axis = 2 ) )
+    order   = numpy.argsort( numpy.mod( angles + 1e-9, 2 * numpy.pi ), axis = 1 )
+
+    return Mesh( vertices, numpy.take_along_axis( faces, order, axis = 1 ) )
+
+
+
+"""
+Stamp out copies of a mesh, each scaled and translated, in one vectorized operation.
+The copies are not welded.
+
+Parameters:
+    mesh         -- the mesh to copy ( forms.util.polygon.Mesh )
+    translations -- the translation of every copy ( numpy.ndarray( ( N, 3 ) ) )
+    scales       -- the uniform scale of every copy ( float || numpy.ndarray( ( N, ) ) default 1 )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+@instrument.measure( "instance" )
+def instance( mesh, translations, scales = 1 ):
+
+    translations = numpy.asarray( translations, dtype = numpy.float64 ).reshape( -1, 3 )
+    scales       = numpy.asarray( scales, dtype = numpy.float64 )
+    count        = len( translations )
+
+    if scales.ndim:
+
+        scales = scales[ :, None, None ]
+
+    vertices = mesh.vertices[ None, :, : ] * scales + translations[ :, None, : ]
+
+    offsets = numpy.arange( count, dtype = indexType( count * mesh.numVertices() ) ) * mesh.numVertices()
+    faces   = mesh.faces[ None, :, : ] + offsets[ :, None, None ]
+
+    return Mesh( vertices, faces )
+
+
+
+"""
+Combine multiple meshes into one mesh without welding them.
+
+Parameters:
+    meshes -- the meshes to combine, they must have the same amount of sides ( [,forms.util.polygon.Mesh] )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+def combine( meshes ):
+
+    offsets = numpy.cumsum( [ 0 ] + [ mesh.numVertices() for mesh in meshes ] )
+    faces   = [ mesh.faces.astype( numpy.int64 ) + offset for mesh, offset in zip( meshes, offsets ) ]
+
+    return Mesh( numpy.concatenate( [ mesh.vertices for mesh in meshes ] ), numpy.concatenate( faces ) )
+
+
+
+"""
+Weld the vertices of a mesh by snapping them to a grid with cells the size of the tolerance. The
+vertices in the same cell are merged into one of them.
+
+This is not a distance test: vertices closer than the tolerance on either side of a cell border
+are not merged, and vertices in one cell up to tolerance * sqrt( 3 ) apart are. It welds copies of
+a mesh exactly when coincident vertices are much closer than the tolerance and distinct vertices
+much further apart.
+
+Each cell is hashed into a single integer, see pack, and equal cells are grouped with one sort,
+see unique, so the cost grows close to linearly with the amount of vertices.
+
+Parameters:
+    mesh      -- the mesh to weld ( forms.util.polygon.Mesh )
+    tolerance -- the size of the grid cells, keep it small relative to the size of the instances ( float )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+@instrument.measure( "weld", "tolerance" )
+def weld( mesh, tolerance ):
+
+    if not mesh.numVertices():
+
+        return mesh
+
+    cells = numpy.floor( mesh.vertices / float(tolerance) + 0.5 ).astype( numpy.int64 )
+
+    index, inverse = unique( pack( cells ) )
+
+    return Mesh( mesh.vertices[ index ], inverse[ mesh.faces ] )
+
+
+
+"""
+Pack rows of integer keys into as few integer columns as possible, a single column when the range
+of the keys allows, so equal rows can be found with one sort. Equal rows give equal packed rows.
+
+Parameters:
+    keys -- rows of integer keys ( numpy.ndarray( ( N, k ) ) )
+
+Return:
+    keys -- ( numpy.ndarray( ( N, ) || ( N, j ) ) )
+
+"""
+
+def pack( keys ):
+
+    keys   = numpy.asarray( keys, dtype = numpy.int64 )
+    keys   = keys - keys.min( axis = 0 )
+    extent = keys.max( axis = 0 ) + 1
+    packed = [ keys[ :, 0 ] ]
+    size   = float( extent[ 0 ] )
+
+    for column in range( 1, keys.shape[ 1 ] ):
+
+        if size * float( extent[ column ] ) < 2 ** 62:
+
+            packed[ -1 ] = packed[ -1 ] * extent[ column ] + keys[ :, column ]
+            size        *= float( extent[ column ] )
+
+        else:
+
+            packed.append( keys[ :, column ] )
+            size = float( extent[ column ] )
+
+    if len( packed ) == 1:
+
+        return packed[ 0 ]
+
+    return numpy.column_stack( packed )
+
+
+
+"""
+Find the unique keys of an array with one unstable sort, which is much faster than numpy.unique on
+tens of millions of keys.
+
+Parameters:
+    keys -- integer keys, or rows of integer keys ( numpy.ndarray( ( N, ) || ( N, k ) ) )
+
+Return:
+    index   -- the position of a key for every unique key, in sorted key order ( numpy.ndarray( ( U, ) ) )
+    inverse -- the unique key index of every key ( numpy.ndarray( ( N, ) ) )
+
+"""
+
+def unique( keys ):
+
+    keys  = numpy.asarray( keys )
+    first = numpy.ones( len( keys ), dtype = bool )
+
+    if keys.ndim == 1:
+
+        order       = numpy.argsort( keys )
+        keys        = keys[ order ]
+        first[ 1: ] = keys[ 1: ] != keys[ :-1 ]
+
+    else:
+
+        order       = numpy.lexsort( keys.T[ ::-1 ] )
+        keys        = keys[ order ]
+        first[ 1: ] = ( keys[ 1: ] != keys[ :-1 ] ).any( axis = 1 )
+
+    inverse          = numpy.empty( len( first ), dtype = indexType( len( first ) ) )
+    inverse[ order ] = numpy.cumsum( first, dtype = inverse.dtype ) - 1
+
+    return order[ first ], inverse
+
+
+
+"""
+Remove the faces that share their vertices with another face, such as the faces between two
+welded copies that touch. Both faces of every pair are removed.
+
+Parameters:
+    mesh -- a welded mesh ( forms.util.polygon.Mesh )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+@instrument.measure( "removeLamina" )
+def removeLamina( mesh ):
+
+    index, inverse = unique( numpy.sort( mesh.faces, axis = 1 ) )
+    counts         = numpy.bincount( inverse, minlength = len( index ) )
+
+    return Mesh( mesh.vertices, mesh.faces[ counts[ inverse ] == 1 ] )
+
+
+
+"""
+Remove the vertices no face uses.
+
+Parameters:
+    mesh -- the mesh to compact ( forms.util.polygon.Mesh )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+def compact( mesh ):
+
+    used = numpy.zeros( mesh.numVertices(), dtype = bool )
+    used[ mesh.faces.reshape( -1 ) ] = True
+
+    if used.all():
+
+        return mesh
+
+    remap = numpy.cumsum( used, dtype = indexType( mesh.numVertices() ) ) - 1
+
+    return Mesh( mesh.vertices[ used ], remap[ mesh.faces ] )
@@ -0,0 +1,246 @@
+"""
+This module provides a table of the five platonic solids as vertex and face arrays, oriented like
+Maya's polyPlatonicSolid and polyCube, so a base solid is a scaled copy of a table entry instead of a
+Maya primitive read back one vertex at a time.
+
+Every solid is defined exactly on the golden lattice, see forms.util.golden, and built once the
+first time it is asked for.
+"""
+
+
+import numpy
+
+from forms.util import golden, polygon
+from forms.util.math import PHI
+
+
+
+""" The names of the solids in the table """
+names = ( "tetrahedron", "hexahedron", "octahedron", "dodecahedron", "icosahedron" )
+
+_table = { }
+
+
+
+def _tetrahedron():
+
+    # vertex indices's
+    # [ 0 ] is right
+    # [ 1 ] is left
+    # [ 2 ] is front
+    # [ 3 ] is top
+
+    # Every other corner of a cube, rotated so the top corner is on the y axis
+
+    vertices = golden.integers( [ [ 1, -1, -1 ], [ -1, 1, -1 ], [ -1, -1, 1 ], [ 1, 1, 1 ] ] )
+    basis    = numpy.array( [
+        numpy.array( [ -1, -1, 2 ] ) / numpy.sqrt( 6 ),
+        numpy.array( [ 1, 1, 1 ] ) / numpy.sqrt( 3 ),
+        numpy.array( [ -1, 1, 0 ] ) / numpy.sqrt( 2 )
+    ] )
+
+    return vertices, -vertices, basis / numpy.sqrt( 3 ), 1.0
+
+
+
+def _hexahedron():
+
+    # A cube of width 1 like Maya's polyCube
+
+    vertices = [ [ x, y, z ] for x in [ -1, 1 ] for y in [ -1, 1 ] for z in [ -1, 1 ] ]
+    normals  = [ [ 1, 0, 0 ], [ -1, 0, 0 ], [ 0, 1, 0 ], [ 0, -1, 0 ], [ 0, 0, 1 ], [ 0, 0, -1 ] ]
+
+    return golden.integers( vertices ), golden.integers( normals ), numpy.identity( 3 ) / 2, numpy.sqrt( 3 ) / 2
+
+
+
+def _octahedron():
+
+    vertices = [ [ 0, 1, 0 ], [ 1, 0, 0 ], [ 0, 0, -1 ], [ -1, 0, 0 ], [ 0, 0, 1 ], [ 0, -1, 0 ] ]
+    normals  = [ [ x, y, z ] for x in [ -1, 1 ] for y in [ -1, 1 ] for z in [ -1, 1 ] ]
+
+    return golden.integers( vertices ), golden.integers( normals ), numpy.identity( 3 ), 1.0
+
+
+
+def _dodecahedron():
+
+    zero = golden.number( 0 )
+    one  = golden.number( 1 )
+    phi  = golden.number( 0, 1 )
+
+    # The face normals of a dodecahedron point at the vertices of an icosahedron
+
+    normals = [ ]
+
+    for a in [ -one, one ]:
+
+        for b in [ -phi, phi ]:
+
+            normals += [ [ zero, a, b ], [ a, b, zero ], [ b, zero, a ] ]
+
+    vertices = [ [ x, y, z ] for x in [ -one, one ] for y in [ -one, one ] for z in [ -one, one ] ]
+
+    # 1 / PHI is PHI - 1
+
+    for a in [ one - phi, phi - one ]:
+
+        for b in [ -phi, phi ]:
+
+            vertices += [ [ zero, b, a ], [ a, zero, b ], [ b, a, zero ] ]
+
+    # Rotate a face normal onto the y axis
+
+    angle    = -numpy.arctan2( PHI, 1 )
+    rotation = numpy.array( [ [ 1, 0, 0 ], [ 0, numpy.cos( angle ), -numpy.sin( angle ) ], [ 0, numpy.sin( angle ), numpy.cos( angle ) ] ] )
+
+    return numpy.array( vertices ), numpy.array( normals ), rotation / numpy.sqrt( 3 ), 1.0
+
+
+
+def _icosahedron():
+
+    zero = golden.number( 0 )
+    one  = golden.number( 1 )
+    phi  = golden.number( 0, 1 )
+
+    vertices = [ ]
+
+    for a in [ -one, one ]:
+
+        for b in [ -phi, phi ]:
+
+            vertices += [ [ zero, a, b ], [ a, b, zero ], [ b, zero, a ] ]
+
+    # The face normals of an icosahedron point at the vertices of a dodecahedron
+
+    normals = [ [ x, y, z ] for x in [ -one, one ] for y in [ -one, one ] for z in [ -one, one ] ]
+
+    # 1 / PHI is PHI - 1
+
+    for a in [ one - phi, phi - one ]:
+
+        for b in [ -phi, phi ]:
+
+            normals += [ [ zero, b, a ], [ a, zero, b ], [ b, a, zero ] ]
+
+    # Rotate a vertex onto the y axis
+
+    angle    = -numpy.arctan2( PHI, 1 )
+    rotation = numpy.array( [ [ 1, 0, 0 ], [ 0, numpy.cos( angle ), -numpy.sin( angle ) ], [ 0, numpy.sin( angle ), numpy.cos( angle ) ] ] )
+
+    return numpy.array( vertices ), numpy.array( normals ), rotation / numpy.sqrt( 1 + PHI * PHI ), 1.0
+
+
+
+"""
+Return the table entry of a solid, building it the first time. The arrays are read only, as they
+are shared by every caller.
+
+Parameters:
+    name -- the name of the solid, see names ( string )
+
+Return:
+    entry -- the lattice vertices and normals, the basis, the mesh, its radius and edge length ( dict )
+
+"""
+
+def _entry( name ):
+
+    if name not in _table:
+
+        if name not in names:
+
+            raise ValueError( "Unknown solid %r, use one of %s" % ( name, ", ".join( names ) ) )
+
+        vertices, normals, basis, radius = globals()[ "_" + name ]()
+
+        mesh  = polygon.polyhedron( numpy.dot( golden.toFloat( vertices ), basis.T ), numpy.dot( golden.toFloat( normals ), basis.T ) )
+        entry = {
+            "vertices" : vertices,
+            "normals"  : normals,
+            "basis"    : basis,
+            "mesh"     : mesh,
+            "radius"   : radius,
+            "edge"     : float( numpy.sqrt( ( ( mesh.vertices[ mesh.faces[ 0, 1 ] ] - mesh.vertices[ mesh.faces[ 0, 0 ] ] ) ** 2 ).sum() ) )
+        }
+
+        for array in [ vertices, normals, basis, mesh.vertices, mesh.faces ]:
+
+            array.setflags( write = False )
+
+        _table[ name ] = entry
+
+    return _table[ name ]
+
+
+
+"""
+Return the vertices and face normals of a solid on the golden lattice, and the matrix that maps
+them onto the solid in the table.
+
+Parameters:
+    name -- the name of the solid, see names ( string )
+
+Return:
+    vertices -- ( numpy.ndarray( ( V, 3, 2 ) ) )
+    normals  -- ( numpy.ndarray( ( F, 3, 2 ) ) )
+    basis    -- ( numpy.ndarray( ( 3, 3 ) ) )
+
+"""
+
+def lattice( name ):
+
+    entry = _entry( name )
+
+    return entry[ "vertices" ], entry[ "normals" ], entry[ "basis" ]
+
+
+
+"""
+Return the edge length of a solid with a radius.
+
+Parameters:
+    name   -- the name of the solid, see names ( string )
+    radius -- the distance from the centre to the vertices ( default 1 )
+
+Return:
+    edgeLength -- ( float )
+
+"""
+
+def edgeLength( name, radius = 1 ):
+
+    entry = _entry( name )
+
+    return entry[ "edge" ] * float(radius) / entry[ "radius" ]
+
+
+
+"""
+Return a solid as vertex and face arrays, scaled to a radius or an edge length. The platonic solids
+are oriented like Maya's polyPlatonicSolid, the hexahedron like Maya's polyCube.
+
+Parameters:
+    name       -- the name of the solid, see names ( string )
+    radius     -- the distance from the centre to the vertices ( default 1 )
+    edgeLength -- the edge length, used instead of the radius when given ( default None )
+
+Return:
+    mesh -- ( forms.util.polygon.Mesh )
+
+"""
+
+def solid( name, radius = 1, edgeLength = None ):
+
+    entry = _entry( name )
+
+    if edgeLength is None:
+
+        scale = float(radius) / entry[ "radius" ]
+
+    else:
+
+        scale = float(edgeLength) / entry[ "edge" ]
+
+    return polygon.Mesh( entry[ "mesh" ].vertices * scale, entry[ "mesh" ].faces.copy() )
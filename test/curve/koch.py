@@ -1,6 +1,10 @@
+import importlib
+import os
+import tempfile
+
 from forms.curve import koch
 
-reload( koch )
+importlib.reload( koch )
 
 
 koch1 = koch.Koch()
@@ -11,9 +15,37 @@ koch2 = koch.Koch()
 koch2.snowflake()
 y = koch2.drawCurve()
 
-print x
-print y
+print( x )
+print( y )
 
 # Result: curve1
 # Result: curve2
 
+koch3 = koch.Koch()
+koch3.snowflake( iteration = 10 )
+
+print( len( koch3.points ) )
+
+# Result: 3145729
+
+koch4 = koch.Koch()
+koch4.curve( iteration = 1 )
+path = os.path.join( tempfile.mkdtemp(), "koch.obj" )
+
+koch4.writeCurve( path )
+
+print( open( path ).read() )
+
+# Result: v -5.000000 0.000000 0.000000
+#         v -1.666667 0.000000 0.000000
+#         v 0.000000 2.886751 0.000000
+#         v 1.666667 0.000000 0.000000
+#         v 5.000000 0.000000 0.000000
+#         l 1 2 3 4 5
+
+koch5 = koch.Koch()
+koch5.snowflake( iteration = 0 )
+
+print( sum( len( points ) for points in koch5.iterPoints( iteration = 12 ) ) )
+
+# Result: 50331649
@@ -1,14 +1,30 @@
+import importlib
+
 from forms.geometry import dodecahedron
 
-reload( dodecahedron )
+importlib.reload( dodecahedron )
 
 
 x = dodecahedron.Dodecahedron().mesh()
 y = dodecahedron.Sierpinski().generate()
 
-print x
-print y
+print( x )
+print( y )
 
 # Result: [nt.Transform(u'pSolid1'), nt.PolyPlatonicSolid(u'polyPlatonicSolid1')]
 # Result: [nt.Transform(u'Sierpinski_Iteration_1')]
 
+z = dodecahedron.Sierpinski().compute()
+
+print( z )
+
+# Result: Mesh(340 vertices, 240 faces)
+
+w = dodecahedron.Sierpinski().instances( iterations = 3 )
+v = dodecahedron.Sierpinski().generate( iterations = 3, instanced = True )
+
+print( w )
+print( v )
+
+# Result: Instances(8000 copies of Mesh(20 vertices, 12 faces))
+# Result: [nt.Transform(u'Sierpinski_Iteration_3'), nt.Instancer(u'instancer1'), nt.Transform(u'Sierpinski_Iteration_3_Source')]
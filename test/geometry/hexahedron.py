@@ -1,13 +1,71 @@
+import importlib
+
+import numpy
+
 from forms.geometry import hexahedron
 
-reload( hexahedron )
+importlib.reload( hexahedron )
 
 
 x = hexahedron.Hexahedron().mesh()
 y = hexahedron.Sierpinski().generate()
 
-print x
-print y
+print( x )
+print( y )
 
 # Result: [nt.Transform(u'pCube1'), nt.PolyCube(u'polyCube1')]
-# Result: [nt.Transform(u'Sierpinski_Iteration_1')]
\ No newline at end of file
+# Result: [nt.Transform(u'Sierpinski_Iteration_1')]
+
+z = hexahedron.Sierpinski().compute()
+
+print( z )
+
+# Result: Mesh(64 vertices, 72 faces)
+
+occupancy = hexahedron.Occupancy( iterations = 6 )
+
+print( occupancy.count() )
+print( occupancy.containsPoint( [ [ 0, 0, 0 ], [ 4.9, 4.9, 4.9 ] ] ) )
+print( occupancy.level( 2 ).surface() )
+
+# Result: 64000000
+# Result: [False  True]
+# Result: Mesh(896 vertices, 1056 faces)
+
+# Variants that only differ in size share one mesh, identical variants are generated once
+
+meshes = hexahedron.Sierpinski().computeBatch( [
+    { "iterations" : 3 },
+    { "iterations" : 3, "size" : 20 },
+    { "iterations" : 2, "holes" : [ 13 ] },
+    { "iterations" : 3 }
+] )
+
+print( meshes )
+print( meshes[ 0 ] is meshes[ 3 ], numpy.shares_memory( meshes[ 0 ].faces, meshes[ 1 ].faces ) )
+
+# Result: [Mesh(15232 vertices, 18048 faces), Mesh(15232 vertices, 18048 faces), Mesh(752 vertices, 696 faces), Mesh(15232 vertices, 18048 faces)]
+# Result: True True
+
+# Edits update the mesh instead of generating it again, see the changes
+
+incremental = hexahedron.Incremental( iterations = 3 )
+
+print( incremental.update( holes = [ 4, 10, 12, 14, 16, 22 ] ) )
+print( incremental.update( size = 20 ) )
+print( incremental.update( iterations = 4 ) )
+print( incremental.changes )
+
+# Result: Mesh(16696 vertices, 23262 faces)
+# Result: Mesh(16696 vertices, 23262 faces)
+# Result: Mesh(329176 vertices, 463926 faces)
+# Result: ['generate', 'holes', 'size', 'iterations']
+
+x = hexahedron.Sierpinski().compute( size = 20, iterations = 4, holes = [ 4, 10, 12, 14, 16, 22 ] )
+y = incremental.mesh()
+
+print( numpy.array_equal( x.vertices, y.vertices ), set( map( tuple, x.faces.tolist() ) ) == set( map( tuple, y.faces.tolist() ) ) )
+print( incremental.generate() )
+
+# Result: True True
+# Result: [nt.Transform(u'Sierpinski_Incremental')]
@@ -1,14 +1,30 @@
+import importlib
+
 from forms.geometry import icosahedron
 
-reload( icosahedron )
+importlib.reload( icosahedron )
 
 
 x = icosahedron.Icosahedron().mesh()
 y = icosahedron.Sierpinski().generate()
 
-print x
-print y
+print( x )
+print( y )
 
 # Result: [nt.Transform(u'pSolid1'), nt.PolyPlatonicSolid(u'polyPlatonicSolid1')]
 # Result: [nt.Transform(u'Sierpinski_Iteration_1')]
 
+z = icosahedron.Sierpinski().compute()
+
+print( z )
+
+# Result: Mesh(104 vertices, 240 faces)
+
+w = icosahedron.Sierpinski().instances( iterations = 3 )
+v = icosahedron.Sierpinski().generate( iterations = 3, instanced = True )
+
+print( w )
+print( v )
+
+# Result: Instances(1728 copies of Mesh(12 vertices, 20 faces))
+# Result: [nt.Transform(u'Sierpinski_Iteration_3'), nt.Instancer(u'instancer1'), nt.Transform(u'Sierpinski_Iteration_3_Source')]
@@ -1,14 +1,30 @@
+import importlib
+
 from forms.geometry import octahedron
 
-reload( octahedron )
+importlib.reload( octahedron )
 
 
 x = octahedron.Octahedron().mesh()
 y = octahedron.Sierpinski().generate()
 
-print x
-print y
+print( x )
+print( y )
 
 # Result: [nt.Transform(u'pSolid1'), nt.PolyPlatonicSolid(u'polyPlatonicSolid1')]
 # Result: [nt.Transform(u'Sierpinski_Iteration_1')]
 
+z = octahedron.Sierpinski().compute()
+
+print( z )
+
+# Result: Mesh(19 vertices, 48 faces)
+
+w = octahedron.Sierpinski().instances( iterations = 3 )
+v = octahedron.Sierpinski().generate( iterations = 3, instanced = True )
+
+print( w )
+print( v )
+
+# Result: Instances(216 copies of Mesh(6 vertices, 8 faces))
+# Result: [nt.Transform(u'Sierpinski_Iteration_3'), nt.Instancer(u'instancer1'), nt.Transform(u'Sierpinski_Iteration_3_Source')]
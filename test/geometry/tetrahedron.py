@@ -1,14 +1,30 @@
+import importlib
+
 from forms.geometry import tetrahedron
 
-reload( tetrahedron )
+importlib.reload( tetrahedron )
 
 
 x = tetrahedron.Tetrahedron().mesh()
 y = tetrahedron.Sierpinski().generate()
 
-print x
-print y
+print( x )
+print( y )
 
 # Result: [nt.Transform(u'pSolid1'), nt.PolyPlatonicSolid(u'polyPlatonicSolid1')]
 # Result: [nt.Transform(u'Sierpinski_Iteration_1')]
 
+z = tetrahedron.Sierpinski().compute()
+
+print( z )
+
+# Result: Mesh(10 vertices, 16 faces)
+
+w = tetrahedron.Sierpinski().instances( iterations = 3 )
+v = tetrahedron.Sierpinski().generate( iterations = 3, instanced = True )
+
+print( w )
+print( v )
+
+# Result: Instances(64 copies of Mesh(4 vertices, 4 faces))
+# Result: [nt.Transform(u'Sierpinski_Iteration_3'), nt.Instancer(u'instancer1'), nt.Transform(u'Sierpinski_Iteration_3_Source')]
@@ -1,9 +1,461 @@
-import cProfile
-import pstats
-from forms.geometry import hexahedron
+"""
+Benchmark the generators without Maya.
 
-# TODO... Make some sort of profiling util
+Every case runs in its own process, so the peak memory of one case does not hide the next, and
+records the wall time, the peak resident memory, the amount of vertices and faces and the faces
+generated per second. The results are written as JSON and two result files can be compared.
 
-cProfile.run('hexahedron.MengerSponge().generate(50, 4)', "prof_result")
-p = pstats.Stats('prof_result')
-p.sort_stats('cumulative').print_stats(10)
+    python test/profiling.py --output before.json
+    python test/profiling.py --output after.json
+    python test/profiling.py --compare before.json after.json
+
+    python test/profiling.py --quick --case hexahedron
+    python test/profiling.py --profile hexahedron iterations=4 grid=3
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert( 0, os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+
+import numpy
+
+try:
+
+    import resource
+
+except ImportError:
+
+    resource = None
+
+from forms.curve import koch
+from forms.geometry import dodecahedron, hexahedron, icosahedron, octahedron, tetrahedron
+from forms.util import export, halfedge, mesh, polygon
+
+
+
+"""
+Return the holes of a Menger sponge style grid, every cell with at least two coordinates away from
+the faces of the grid.
+
+Parameters:
+    grid -- the grid subdivision amount ( int )
+
+Return:
+    holes -- ( [,int] )
+
+"""
+
+def holes( grid ):
+
+    cells    = numpy.arange( grid ** 3 )
+    interior = [ ( ( cells // pow( grid, axis ) ) % grid > 0 ) & ( ( cells // pow( grid, axis ) ) % grid < grid - 1 ) for axis in range( 3 ) ]
+
+    return cells[ sum( interior ) >= 2 ].tolist()
+
+
+
+def sierpinskiTetrahedron( iterations ):
+
+    return tetrahedron.Sierpinski().compute( 10, iterations )
+
+
+def sierpinskiOctahedron( iterations ):
+
+    return octahedron.Sierpinski().compute( 10, iterations )
+
+
+def sierpinskiDodecahedron( iterations ):
+
+    return dodecahedron.Sierpinski().compute( 10, iterations )
+
+
+def sierpinskiIcosahedron( iterations ):
+
+    return icosahedron.Sierpinski().compute( 10, iterations )
+
+
+def sierpinskiHexahedron( iterations, grid ):
+
+    return hexahedron.Sierpinski().compute( 10, iterations, grid, holes( grid ) )
+
+
+def kochSnowflake( iteration ):
+
+    curve = koch.Koch()
+    curve.snowflake( iteration )
+
+    return curve.points
+
+
+def weld( iterations ):
+
+    sierpinski = dodecahedron.Sierpinski()
+
+    return polygon.weld( polygon.instance( sierpinski.polygon(), *sierpinski.transforms( 10, iterations ) ), 1e-3 )
+
+
+def exportSTL( iterations ):
+
+    path = tempfile.mktemp( suffix = ".stl" )
+
+    try:
+
+        export.stl( path, hexahedron.Occupancy( iterations ).iterSurface() )
+
+        return os.path.getsize( path )
+
+    finally:
+
+        os.remove( path )
+
+
+def polyWire( iterations ):
+
+    return halfedge.polyWire( hexahedron.Sierpinski().compute( 10, iterations ) )
+
+
+def mayaMesh( iterations ):
+
+    return mesh.create( hexahedron.Sierpinski().compute( 10, iterations ) )
+
+
+
+""" The cases, with their full and quick parameter sweeps """
+CASES = {
+    "tetrahedron"  : ( sierpinskiTetrahedron, { "iterations" : range( 1, 10 ) }, { "iterations" : [ 1, 4 ] } ),
+    "octahedron"   : ( sierpinskiOctahedron, { "iterations" : range( 1, 8 ) }, { "iterations" : [ 1, 3 ] } ),
+    "dodecahedron" : ( sierpinskiDodecahedron, { "iterations" : range( 1, 5 ) }, { "iterations" : [ 1, 2 ] } ),
+    "icosahedron"  : ( sierpinskiIcosahedron, { "iterations" : range( 1, 6 ) }, { "iterations" : [ 1, 3 ] } ),
+    "hexahedron"   : ( sierpinskiHexahedron, { "iterations" : range( 1, 6 ), "grid" : [ 3, 4, 5 ] }, { "iterations" : [ 1, 3 ], "grid" : [ 3 ] } ),
+    "koch"         : ( kochSnowflake, { "iteration" : range( 1, 11 ) }, { "iteration" : [ 1, 6 ] } ),
+    "weld"         : ( weld, { "iterations" : range( 1, 5 ) }, { "iterations" : [ 2 ] } ),
+    "export"       : ( exportSTL, { "iterations" : range( 1, 6 ) }, { "iterations" : [ 3 ] } ),
+    "polyWire"     : ( polyWire, { "iterations" : range( 1, 5 ) }, { "iterations" : [ 2 ] } ),
+    "mesh"         : ( mayaMesh, { "iterations" : range( 1, 4 ) }, { "iterations" : [ 1 ] } )
+}
+
+
+
+"""
+Return every combination of a parameter sweep.
+
+Parameters:
+    sweep -- the values of every parameter ( dict )
+
+Return:
+    params -- ( [,dict] )
+
+"""
+
+def combinations( sweep ):
+
+    params = [ { } ]
+
+    for name in sorted( sweep ):
+
+        params = [ dict( param, **{ name : value } ) for param in params for value in sweep[ name ] ]
+
+    return params
+
+
+
+"""
+Return the peak resident memory of this process in bytes.
+
+Return:
+    peak -- ( int || None )
+
+"""
+
+def peakMemory():
+
+    if resource is None:
+
+        return None
+
+    peak = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+
+    # Linux reports kilobytes, macOS reports bytes
+
+    if sys.platform == "darwin":
+
+        return peak
+
+    return peak * 1024
+
+
+
+"""
+Run one case in this process and return its result.
+
+Parameters:
+    case   -- the name of the case ( string )
+    params -- the keyword arguments of the case ( dict )
+    repeat -- the amount of runs, the fastest is kept ( int )
+
+Return:
+    result -- ( dict )
+
+"""
+
+def run( case, params, repeat = 1 ):
+
+    function = CASES[ case ][ 0 ]
+    result   = { "case" : case, "params" : params }
+
+    if case == "mesh" and not mesh.om.available():
+
+        result[ "skipped" ] = "requires Maya"
+
+        return result
+
+    baseline = peakMemory()
+    seconds  = [ ]
+
+    for i in range( repeat ):
+
+        start  = time.time()
+        output = function( **params )
+        seconds.append( time.time() - start )
+
+    result[ "seconds" ] = min( seconds )
+    result[ "peakRSS" ] = peakMemory()
+    result[ "baseRSS" ] = baseline
+
+    if isinstance( output, polygon.Mesh ):
+
+        result[ "vertices" ] = output.numVertices()
+        result[ "faces" ]    = output.numFaces()
+
+    elif isinstance( output, numpy.ndarray ):
+
+        result[ "vertices" ] = len( output )
+        result[ "faces" ]    = 0
+
+    elif isinstance( output, list ):
+
+        result[ "vertices" ] = output[ 0 ].numVertices()
+        result[ "faces" ]    = output[ 0 ].numFaces()
+
+    else:
+
+        result[ "bytes" ] = output
+
+    # Throughput, the curves have vertices but no faces and the exporters write bytes
+
+    for name in [ "faces", "vertices", "bytes" ]:
+
+        if result.get( name ) and result[ "seconds" ] > 0:
+
+            result[ name + "PerSecond" ] = result[ name ] / result[ "seconds" ]
+
+    return result
+
+
+
+"""
+Run one case in a new process, see run.
+
+Parameters:
+    case    -- the name of the case ( string )
+    params  -- the keyword arguments of the case ( dict )
+    repeat  -- the amount of runs, the fastest is kept ( int )
+    timeout -- the most seconds a case may take ( float )
+
+Return:
+    result -- ( dict )
+
+"""
+
+def runProcess( case, params, repeat = 1, timeout = 600 ):
+
+    command = [ sys.executable, os.path.abspath( __file__ ), "--run", case, json.dumps( params ), "--repeat", str( repeat ) ]
+
+    try:
+
+        output = subprocess.check_output( command, timeout = timeout )
+
+    except subprocess.TimeoutExpired:
+
+        return { "case" : case, "params" : params, "skipped" : "timed out after %i seconds" % timeout }
+
+    except subprocess.CalledProcessError as error:
+
+        return { "case" : case, "params" : params, "skipped" : "failed with exit status %i" % error.returncode }
+
+    return json.loads( output.decode( "utf-8" ).strip().splitlines()[ -1 ] )
+
+
+
+"""
+Return a readable description of parameters.
+
+Parameters:
+    params -- ( dict )
+
+Return:
+    description -- ( string )
+
+"""
+
+def describe( params ):
+
+    return " ".join( "%s=%s" % ( name, params[ name ] ) for name in sorted( params ) )
+
+
+
+"""
+Compare two result files. A case is a regression when it is slower than the threshold allows.
+
+Parameters:
+    before    -- the path of the earlier results ( string )
+    after     -- the path of the later results ( string )
+    threshold -- the slowdown ratio reported as a regression ( float )
+
+Return:
+    regressions -- the amount of regressions ( int )
+
+"""
+
+def compare( before, after, threshold = 1.1 ):
+
+    with open( before ) as f:
+
+        before = dict( ( ( result[ "case" ], describe( result[ "params" ] ) ), result ) for result in json.load( f )[ "results" ] )
+
+    with open( after ) as f:
+
+        after = json.load( f )[ "results" ]
+
+    regressions = 0
+
+    print( "%-14s %-24s %10s %10s %8s %10s" % ( "case", "params", "before", "after", "ratio", "peak MB" ) )
+
+    for result in after:
+
+        key = ( result[ "case" ], describe( result[ "params" ] ) )
+
+        if key not in before or "seconds" not in result or "seconds" not in before[ key ]:
+
+            continue
+
+        ratio  = result[ "seconds" ] / max( before[ key ][ "seconds" ], 1e-9 )
+        flag   = ""
+        memory = ( result.get( "peakRSS" ) or 0 ) / 1e6
+
+        if ratio > threshold:
+
+            flag         = "  slower"
+            regressions += 1
+
+        elif before[ key ].get( "faces" ) != result.get( "faces" ) or before[ key ].get( "vertices" ) != result.get( "vertices" ):
+
+            flag = "  changed counts"
+
+        print( "%-14s %-24s %9.3fs %9.3fs %7.2fx %10.1f%s" % ( key[ 0 ], key[ 1 ], before[ key ][ "seconds" ], result[ "seconds" ], ratio, memory, flag ) )
+
+    return regressions
+
+
+
+"""
+Run the benchmarks and write the results.
+
+Parameters:
+    cases   -- the names of the cases to run ( [,string] )
+    quick   -- run the quick sweeps ( bool )
+    output  -- the path of the JSON results ( string )
+    repeat  -- the amount of runs per case ( int )
+    timeout -- the most seconds a case may take ( float )
+
+"""
+
+def benchmark( cases, quick, output, repeat, timeout ):
+
+    results = [ ]
+
+    for case in cases:
+
+        for params in combinations( CASES[ case ][ 2 if quick else 1 ] ):
+
+            result = runProcess( case, params, repeat, timeout )
+            results.append( result )
+
+            if "skipped" in result:
+
+                print( "%-14s %-24s skipped, %s" % ( case, describe( params ), result[ "skipped" ] ) )
+
+            else:
+
+                print( "%-14s %-24s %9.3fs %10.1f MB %12s vertices %12s faces %14s faces/s" % (
+                    case, describe( params ), result[ "seconds" ], ( result[ "peakRSS" ] or 0 ) / 1e6,
+                    result.get( "vertices", "-" ), result.get( "faces", "-" ), "%.0f" % result.get( "facesPerSecond", 0 )
+                ) )
+
+    try:
+
+        commit = subprocess.check_output( [ "git", "rev-parse", "HEAD" ], cwd = os.path.dirname( os.path.abspath( __file__ ) ) ).decode( "utf-8" ).strip()
+
+    except ( OSError, subprocess.CalledProcessError ):
+
+        commit = None
+
+    with open( output, "w" ) as f:
+
+        json.dump( {
+            "commit"  : commit,
+            "python"  : platform.python_version(),
+            "numpy"   : numpy.__version__,
+            "machine" : platform.platform(),
+            "results" : results
+        }, f, indent = 2, sort_keys = True )
+
+    print( "Results written to %s" % output )
+
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser( description = "Benchmark the forms generators without Maya." )
+    parser.add_argument( "--case", action = "append", choices = sorted( CASES ), help = "a case to run, every case by default" )
+    parser.add_argument( "--quick", action = "store_true", help = "run small parameter sweeps" )
+    parser.add_argument( "--output", default = "benchmark.json", help = "the JSON results file" )
+    parser.add_argument( "--repeat", type = int, default = 1, help = "the amount of runs per case, the fastest is kept" )
+    parser.add_argument( "--timeout", type = float, default = 600, help = "the most seconds a case may take" )
+    parser.add_argument( "--threshold", type = float, default = 1.1, help = "the slowdown ratio reported as a regression" )
+    parser.add_argument( "--compare", nargs = 2, metavar = ( "BEFORE", "AFTER" ), help = "compare two result files" )
+    parser.add_argument( "--profile", nargs = "+", metavar = ( "CASE", "NAME=VALUE" ), help = "profile one case with cProfile" )
+    parser.add_argument( "--run", nargs = 2, metavar = ( "CASE", "PARAMS" ), help = argparse.SUPPRESS )
+
+    arguments = parser.parse_args()
+
+    if arguments.run:
+
+        print( json.dumps( run( arguments.run[ 0 ], json.loads( arguments.run[ 1 ] ), arguments.repeat ) ) )
+
+    elif arguments.compare:
+
+        sys.exit( 1 if compare( arguments.compare[ 0 ], arguments.compare[ 1 ], arguments.threshold ) else 0 )
+
+    elif arguments.profile:
+
+        import cProfile
+        import pstats
+
+        params  = dict( ( name, int( value ) ) for name, value in ( item.split( "=" ) for item in arguments.profile[ 1: ] ) )
+        profile = cProfile.Profile()
+
+        profile.runcall( run, arguments.profile[ 0 ], params )
+        pstats.Stats( profile ).sort_stats( "cumulative" ).print_stats( 20 )
+
+    else:
+
+        benchmark( arguments.case or sorted( CASES ), arguments.quick, arguments.output, arguments.repeat, arguments.timeout )
@@ -0,0 +1,57 @@
+import numpy
+
+import forms.geometry.hexahedron as hexahedron
+import forms.geometry.tetrahedron as tetrahedron
+import forms.util.bvh as bvh
+
+
+hierarchy = tetrahedron.Sierpinski().hierarchy( 10, 8 )
+
+print( hierarchy )
+
+# Result: Hierarchy(8 levels, 65536 copies of Mesh(4 vertices, 4 faces))
+
+# Rays straight down onto the top of the fractal, and one missing it
+
+distances, faces = hierarchy.intersect( [ [ 0, 20, 0 ], [ 0.01, 20, 0 ], [ 20, 20, 0 ] ], [ [ 0, -1, 0 ] ] * 3 )
+
+print( distances )
+print( faces )
+
+# Result: [10.         10.01414214         inf]
+# Result: [262140 262140     -1]
+
+# The copies inside the half space x >= 5, and the chunks of depth 2 crossing it
+
+print( len( hierarchy.frustum( [ [ 1, 0, 0, -5 ] ] ) ) )
+print( hierarchy.frustum( [ [ 1, 0, 0, -5 ] ], 2 ) )
+
+# Result: 6089
+# Result: [ 8  9 10 11]
+
+# The nearest point to a point above the top of the fractal
+
+nearest, distances, faces = hierarchy.nearest( [ [ 0, 15, 0 ] ] )
+
+print( nearest.round( 6 ) )
+print( distances )
+
+# Result: [[ 0. 10.  0.]]
+# Result: [5.]
+
+hierarchy = hexahedron.Sierpinski().hierarchy( 10, 3 )
+chunks    = hierarchy.chunks( 1 )
+
+print( len( chunks ) )
+print( chunks[ 0 ] )
+print( numpy.shares_memory( chunks[ 0 ].faces, chunks[ 1 ].faces ) )
+
+# Result: 20
+# Result: Mesh(896 vertices, 1056 faces)
+# Result: True
+
+# The planes of an orthographic view of the unit cube hold the origin
+
+print( ( numpy.dot( bvh.frustumPlanes( numpy.identity( 4 ) ), [ 0, 0, 0, 1 ] ) >= 0 ).all() )
+
+# Result: True
@@ -0,0 +1,49 @@
+import tempfile
+
+import numpy
+
+import forms.util.cache as cache
+import forms.geometry.hexahedron as hexahedron
+import forms.geometry.tetrahedron as tetrahedron
+
+
+meshes = cache.Cache( tempfile.mkdtemp(), maxSize = 2 ** 20 )
+
+print( tetrahedron.Sierpinski().compute( 10, 3, cache = meshes ) )
+print( meshes )
+
+# Result: Mesh(130 vertices, 256 faces)
+# Result: Cache(/tmp/..., 1 entries, 12913 bytes)
+
+# Iteration 4 is expanded from the cached iteration 3
+
+x = tetrahedron.Sierpinski().compute( 10, 4, cache = meshes )
+y = tetrahedron.Sierpinski().compute( 10, 4 )
+
+print( x )
+print( y )
+print( numpy.array_equal( x.vertices, y.vertices ), numpy.array_equal( x.faces, y.faces ) )
+
+# Result: Mesh(514 vertices, 1024 faces)
+# Result: Mesh(514 vertices, 1024 faces)
+# Result: True True
+
+sponge = hexahedron.Sierpinski()
+
+x = sponge.compute( 10, 1, cache = meshes )
+y = sponge.compute( 10, 3, cache = meshes )
+z = sponge.compute( 10, 3 )
+
+print( x )
+print( y )
+print( numpy.array_equal( y.vertices, z.vertices ), numpy.array_equal( y.faces, z.faces ) )
+
+# Result: Mesh(64 vertices, 72 faces)
+# Result: Mesh(15232 vertices, 18048 faces)
+# Result: True True
+
+meshes.clear()
+
+print( len( meshes.entries() ) )
+
+# Result: 0
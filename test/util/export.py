@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+import forms.util.export as export
+
+
+folder = tempfile.mkdtemp()
+
+export.curve( os.path.join( folder, "curve.obj" ), [ [ 0, 0, 0 ], [ 1, 0, 0 ], [ 1, 1, 0 ] ] )
+
+print( open( os.path.join( folder, "curve.obj" ) ).read() )
+
+# Result: v 0.000000 0.000000 0.000000
+#         v 1.000000 0.000000 0.000000
+#         v 1.000000 1.000000 0.000000
+#         l 1 2 3
+
+
+import forms.util.polygon as polygon
+import forms.util.fractal as fractal
+import forms.geometry.hexahedron as hexahedron
+
+
+cube = hexahedron.Hexahedron().polygon()
+
+export.obj( os.path.join( folder, "cube.obj" ), cube )
+
+print( open( os.path.join( folder, "cube.obj" ) ).read().count( "f " ) )
+
+# Result: 6
+
+export.ply( os.path.join( folder, "cube.ply" ), cube )
+
+print( open( os.path.join( folder, "cube.ply" ), "rb" ).read().split( b"end_header" )[ 0 ].decode() )
+
+# Result: ply
+#         format binary_little_endian 1.0
+#         element vertex 8
+#         property float x
+#         property float y
+#         property float z
+#         element face 6
+#         property list uchar int vertex_indices
+
+# Streams a level 3 Menger sponge chunk by chunk
+
+export.stl( os.path.join( folder, "sponge.stl" ), hexahedron.Occupancy( 3 ).iterSurface( 1000 ) )
+
+print( os.path.getsize( os.path.join( folder, "sponge.stl" ) ) )
+
+# Result: 1804884
+
+export.stl( os.path.join( folder, "copies.stl" ), fractal.iterMeshes( cube, fractal.iterTransforms( [ [ 0, 0, 0 ], [ 2, 0, 0 ] ], 3, 4, 1, 4 ) ) )
+
+print( os.path.getsize( os.path.join( folder, "copies.stl" ) ) )
+
+# Result: 9684
+
+import forms.geometry.dodecahedron as dodecahedron
+
+# One dodecahedron and 8000 transforms instead of 8000 dodecahedra
+
+export.gltf( os.path.join( folder, "dodecahedra.glb" ), dodecahedron.Sierpinski().instances( 10, 3 ) )
+
+print( os.path.getsize( os.path.join( folder, "dodecahedra.glb" ) ) )
+
+# Result: 193732
@@ -0,0 +1,27 @@
+import forms.util.fractal as fractal
+
+
+translations, scales = fractal.transforms( [ [ -1, 0, 0 ], [ 1, 0, 0 ] ], 3, 2, 1 )
+
+print( translations )
+print( scales )
+
+# Result: [[-4  0  0]
+#          [-2  0  0]
+#          [ 2  0  0]
+#          [ 4  0  0]]
+# Result: [1 1 1 1]
+
+translations, scales = fractal.transforms( [ [ -1, 0, 0 ], [ 1, 0, 0 ] ], 3, 2, 0.5 )
+
+print( translations[ :, 0 ] )
+print( scales )
+
+# Result: [-2. -1.  1.  2.]
+# Result: [0.5 0.5 0.5 0.5]
+
+chunks = fractal.iterTransforms( [ [ -1, 0, 0 ], [ 1, 0, 0 ] ], 3, 10, 1, chunkSize = 256 )
+
+print( sum( len( translations ) for translations, scales in chunks ) )
+
+# Result: 1024
@@ -0,0 +1,18 @@
+import forms.util.golden as golden
+
+
+phi = golden.number( 0, 1 )
+
+print( golden.multiply( phi, phi ) )
+print( golden.power( golden.number( 2, 1 ), 3 ) )
+print( golden.toFloat( golden.power( golden.number( 2, 1 ), 3 ) ) )
+
+# Result: [1 1]
+# Result: [15 20]
+# Result: 47.3606797749979
+
+# The corners of two cubes, one a PHI wider than the other
+
+print( golden.transforms( golden.integers( [ [ 1, 1, 1 ], [ -1, -1, -1 ] ] ), golden.number( 0, 1 ), 2 ).shape )
+
+# Result: (4, 3, 2)
@@ -0,0 +1,30 @@
+import forms.geometry.hexahedron as hexahedron
+import forms.geometry.tetrahedron as tetrahedron
+
+
+# Eight iterations of the sponge are 20 ** 8 cubes, stored as 8 nodes of 20 translations
+
+sponge = hexahedron.Sierpinski().graph( 10, 8 )
+
+print( sponge )
+print( sponge.nbytes() )
+print( sponge.bounds() )
+
+# Result: Node(8 iterations, 25600000000 copies of Mesh(8 vertices, 6 faces))
+# Result: 4128
+# Result: [[-5. -5. -5.]
+#  [ 5.  5.  5.]]
+
+# Flatten two iterations, or every iteration near one corner
+
+print( sponge.flatten( depth = 2 ) )
+print( sponge.instances( lower = [ 4.9, 4.9, 4.9 ] ) )
+
+# Result: Mesh(3200 vertices, 2400 faces)
+# Result: Instances(78480 copies of Mesh(8 vertices, 6 faces))
+
+print( tetrahedron.Sierpinski().graph( 10, 3 ).instances() )
+print( tetrahedron.Sierpinski().instances( 10, 3 ) )
+
+# Result: Instances(64 copies of Mesh(4 vertices, 4 faces))
+# Result: Instances(64 copies of Mesh(4 vertices, 4 faces))
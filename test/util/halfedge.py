@@ -0,0 +1,48 @@
+import numpy
+
+import forms.util.halfedge as halfedge
+import forms.geometry.hexahedron as hexahedron
+
+
+cube = halfedge.fromMesh( hexahedron.Hexahedron().polygon( 1 ) )
+
+print( cube )
+print( len( cube.edges() ), len( cube.boundary() ) )
+
+# Result: HalfEdgeMesh(8 vertices, 6 faces, 24 half edges)
+# Result: 12 0
+
+# Extruding one face adds a side quad per edge
+
+print( cube.extrude( [ 0 ], offset = 1 ) )
+print( cube.extrude( [ 0 ], offset = 1 ).positions.max( axis = 0 ) )
+
+# Result: HalfEdgeMesh(12 vertices, 10 faces, 40 half edges)
+# Result: [1.5 0.5 0.5]
+
+# Inset every face and delete the inset faces, leaving a frame per face
+
+frame = cube.inset( scale = 0.5 ).deleteFaces( numpy.arange( 6 ) )
+
+print( frame )
+print( len( frame.boundary() ) )
+print( frame.toMesh() )
+
+# Result: HalfEdgeMesh(32 vertices, 24 faces, 96 half edges)
+# Result: 24
+# Result: Mesh(32 vertices, 24 faces)
+
+# A frame quad borders two quads of its frame and one of the next frame, its inner edge is open
+
+print( frame.grow( [ 0 ] ).sum() )
+
+# Result: 4
+
+# The wireframe of a cube, scaled or moved inwards
+
+print( halfedge.polyWire( hexahedron.Hexahedron().polygon( 1 ), gridSize = 0.8, depth = 0.5, extrudeMode = 0 ) )
+print( halfedge.polyWire( hexahedron.Hexahedron().polygon( 1 ), gridSize = 0.8, depth = -0.1, extrudeMode = 1 ).bounds() )
+
+# Result: Mesh(56 vertices, 48 faces)
+# Result: [[-0.5 -0.5 -0.5]
+#  [ 0.5  0.5  0.5]]
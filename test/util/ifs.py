@@ -0,0 +1,43 @@
+import numpy
+
+import forms.geometry.tetrahedron as tetrahedron
+import forms.util.ifs as ifs
+
+
+# The Sierpinski fractals are systems of uniformly scaled maps
+
+sierpinski = tetrahedron.Sierpinski()
+system     = sierpinski.system( 10 )
+
+print( system )
+print( system.compute( sierpinski.polygon( 10 ), 5, 10 / 2.0 ** 5 * 1e-3 ) )
+print( sierpinski.compute( 10, 5 ) )
+
+# Result: System(4 maps, uniform scale 0.5)
+# Result: Mesh(2050 vertices, 4096 faces)
+# Result: Mesh(2050 vertices, 4096 faces)
+
+# The chaos game samples the attractor, the same seed giving the same points
+
+points = system.sample( 100000 )
+lower, upper = sierpinski.graph( 10, 5 ).bounds()
+
+print( points.shape, numpy.array_equal( points, system.sample( 100000 ) ) )
+print( ( ( points >= lower - 1e-9 ) & ( points <= upper + 1e-9 ) ).all() )
+
+# Result: (100000, 3) True
+# Result: True
+
+# Any affine maps, the faces of the reflected copies are reversed
+
+mirror = ifs.System( [ numpy.diag( [ 0.5, 0.5, 0.5 ] ), numpy.diag( [ -0.5, 0.5, 0.5 ] ), [ [ 0, -0.5, 0 ], [ 0.5, 0, 0 ], [ 0, 0, 0.5 ] ] ], [ [ 1, 0, 0 ], [ -1, 0, 0 ], [ 0, 1, 0 ] ] )
+
+print( mirror )
+print( mirror.compute( sierpinski.polygon( 1 ), 4 ) )
+print( mirror.fixedPoints() )
+
+# Result: System(3 maps, affine)
+# Result: Mesh(324 vertices, 324 faces)
+# Result: [[ 2.          0.          0.        ]
+#  [-0.66666667  0.          0.        ]
+#  [-0.4         0.8         0.        ]]
@@ -0,0 +1,31 @@
+import logging
+
+import forms.util.instrument as instrument
+import forms.geometry.tetrahedron as tetrahedron
+
+
+with instrument.Recorder() as recorder:
+
+    tetrahedron.Sierpinski().compute( 10, 3 )
+
+print( [ current.path() for current in recorder.spans ] )
+
+# Result: ['compute/transforms/level', 'compute/transforms/level', 'compute/transforms/level', 'compute/transforms', 'compute/instance', 'compute/weld', 'compute']
+
+print( recorder.spans[ -1 ].counts )
+
+# Result: {'vertices': 130, 'faces': 256}
+
+# Every top level stage is logged to the "forms" logger
+
+logging.basicConfig( level = logging.INFO )
+
+tetrahedron.Sierpinski().compute( 10, 3 )
+
+# Result: INFO:forms:compute 0.001s generator=tetrahedron iterations=3 radius=10 workers=1 faces 256 vertices 130
+
+with instrument.span( "export", path = "sponge.stl" ) as stage:
+
+    stage.count( faces = 1024 )
+
+# Result: INFO:forms:export 0.000s path=sponge.stl faces 1024
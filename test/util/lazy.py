@@ -0,0 +1,29 @@
+import sys
+
+import forms.geometry.hexahedron as hexahedron
+import forms.util.lazy as lazy
+
+
+# Generating arrays never imports the Maya bindings
+
+print( hexahedron.Sierpinski().compute( 10, 2 ) )
+print( "pymel.core" in sys.modules )
+
+# Result: Mesh(896 vertices, 1056 faces)
+# Result: False
+
+json = lazy.Module( "json" )
+
+print( json )
+print( json.dumps( [ 1 ] ) )
+print( json )
+
+# Result: Module(json, not loaded)
+# Result: [1]
+# Result: Module(json, loaded)
+
+# Outside of Maya
+
+print( lazy.om.available() )
+
+# Result: False
@@ -0,0 +1,43 @@
+import numpy
+
+import forms.geometry.hexahedron as hexahedron
+import forms.geometry.tetrahedron as tetrahedron
+import forms.util.polygon as polygon
+
+
+sierpinski = tetrahedron.Sierpinski()
+pyramid    = sierpinski.pyramid( 10, 3 )
+
+print( pyramid )
+print( pyramid.errors )
+
+# Result: Pyramid(4 levels, 130 vertices, 4/16/64/256 faces)
+# Result: [20. 10.  5.  0.]
+
+# Every level shares the vertex buffer, the last level is the mesh of compute
+
+print( numpy.shares_memory( pyramid.mesh( 0 ).vertices, pyramid.mesh( -1 ).vertices ) )
+print( polygon.compact( pyramid.mesh( 1 ) ) )
+print( sierpinski.compute( 10, 3 ) )
+
+# Result: True
+# Result: Mesh(10 vertices, 16 faces)
+# Result: Mesh(130 vertices, 256 faces)
+
+# The coarsest level within a pixel of error, from a camera 100 and 100000 away
+
+print( pyramid.screenSpaceErrors( 100 ).round( 2 ) )
+print( pyramid.select( 100 ) )
+print( pyramid.select( 100000 ) )
+
+# Result: [318.16 159.08  79.54   0.  ]
+# Result: 3
+# Result: 0
+
+pyramid = hexahedron.Sierpinski().pyramid( 10, 3 )
+
+print( pyramid )
+print( numpy.array_equal( pyramid.mesh( -1 ).vertices, hexahedron.Sierpinski().compute( 10, 3 ).vertices ) )
+
+# Result: Pyramid(4 levels, 15232 vertices, 6/72/1056/18048 faces)
+# Result: True
@@ -1,7 +1,9 @@
+import importlib
+
 import pymel.core as pm
 import forms.util.mesh as meshUtil
 
-reload ( meshUtil )
+importlib.reload( meshUtil )
 
 
 sphere = pm.polySphere( subdivisionsAxis = 8, subdivisionsX = 8, subdivisionsY = 8, subdivisionsHeight = 8, radius = 10 )
@@ -14,8 +16,8 @@ mesh2[ 0 ].setAttr( 'translateZ', 20 )
 meshUtil.polyWire( mesh1, depth = 0.9, extrudeMode = 0 )
 meshUtil.polyWire( mesh2, depth = 0.9, extrudeMode = 1 )
 
-print mesh1
-print mesh2
+print( mesh1 )
+print( mesh2 )
 
 # Result: [nt.Transform(u'pSphere2')]
 # Result: [nt.Transform(u'pSphere3')]
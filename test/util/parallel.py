@@ -0,0 +1,19 @@
+import forms.geometry.dodecahedron as dodecahedron
+import forms.geometry.hexahedron as hexahedron
+
+
+# Spawned workers import this script, so only build meshes in the main process
+
+if __name__ == "__main__":
+
+    print( dodecahedron.Sierpinski().compute( 10, 3 ) )
+    print( dodecahedron.Sierpinski().compute( 10, 3, workers = 4 ) )
+
+    # Result: Mesh(133360 vertices, 96000 faces)
+    # Result: Mesh(133360 vertices, 96000 faces)
+
+    print( hexahedron.Sierpinski().compute( 10, 4 ) )
+    print( hexahedron.Sierpinski().compute( 10, 4, workers = 4 ) )
+
+    # Result: Mesh(283520 vertices, 336384 faces)
+    # Result: Mesh(283520 vertices, 336384 faces)
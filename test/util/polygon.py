@@ -0,0 +1,38 @@
+import forms.util.polygon as polygon
+
+
+cube = polygon.polyhedron( [ [ x, y, z ] for x in [ -1, 1 ] for y in [ -1, 1 ] for z in [ -1, 1 ] ], [ [ 1, 0, 0 ], [ -1, 0, 0 ], [ 0, 1, 0 ], [ 0, -1, 0 ], [ 0, 0, 1 ], [ 0, 0, -1 ] ] )
+cubes = polygon.instance( cube, [ [ -2, 0, 0 ], [ 2, 0, 0 ] ], [ 1, 0.5 ] )
+combined = polygon.combine( [ cube, cubes ] )
+
+print( cube )
+print( cubes )
+print( cubes.bounds() )
+print( combined )
+print( combined.triangles().shape )
+print( polygon.weld( polygon.instance( cube, [ [ -1, 0, 0 ], [ 1, 0, 0 ] ] ), 1e-3 ) )
+
+# Result: Mesh(8 vertices, 6 faces)
+# Result: Mesh(16 vertices, 12 faces)
+# Result: [[-3.  -1.  -1. ]
+#          [ 2.5  1.   1. ]]
+# Result: Mesh(24 vertices, 18 faces)
+# Result: (36, 3)
+# Result: Mesh(12 vertices, 12 faces)
+
+# Two touching cubes lose the faces between them
+
+print( polygon.compact( polygon.removeLamina( polygon.weld( polygon.instance( cube, [ [ -1, 0, 0 ], [ 1, 0, 0 ] ] ), 1e-3 ) ) ) )
+
+# Result: Mesh(12 vertices, 10 faces)
+
+copies = polygon.Instances( cube, [ [ -2, 0, 0 ], [ 2, 0, 0 ] ], [ 1, 0.5 ] )
+
+print( copies )
+print( copies.bounds() )
+print( copies.flatten() )
+
+# Result: Instances(2 copies of Mesh(8 vertices, 6 faces))
+# Result: [[-3.  -1.  -1. ]
+#          [ 2.5  1.   1. ]]
+# Result: Mesh(16 vertices, 12 faces)
@@ -0,0 +1,21 @@
+import forms.util.solids as solids
+
+
+for name in solids.names:
+
+    print( "%s %r" % ( name, solids.solid( name ) ) )
+
+# Result: tetrahedron Mesh(4 vertices, 4 faces)
+# Result: hexahedron Mesh(8 vertices, 6 faces)
+# Result: octahedron Mesh(6 vertices, 8 faces)
+# Result: dodecahedron Mesh(20 vertices, 12 faces)
+# Result: icosahedron Mesh(12 vertices, 20 faces)
+
+# The side length of a tetrahedron, as getSideLength of Maya's platonic solid
+
+print( solids.edgeLength( "tetrahedron", 1 ) )
+print( solids.solid( "hexahedron", edgeLength = 2 ).bounds() )
+
+# Result: 1.6329931618554523
+# Result: [[-1. -1. -1.]
+#  [ 1.  1.  1.]]